@@ -12,6 +12,8 @@ import random
 import time
 from datetime import datetime, timedelta
 
+from utils.dedup import NearDuplicateIndex
+
 # Configure logger
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -55,6 +57,8 @@ class AdvancedLearningSystem:
         }
 
         self.advancement_opportunities = []
+        # Sources overlap; entries seen before (or reworded) are not stored again
+        self.seen_entries = NearDuplicateIndex()
         self.external_knowledge_sources = self._initialize_knowledge_sources()
         self.last_daily_summary = 0
         self.daily_summary_interval = 86400  # 24 hours in seconds
@@ -115,6 +119,11 @@ class AdvancedLearningSystem:
             },
         }
 
+    @property
+    def duplicates_suppressed(self):
+        """Number of entries skipped as near-duplicates of earlier ones."""
+        return self.seen_entries.suppressed
+
     # ✅ FIXED: This method was misplaced before
     def process_knowledge_update(self, source_id, source_info, current_time):
         """Process knowledge update from a specific source."""
@@ -126,6 +135,8 @@ class AdvancedLearningSystem:
             category = source_info["category"]
 
             for entry in new_knowledge_entries:
+                if self.seen_entries.add(len(self.seen_entries), entry) is not None:
+                    continue
                 knowledge_entry = {
                     "content": entry,
                     "source": source_id,
@@ -138,8 +149,9 @@ class AdvancedLearningSystem:
                 self.update_trending_topics(entry)
 
             # Save and analyze
-            self.save_knowledge_to_disk(category, knowledge_entries)
-            self.identify_advancement_opportunities(category, knowledge_entries)
+            if knowledge_entries:
+                self.save_knowledge_to_disk(category, knowledge_entries)
+                self.identify_advancement_opportunities(category, knowledge_entries)
 
             return knowledge_entries
 
@@ -218,6 +230,7 @@ class AdvancedLearningSystem:
             "date": today,
             "trending_topics": list(self.trending_topics.keys()),
             "advancement_count": len(self.advancement_opportunities),
+            "duplicates_suppressed": self.duplicates_suppressed,
         }
 
         os.makedirs("data/summaries", exist_ok=True)
@@ -25,6 +25,7 @@ import threading
 import queue
 import logging
 from memory_mesh_bridge import MemoryMeshBridge
+from utils.dedup import NearDuplicateIndex
 
 # Configure logging for HIPAA audit trails
 logging.basicConfig(
@@ -206,6 +207,7 @@ class AutonomousLearningEngine:
         
         # Learned knowledge base
         self.knowledge_base = {}
+        self.content_index = NearDuplicateIndex()
         self.load_knowledge_base()
         
         # Self-modification tracking
@@ -506,6 +508,19 @@ Include:
             self.derek = Derek()  # Reinitialize Derek if memory is None
         
         topic_key = f"{topic['domain']}.{topic['subtopic']}"
+        duplicate_of = self.content_index.add(topic_key, knowledge.get('content', ''))
+        if duplicate_of is not None:
+            # Record the topic as covered without storing the same content twice
+            logger.info(f"♻️ {topic_key} repeats what was learned for {duplicate_of}")
+            self.knowledge_base[topic_key] = {
+                key: knowledge[key]
+                for key in ("domain", "subtopic", "learned_at", "confidence", "mastery")
+                if key in knowledge
+            }
+            self.knowledge_base[topic_key]["duplicate_of"] = duplicate_of
+            self.content_index.remove(topic_key)
+            self.save_knowledge_base()
+            return
         self.knowledge_base[topic_key] = knowledge
         
         self.save_knowledge_base()
@@ -771,6 +786,10 @@ Provide complete, working Python code with documentation."""
                     self.generated_modules = data.get("generated_modules", [])
                     self.improvement_log = data.get("improvement_log", [])
             
+            self.content_index.clear()
+            for topic_key, knowledge in self.knowledge_base.items():
+                self.content_index.insert(topic_key, knowledge.get('content', ''))
+            
             logger.info(f"📂 Loaded {len(self.knowledge_base)} learned topics")
         
         except Exception as e:
@@ -792,7 +811,8 @@ Provide complete, working Python code with documentation."""
                 for domain, info in self.knowledge_domains.items()
             },
             "generated_modules": len(self.generated_modules),
-            "improvements_made": len(self.improvement_log)
+            "improvements_made": len(self.improvement_log),
+            "duplicates_suppressed": self.content_index.suppressed
         }
     
     def print_learning_report(self):
@@ -7,6 +7,7 @@ Core utilities and shared functionality for Derek's modules.
 import os
 import sys
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -14,12 +15,34 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("core")
 
 
+# Shared memory engine (lazy initialization)
+_memory_engine = None
+_memory_engine_lock = threading.Lock()
+
+
+def get_memory_engine():
+    """
+    Get the process-wide MemoryEngine, creating it on first use.
+    
+    The engine keeps memory cached in-process and only reloads when its
+    files change on disk, so remember/recall avoid re-reading the store.
+    """
+    global _memory_engine
+    if _memory_engine is None:
+        with _memory_engine_lock:
+            if _memory_engine is None:
+                from memory_engine import MemoryEngine
+                _memory_engine = MemoryEngine()
+    else:
+        _memory_engine.reload_if_changed()
+    return _memory_engine
+
+
 # Memory hook functions
 def remember(key: str, value: Any, category: str = "general"):
     """Store information in Derek's memory"""
     try:
-        from memory_engine import MemoryEngine
-        memory = MemoryEngine()
+        memory = get_memory_engine()
         memory.add_memory(key, value, category)
         logger.debug(f"Remembered: {key} in {category}")
     except Exception as e:
@@ -29,8 +52,7 @@ def remember(key: str, value: Any, category: str = "general"):
 def recall(key: str, default: Any = None) -> Any:
     """Retrieve information from Derek's memory"""
     try:
-        from memory_engine import MemoryEngine
-        memory = MemoryEngine()
+        memory = get_memory_engine()
         result = memory.get_memory(key)
         return result if result is not None else default
     except Exception as e:
@@ -99,6 +121,7 @@ ensure_path_in_sys(str(PROJECT_ROOT))
 __all__ = [
     'remember',
     'recall',
+    'get_memory_engine',
     'Config',
     'config',
     'PROJECT_ROOT',
@@ -5,10 +5,12 @@ Database abstraction layer for Derek's persistent storage.
 """
 
 import os
+import re
 import json
 import sqlite3
 import logging
-from typing import Any, List, Dict, Optional
+import threading
+from typing import Any, Iterable, List, Dict, Optional
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO)
@@ -18,30 +20,72 @@ logger = logging.getLogger("database")
 class Database:
     """SQLite database wrapper with JSON support"""
     
-    def __init__(self, db_path: str = "./memory/derek.db"):
-        """Initialize database connection"""
+    def __init__(self, db_path: str = "./memory/derek.db", journal_mode: str = "WAL"):
+        """
+        Initialize database connection
+        
+        Args:
+            db_path: Path to the SQLite database file
+            journal_mode: SQLite journal mode; WAL lets readers run alongside a writer
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.connection = None
+        self.journal_mode = journal_mode
+        self.fts_enabled = False
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.connect()
         logger.info(f"Database initialized at {db_path}")
     
-    def connect(self):
-        """Establish database connection"""
-        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.connection.row_factory = sqlite3.Row
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread, opened on first use"""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self.connect()
+        return conn
+    
+    def connect(self) -> sqlite3.Connection:
+        """Establish a database connection for the calling thread"""
+        # Each thread gets its own connection; cross-thread use is only for close()
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if str(self.journal_mode).upper() == "WAL":
+            conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.connection = conn
+        with self._connections_lock:
+            self._connections.append(conn)
         logger.debug("Database connection established")
+        return conn
     
     def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """Execute a database query"""
+        """Execute a database query, committing only if it opened a write transaction"""
+        conn = self.connection
         try:
-            cursor = self.connection.cursor()
+            cursor = conn.cursor()
             cursor.execute(query, params)
-            self.connection.commit()
+            if conn.in_transaction:
+                conn.commit()
             return cursor
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
-            self.connection.rollback()
+            conn.rollback()
+            raise
+    
+    def execute_many(self, query: str, params_seq: Iterable[tuple]) -> int:
+        """Execute a statement for every parameter tuple in one transaction"""
+        conn = self.connection
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(query, params_seq)
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Batch execution failed: {e}")
+            conn.rollback()
             raise
     
     def fetch_all(self, query: str, params: tuple = ()) -> List[Dict]:
@@ -95,8 +139,78 @@ class Database:
             )
         """)
         
+        self.execute("CREATE INDEX IF NOT EXISTS idx_memories_timestamp ON memories (timestamp)")
+        self.execute("CREATE INDEX IF NOT EXISTS idx_memories_type ON memories (type, timestamp)")
+        self.execute("CREATE INDEX IF NOT EXISTS idx_interactions_user ON interactions (user_id, timestamp)")
+        self.execute("CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions (timestamp)")
+        self.execute("CREATE INDEX IF NOT EXISTS idx_learning_user_skill ON learning_progress (user_id, skill)")
+        
+        self._create_search_tables()
+        
         logger.info("Database tables created")
     
+    def _create_search_tables(self):
+        """Create FTS5 tables over memory and interaction text, kept in sync by triggers"""
+        existing = {
+            row["name"] for row in self.fetch_all("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        try:
+            self.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts
+                USING fts5(content, content='memories', content_rowid='id')
+            """)
+            self.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS interactions_fts
+                USING fts5(input, response, content='interactions', content_rowid='id')
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+            self.fts_enabled = False
+            return
+        
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts (rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            END
+        """)
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE ON memories BEGIN
+                INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO memories_fts (rowid, content) VALUES (new.id, new.content);
+            END
+        """)
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_insert AFTER INSERT ON interactions BEGIN
+                INSERT INTO interactions_fts (rowid, input, response) VALUES (new.id, new.input, new.response);
+            END
+        """)
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_delete AFTER DELETE ON interactions BEGIN
+                INSERT INTO interactions_fts (interactions_fts, rowid, input, response)
+                VALUES ('delete', old.id, old.input, old.response);
+            END
+        """)
+        self.execute("""
+            CREATE TRIGGER IF NOT EXISTS interactions_fts_update AFTER UPDATE ON interactions BEGIN
+                INSERT INTO interactions_fts (interactions_fts, rowid, input, response)
+                VALUES ('delete', old.id, old.input, old.response);
+                INSERT INTO interactions_fts (rowid, input, response) VALUES (new.id, new.input, new.response);
+            END
+        """)
+        
+        # Index rows written before the search tables existed
+        if "memories_fts" not in existing:
+            self.execute("INSERT INTO memories_fts (memories_fts) VALUES ('rebuild')")
+        if "interactions_fts" not in existing:
+            self.execute("INSERT INTO interactions_fts (interactions_fts) VALUES ('rebuild')")
+        
+        self.fts_enabled = True
+    
     def store_memory(self, content: str, memory_type: str = "general", metadata: dict = None):
         """Store a memory entry"""
         metadata_json = json.dumps(metadata) if metadata else None
@@ -106,6 +220,33 @@ class Database:
         )
         logger.debug(f"Memory stored: {memory_type}")
     
+    def store_memories(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Store many memory entries in a single transaction
+        
+        Args:
+            entries: Dicts with "content" and optional "type" and "metadata"
+        
+        Returns:
+            Number of rows inserted
+        """
+        rows = [
+            (
+                entry["content"],
+                entry.get("type", "general"),
+                json.dumps(entry["metadata"]) if entry.get("metadata") else None
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return 0
+        count = self.execute_many(
+            "INSERT INTO memories (content, type, metadata) VALUES (?, ?, ?)",
+            rows
+        )
+        logger.debug(f"Stored {count} memories")
+        return count
+    
     def store_interaction(self, user_id: str, user_input: str, response: str, 
                          emotion: str = None, metadata: dict = None):
         """Store a user interaction"""
@@ -116,6 +257,36 @@ class Database:
         )
         logger.debug(f"Interaction stored for user: {user_id}")
     
+    def store_interactions(self, interactions: List[Dict[str, Any]]) -> int:
+        """
+        Store many user interactions in a single transaction
+        
+        Args:
+            interactions: Dicts with "user_id", "input", "response" and optional
+                "emotion" and "metadata"
+        
+        Returns:
+            Number of rows inserted
+        """
+        rows = [
+            (
+                item.get("user_id"),
+                item.get("input"),
+                item.get("response"),
+                item.get("emotion"),
+                json.dumps(item["metadata"]) if item.get("metadata") else None
+            )
+            for item in interactions
+        ]
+        if not rows:
+            return 0
+        count = self.execute_many(
+            "INSERT INTO interactions (user_id, input, response, emotion, metadata) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        logger.debug(f"Stored {count} interactions")
+        return count
+    
     def get_recent_memories(self, limit: int = 10, memory_type: str = None) -> List[Dict]:
         """Retrieve recent memories"""
         if memory_type:
@@ -135,11 +306,112 @@ class Database:
             (user_id, limit)
         )
     
+    def search_memories(self, query: str, limit: int = 10, memory_type: str = None) -> List[Dict]:
+        """
+        Full-text search over memory content, best matches first
+        
+        Args:
+            query: Free-text search query
+            limit: Max number of results
+            memory_type: Optional type filter
+        
+        Returns:
+            Matching memory rows
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        
+        if not self.fts_enabled:
+            clauses = " OR ".join("content LIKE ?" for _ in terms)
+            params = [f"%{term}%" for term in terms]
+            type_clause = ""
+            if memory_type:
+                type_clause = " AND type = ?"
+                params.append(memory_type)
+            return self.fetch_all(
+                f"SELECT * FROM memories WHERE ({clauses}){type_clause} ORDER BY timestamp DESC LIMIT ?",
+                tuple(params + [limit])
+            )
+        
+        params = [_fts_query(terms)]
+        type_clause = ""
+        if memory_type:
+            type_clause = " AND m.type = ?"
+            params.append(memory_type)
+        return self.fetch_all(
+            f"""
+            SELECT m.* FROM memories_fts
+            JOIN memories m ON m.id = memories_fts.rowid
+            WHERE memories_fts MATCH ?{type_clause}
+            ORDER BY bm25(memories_fts)
+            LIMIT ?
+            """,
+            tuple(params + [limit])
+        )
+    
+    def search_interactions(self, query: str, limit: int = 10, user_id: str = None) -> List[Dict]:
+        """
+        Full-text search over interaction inputs and responses, best matches first
+        
+        Args:
+            query: Free-text search query
+            limit: Max number of results
+            user_id: Optional user filter
+        
+        Returns:
+            Matching interaction rows
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        
+        if not self.fts_enabled:
+            clauses = " OR ".join("input LIKE ? OR response LIKE ?" for _ in terms)
+            params = [f"%{term}%" for term in terms for _ in range(2)]
+            user_clause = ""
+            if user_id:
+                user_clause = " AND user_id = ?"
+                params.append(user_id)
+            return self.fetch_all(
+                f"SELECT * FROM interactions WHERE ({clauses}){user_clause} ORDER BY timestamp DESC LIMIT ?",
+                tuple(params + [limit])
+            )
+        
+        params = [_fts_query(terms)]
+        user_clause = ""
+        if user_id:
+            user_clause = " AND i.user_id = ?"
+            params.append(user_id)
+        return self.fetch_all(
+            f"""
+            SELECT i.* FROM interactions_fts
+            JOIN interactions i ON i.id = interactions_fts.rowid
+            WHERE interactions_fts MATCH ?{user_clause}
+            ORDER BY bm25(interactions_fts)
+            LIMIT ?
+            """,
+            tuple(params + [limit])
+        )
+    
     def close(self):
-        """Close database connection"""
-        if self.connection:
-            self.connection.close()
-            logger.info("Database connection closed")
+        """Close every connection opened by this database"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+        logger.info("Database connection closed")
+
+
+def _search_terms(query: str) -> List[str]:
+    """Split a free-text query into plain word terms"""
+    return re.findall(r"\w+", query or "")
+
+
+def _fts_query(terms: List[str]) -> str:
+    """Build an FTS5 MATCH expression that matches any of the terms"""
+    return " OR ".join(f'"{term}"' for term in terms)
 
 
 # Global database instance
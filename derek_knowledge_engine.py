@@ -12,11 +12,13 @@ Enables Derek to:
 """
 
 import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
+from collections import defaultdict
 import re
 import logging
+import threading
 from memory_mesh_bridge import MemoryMeshBridge
 
 # Configure logging
@@ -39,8 +41,164 @@ class Derek:
             logger.error(f"Failed to initialize memory: {e}")
             raise RuntimeError(f"Memory initialization failed: {e}")
 
+class KnowledgeIndex:
+    """
+    Resident index of Derek's learned knowledge files
+    
+    Each knowledge_dir/<domain>/*.json file is parsed once. refresh() stats the
+    files and re-parses only those whose mtime or size changed, so searches
+    never touch the disk; a background thread can poll for changes.
+    """
+    
+    def __init__(self, knowledge_dir: Path, poll_interval: float = 5.0):
+        self.knowledge_dir = Path(knowledge_dir)
+        self.poll_interval = poll_interval
+        self._entries: Dict[Path, Dict[str, Any]] = {}
+        self._file_state: Dict[Path, Tuple[int, int]] = {}
+        self._postings: Dict[str, Set[Path]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        state = {}
+        if not self.knowledge_dir.exists():
+            return state
+        for domain_dir in self.knowledge_dir.iterdir():
+            if not domain_dir.is_dir() or domain_dir.name == "generated_code":
+                continue
+            for knowledge_file in domain_dir.glob("*.json"):
+                try:
+                    stat = knowledge_file.stat()
+                except OSError:
+                    continue
+                state[knowledge_file] = (stat.st_mtime_ns, stat.st_size)
+        return state
+    
+    @staticmethod
+    def _parse(knowledge_file: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(knowledge_file, 'r') as f:
+                data = json.load(f)
+            # Extract searchable content
+            content = " ".join([
+                str(data.get('topic', '')),
+                str(data.get('summary', '')),
+                str(data.get('key_concepts', [])),
+                str(data.get('practical_applications', []))
+            ]).lower()
+            return {
+                "content": content,
+                "words": set(re.findall(r'\b\w+\b', content)),
+                "item": {
+                    "topic": data.get('topic', ''),
+                    "domain": data.get('domain', ''),
+                    "summary": data.get('summary', ''),
+                    "key_concepts": data.get('key_concepts', []),
+                    "applications": data.get('practical_applications', []),
+                    "learned_at": data.get('learned_at', '')
+                }
+            }
+        except Exception:
+            return None
+    
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the knowledge directory
+        
+        Returns:
+            Number of files added, changed or removed
+        """
+        state = self._scan()
+        changed = [path for path, file_state in state.items() if self._file_state.get(path) != file_state]
+        removed = [path for path in self._file_state if path not in state]
+        if not changed and not removed:
+            return 0
+        
+        parsed = {path: self._parse(path) for path in changed}
+        with self._lock:
+            for path in removed + changed:
+                self._remove(path)
+            for path, entry in parsed.items():
+                # Unreadable files are remembered too, and retried once they change
+                if entry is not None:
+                    self._entries[path] = entry
+                    for word in entry["words"]:
+                        self._postings[word].add(path)
+            self._file_state = state
+        
+        logger.info(f"Knowledge index refreshed: {len(changed)} changed, {len(removed)} removed")
+        return len(changed) + len(removed)
+    
+    def _remove(self, path: Path):
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        for word in entry["words"]:
+            postings = self._postings.get(word)
+            if postings is not None:
+                postings.discard(path)
+                if not postings:
+                    del self._postings[word]
+    
+    def search(self, question: str, threshold: float = 0.15) -> List[Dict[str, Any]]:
+        """Return knowledge items relevant to question, best first"""
+        question_lower = question.lower()
+        question_words = set(re.findall(r'\b\w+\b', question_lower))
+        if not question_words:
+            return []
+        phrases = question_lower.split()
+        
+        relevant_knowledge = []
+        with self._lock:
+            candidates = set()
+            for word in question_words:
+                candidates.update(self._postings.get(word, ()))
+            
+            for path in candidates:
+                entry = self._entries[path]
+                # Calculate relevance
+                word_overlap = len(question_words & entry["words"])
+                relevance = word_overlap / len(question_words)
+                
+                # Boost if exact phrase match
+                if any(phrase in entry["content"] for phrase in phrases):
+                    relevance *= 1.5
+                
+                if relevance > threshold:  # Minimum threshold
+                    relevant_knowledge.append({**entry["item"], "relevance": min(relevance, 1.0)})
+        
+        relevant_knowledge.sort(key=lambda x: x['relevance'], reverse=True)
+        return relevant_knowledge
+    
+    def start_watching(self):
+        """Poll for changed files every poll_interval seconds on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+    
+    def stop_watching(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+    
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Knowledge index refresh failed: {e}")
+
+
 class KnowledgeEngine:
-    def __init__(self, knowledge_dir: str = "./knowledge", memory_mesh=None, local_reasoning=None):
+    def __init__(self, knowledge_dir: str = "./knowledge", memory_mesh=None, local_reasoning=None,
+                 poll_interval: float = 5.0):
         """
         Initialize the Knowledge Engine
         
@@ -48,12 +206,17 @@ class KnowledgeEngine:
             knowledge_dir: Directory containing learned knowledge
             memory_mesh: Reference to Derek memory system
             local_reasoning: Reference to local AI reasoning engine
+            poll_interval: Seconds between checks for changed knowledge files
         """
         self.derek = Derek()
         self.knowledge_dir = Path(knowledge_dir)
         self.memory_mesh = memory_mesh
         self.local_reasoning = local_reasoning
         
+        # Knowledge files are indexed once and kept current by polling
+        self.knowledge_index = KnowledgeIndex(self.knowledge_dir, poll_interval=poll_interval)
+        self.knowledge_index.start_watching()
+        
         # Knowledge confidence thresholds
         self.high_confidence = 0.8
         self.medium_confidence = 0.6
@@ -149,58 +312,7 @@ class KnowledgeEngine:
         Returns:
             dict: Relevant knowledge with confidence score
         """
-        if not self.knowledge_dir.exists():
-            return {"items": [], "confidence": 0.0}
-        
-        relevant_knowledge = []
-        question_lower = question.lower()
-        question_words = set(re.findall(r'\b\w+\b', question_lower))
-        
-        # Search all knowledge domains
-        for domain_dir in self.knowledge_dir.iterdir():
-            if not domain_dir.is_dir() or domain_dir.name == "generated_code":
-                continue
-            
-            for knowledge_file in domain_dir.glob("*.json"):
-                try:
-                    with open(knowledge_file, 'r') as f:
-                        data = json.load(f)
-                        
-                        # Extract searchable content
-                        content = " ".join([
-                            str(data.get('topic', '')),
-                            str(data.get('summary', '')),
-                            str(data.get('key_concepts', [])),
-                            str(data.get('practical_applications', []))
-                        ]).lower()
-                        
-                        content_words = set(re.findall(r'\b\w+\b', content))
-                        
-                        # Calculate relevance
-                        word_overlap = len(question_words & content_words)
-                        if word_overlap > 0:
-                            relevance = word_overlap / len(question_words)
-                            
-                            # Boost if exact phrase match
-                            if any(phrase in content for phrase in question_lower.split()):
-                                relevance *= 1.5
-                            
-                            if relevance > 0.15:  # Minimum threshold
-                                relevant_knowledge.append({
-                                    "topic": data.get('topic', ''),
-                                    "domain": data.get('domain', ''),
-                                    "summary": data.get('summary', ''),
-                                    "key_concepts": data.get('key_concepts', []),
-                                    "applications": data.get('practical_applications', []),
-                                    "learned_at": data.get('learned_at', ''),
-                                    "relevance": min(relevance, 1.0)
-                                })
-                
-                except Exception as e:
-                    continue
-        
-        # Sort by relevance
-        relevant_knowledge.sort(key=lambda x: x['relevance'], reverse=True)
+        relevant_knowledge = self.knowledge_index.search(question)
         
         # Calculate overall confidence
         if relevant_knowledge:
@@ -447,6 +559,10 @@ Focus on being helpful, compassionate, and evidence-based."""
             "partial_knowledge": partial_knowledge
         }
     
+    def close(self):
+        """Stop watching the knowledge directory"""
+        self.knowledge_index.stop_watching()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get reasoning statistics"""
         total = self.stats["total_queries"]
@@ -459,6 +575,7 @@ Focus on being helpful, compassionate, and evidence-based."""
         
         return {
             **self.stats,
+            "knowledge_files_indexed": len(self.knowledge_index),
             "local_answer_rate": f"{local_pct:.1f}%",
             "api_savings_rate": f"{api_saved_pct:.1f}%"
         }
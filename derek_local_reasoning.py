@@ -12,14 +12,104 @@ Enables Derek to:
 """
 
 import os
+import re
 import json
+import math
+import heapq
 import subprocess
 import requests
-from typing import Optional, Dict, List, Any
+from collections import Counter, defaultdict
+from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 import time
 
 
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def _terms(text: str) -> List[str]:
+    return _TERM_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Sparse BM25 term-document matrix over Derek's knowledge files
+    
+    Each term maps to its column of precomputed BM25 weights, so scoring a
+    query is a sparse sum over the query's terms plus a top-k selection.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Dict[str, Any]] = []
+        self.directories: List[str] = []
+        self.columns: Dict[str, List[Tuple[int, float]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def build(self, documents: List[Tuple[str, Dict[str, Any], str]]):
+        """
+        Replace the index contents
+        
+        Args:
+            documents: (directory name, entry, searchable text) per document
+        """
+        term_counts = [Counter(_terms(text)) for _, _, text in documents]
+        lengths = [sum(counts.values()) for counts in term_counts]
+        total = len(documents)
+        average_length = sum(lengths) / total if total else 0.0
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+        
+        columns = defaultdict(list)
+        for doc_id, counts in enumerate(term_counts):
+            length_norm = self.k1 * (1 - self.b + self.b * lengths[doc_id] / average_length) if average_length else self.k1
+            for term, frequency in counts.items():
+                weight = idf[term] * frequency * (self.k1 + 1) / (frequency + length_norm)
+                columns[term].append((doc_id, weight))
+        
+        self.directories = [directory for directory, _, _ in documents]
+        self.documents = [entry for _, entry, _ in documents]
+        self.columns = dict(columns)
+    
+    def search(self, query: str, limit: int = 10, min_coverage: float = 0.0,
+               directory: Optional[str] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Score documents against query
+        
+        Args:
+            query: Search text
+            limit: Number of results to keep
+            min_coverage: Share of query terms a document must contain (exclusive)
+            directory: Only return documents from this directory
+        
+        Returns:
+            list: (score, entry) pairs, best first
+        """
+        query_terms = set(_terms(query))
+        if not query_terms:
+            return []
+        
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for term in query_terms:
+            for doc_id, weight in self.columns.get(term, ()):
+                scores[doc_id] += weight
+                matched[doc_id] += 1
+        
+        needed = min_coverage * len(query_terms)
+        candidates = (
+            (score, doc_id) for doc_id, score in scores.items()
+            if matched[doc_id] > needed and (directory is None or self.directories[doc_id] == directory)
+        )
+        return [(score, self.documents[doc_id]) for score, doc_id in heapq.nlargest(limit, candidates)]
+
+
 class LocalReasoningEngine:
     """
     Derek's local AI reasoning system
@@ -88,6 +178,13 @@ class LocalReasoningEngine:
         self.use_local_first = True
         self.fallback_to_external = True
         
+        # Knowledge search index, rebuilt when the knowledge files change;
+        # the files are re-checked at most every index_refresh_interval seconds
+        self.knowledge_index = BM25Index()
+        self.index_refresh_interval = 5.0
+        self._index_signature = None
+        self._index_checked_at = 0.0
+        
         # ========================================
         # INITIALIZE SYSTEM
         # ========================================
@@ -318,7 +415,8 @@ Provide a helpful, accurate response based on this knowledge."""
     def _search_knowledge_base(
         self,
         query: str,
-        domain: Optional[str] = None
+        domain: Optional[str] = None,
+        limit: int = 10
     ) -> List[Dict[str, Any]]:
         """
         Search Derek's learned knowledge for relevant information
@@ -326,54 +424,62 @@ Provide a helpful, accurate response based on this knowledge."""
         Args:
             query: Search query
             domain: Specific domain to search (optional)
+            limit: Maximum number of entries to return
         
         Returns:
-            list: Relevant knowledge entries
+            list: Relevant knowledge entries, highest BM25 score first
         """
-        relevant = []
-        
-        # Search knowledge directory
-        search_dirs = []
-        if domain:
-            domain_dir = self.knowledge_dir / domain
-            if domain_dir.exists():
-                search_dirs.append(domain_dir)
-        else:
-            # Search all domains
-            if self.knowledge_dir.exists():
-                search_dirs = [d for d in self.knowledge_dir.iterdir() if d.is_dir()]
-        
-        # Simple keyword matching (could be enhanced with embeddings)
-        query_words = set(query.lower().split())
-        
-        for search_dir in search_dirs:
-            for json_file in search_dir.glob("*.json"):
-                try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                        
-                        # Check if knowledge is relevant
-                        content = f"{data.get('topic', '')} {data.get('summary', '')}".lower()
-                        content_words = set(content.split())
-                        
-                        # Calculate relevance score
-                        overlap = len(query_words & content_words)
-                        if overlap > 0:
-                            relevance = overlap / len(query_words)
-                            if relevance > 0.2:  # At least 20% keyword match
-                                relevant.append({
-                                    'topic': data.get('topic', ''),
-                                    'summary': data.get('summary', ''),
-                                    'domain': data.get('domain', ''),
-                                    'relevance': relevance,
-                                    'learned_at': data.get('learned_at', '')
-                                })
-                except Exception as e:
-                    continue
-        
-        # Sort by relevance
-        relevant.sort(key=lambda x: x['relevance'], reverse=True)
-        return relevant
+        self._refresh_knowledge_index()
+        
+        # At least 20% of the query terms must appear in an entry
+        results = self.knowledge_index.search(query, limit=limit, min_coverage=0.2, directory=domain)
+        return [dict(entry, relevance=score) for score, entry in results]
+    
+    def _knowledge_files(self) -> List[Path]:
+        if not self.knowledge_dir.exists():
+            return []
+        return [
+            json_file
+            for search_dir in self.knowledge_dir.iterdir() if search_dir.is_dir()
+            for json_file in search_dir.glob("*.json")
+        ]
+    
+    def _refresh_knowledge_index(self, force: bool = False):
+        """Rebuild the knowledge index if any knowledge file was added, changed or removed"""
+        now = time.monotonic()
+        if not force and self._index_signature is not None and now - self._index_checked_at < self.index_refresh_interval:
+            return
+        self._index_checked_at = now
+        
+        files = self._knowledge_files()
+        signature = []
+        for json_file in files:
+            try:
+                stat = json_file.stat()
+            except OSError:
+                continue
+            signature.append((str(json_file), stat.st_mtime_ns, stat.st_size))
+        signature = tuple(sorted(signature))
+        if signature == self._index_signature:
+            return
+        
+        documents = []
+        for json_file in files:
+            try:
+                with open(json_file, 'r') as f:
+                    data = json.load(f)
+                entry = {
+                    'topic': data.get('topic', ''),
+                    'summary': data.get('summary', ''),
+                    'domain': data.get('domain', ''),
+                    'learned_at': data.get('learned_at', '')
+                }
+                documents.append((json_file.parent.name, entry, f"{entry['topic']} {entry['summary']}"))
+            except Exception as e:
+                continue
+        
+        self.knowledge_index.build(documents)
+        self._index_signature = signature
     
     def should_use_external_api(self, question: str, local_result: Dict[str, Any]) -> bool:
         """
@@ -456,6 +562,7 @@ Provide a helpful, accurate response based on this knowledge."""
             "installed_models": self.installed_models,
             "current_model": self.current_model,
             "knowledge_dir": str(self.knowledge_dir),
+            "knowledge_entries_indexed": len(self.knowledge_index),
             "use_local_first": self.use_local_first,
             "confidence_threshold": self.confidence_threshold,
             "available_models": list(self.available_models.keys())
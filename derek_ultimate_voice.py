@@ -586,8 +586,9 @@ class DerekUltimateVoice:
             if hasattr(self, "memory") and self.memory:
                 try:
                     self.memory.store(user_input, final_thought)
-                    # CRITICAL: Save to disk so memories persist across sessions
-                    self.memory.save()
+                    # Persist off the response path; the write-behind thread
+                    # saves within a few seconds or turns, and on shutdown
+                    self.memory.mark_dirty()
                 except Exception as e:
                     logger.debug(f"Memory storage failed: {e}")
             
@@ -1507,7 +1508,7 @@ def main():
         print("\n🛑 Derek shutting down gracefully...")
         # Save all memories before exit
         if hasattr(derek, 'memory') and derek.memory:
-            derek.memory.save()
+            derek.memory.close()
             print("💾 All memories saved to persistent storage")
         print("👋 Goodbye!")
     except Exception as e:
@@ -1515,7 +1516,7 @@ def main():
         traceback.print_exc()
         # Still try to save memories
         if 'derek' in locals() and hasattr(derek, 'memory') and derek.memory:
-            derek.memory.save()
+            derek.memory.close()
 
 
 if __name__ == "__main__":
@@ -11,17 +11,26 @@ from various information sources. It combines:
 5. Visible learning progress monitoring and reporting
 """
 
+import atexit
 import datetime
+import hashlib
 import json
 import logging
 import os
 import random
+import sys
 import threading
 import time
 import requests
 from bs4 import BeautifulSoup
-from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.dedup import NearDuplicateIndex, SignatureFile
+from utils.snapshot import write_snapshot
+from utils.write_behind import WriteBehindPersister
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +42,7 @@ TOPICS_FILE = f"{KNOWLEDGE_DIR}/topics.json"
 FACTS_FILE = f"{KNOWLEDGE_DIR}/facts.json"
 LEARNING_LOG = f"{KNOWLEDGE_DIR}/learning_log.json"
 CRAWLER_STATUS_FILE = f"{KNOWLEDGE_DIR}/crawler_status.json"
+HTTP_CACHE_DIR = f"{KNOWLEDGE_DIR}/http_cache"
 
 # Ensure knowledge directory exists
 os.makedirs(KNOWLEDGE_DIR, exist_ok=True)
@@ -67,31 +77,64 @@ TOPIC_SOURCES = {
 
 
 class KnowledgeGraph:
-    """Represents knowledge as a graph of connected concepts."""
+    """
+    Represents knowledge as a graph of connected concepts.
+
+    Concept IDs are interned to integers and every concept keeps outgoing and
+    incoming adjacency maps, so neighbour lookups cost O(degree) rather than
+    a scan of every relationship. Changes are persisted as an append-only log
+    next to the snapshot; once the log outgrows the graph it is folded back
+    into a fresh snapshot.
+    """
 
-    def __init__(self, load_existing: bool = True):
+    def __init__(self, load_existing: bool = True, compact_after: int = 10000):
         self.concepts = {}
-        self.relationships = []
         self.topic_concepts = defaultdict(set)
+        self.compact_after = compact_after
+        self.graph_file = f"{KNOWLEDGE_DIR}/knowledge_graph.json"
+        self.log_file = f"{KNOWLEDGE_DIR}/knowledge_graph.log"
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        # node -> {(other node, relationship): [strength, last_updated]}
+        self._out: Dict[int, Dict[tuple, list]] = defaultdict(dict)
+        self._in: Dict[int, Dict[tuple, list]] = defaultdict(dict)
+        self.edge_count = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._log_records = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
 
         if load_existing:
             self._load()
 
+    def _intern(self, concept_id: str) -> int:
+        node = self._ids.get(concept_id)
+        if node is None:
+            node = self._ids[concept_id] = len(self._names)
+            self._names.append(concept_id)
+        return node
+
     def add_concept(
         self, concept_id: str, name: str, data: Dict[str, Any], topics: List[str] = None
     ) -> str:
-        if concept_id in self.concepts:
-            self.concepts[concept_id].update(data)
-        else:
-            self.concepts[concept_id] = {
-                "name": name,
-                "last_updated": datetime.datetime.now().isoformat(),
-                "confidence": 0.7,
-                "data": data,
-            }
-        if topics:
-            for topic in topics:
-                self.topic_concepts[topic].add(concept_id)
+        with self._lock:
+            if concept_id in self.concepts:
+                self.concepts[concept_id].update(data)
+            else:
+                self.concepts[concept_id] = {
+                    "name": name,
+                    "last_updated": datetime.datetime.now().isoformat(),
+                    "confidence": 0.7,
+                    "data": data,
+                }
+                self._intern(concept_id)
+            self._pending.append(
+                {"op": "concept", "id": concept_id, "concept": dict(self.concepts[concept_id])}
+            )
+            if topics:
+                for topic in topics:
+                    self.topic_concepts[topic].add(concept_id)
+                    self._pending.append({"op": "topic", "topic": topic, "id": concept_id})
         return concept_id
 
     def add_relationship(
@@ -101,52 +144,243 @@ class KnowledgeGraph:
         concept2_id: str,
         strength: float = 0.5,
     ) -> None:
-        if concept1_id not in self.concepts or concept2_id not in self.concepts:
-            return
-        self.relationships.append(
-            {
+        """Add or update the edge concept1 -relationship-> concept2"""
+        with self._lock:
+            if concept1_id not in self.concepts or concept2_id not in self.concepts:
+                return
+            edge = {
                 "from": concept1_id,
                 "relationship": relationship,
                 "to": concept2_id,
                 "strength": strength,
                 "last_updated": datetime.datetime.now().isoformat(),
             }
-        )
+            self._set_edge(edge)
+            self._pending.append(dict(edge, op="edge"))
+
+    def _set_edge(self, edge: Dict[str, Any]) -> None:
+        source = self._intern(edge["from"])
+        target = self._intern(edge["to"])
+        relationship = sys.intern(edge["relationship"])
+        value = [edge.get("strength", 0.5), edge.get("last_updated")]
+        outgoing = self._out[source]
+        if (target, relationship) not in outgoing:
+            self.edge_count += 1
+        outgoing[(target, relationship)] = value
+        self._in[target][(source, relationship)] = value
+
+    @property
+    def relationships(self) -> List[Dict[str, Any]]:
+        """Every edge in the flat form used by the snapshot file"""
+        with self._lock:
+            names = self._names
+            return [
+                {
+                    "from": names[source],
+                    "relationship": relationship,
+                    "to": names[target],
+                    "strength": strength,
+                    "last_updated": last_updated,
+                }
+                for source, edges in self._out.items()
+                for (target, relationship), (strength, last_updated) in edges.items()
+            ]
+
+    def neighbors(
+        self, concept_id: str, direction: str = "out", relationship: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List the concepts one edge away
+
+        Args:
+            concept_id: Concept to start from
+            direction: "out", "in" or "both"
+            relationship: Only follow edges of this type
+
+        Returns:
+            [{"concept", "relationship", "strength", "direction"}] for each edge
+        """
+        with self._lock:
+            node = self._ids.get(concept_id)
+            if node is None:
+                return []
+            results = []
+            for label, adjacency in (("out", self._out), ("in", self._in)):
+                if direction not in (label, "both") or node not in adjacency:
+                    continue
+                for (other, rel), (strength, _) in adjacency[node].items():
+                    if relationship is None or rel == relationship:
+                        results.append({
+                            "concept": self._names[other],
+                            "relationship": rel,
+                            "strength": strength,
+                            "direction": label,
+                        })
+            return results
+
+    def related_concepts(
+        self,
+        concept_id: str,
+        max_depth: int = 2,
+        direction: str = "both",
+        relationship: str = None,
+        limit: int = None,
+    ) -> Dict[str, int]:
+        """
+        Breadth-first walk of the graph up to max_depth edges away
+
+        Returns:
+            {concept_id: hops} for every concept reached, nearest first,
+            excluding the starting concept
+        """
+        with self._lock:
+            start = self._ids.get(concept_id)
+            if start is None:
+                return {}
+            maps = [m for label, m in (("out", self._out), ("in", self._in))
+                    if direction in (label, "both")]
+            seen = {start}
+            frontier = [start]
+            found = {}
+            for depth in range(1, max_depth + 1):
+                next_frontier = []
+                for node in frontier:
+                    for adjacency in maps:
+                        for other, rel in adjacency.get(node, ()):
+                            if other in seen or (relationship is not None and rel != relationship):
+                                continue
+                            seen.add(other)
+                            next_frontier.append(other)
+                            found[self._names[other]] = depth
+                            if limit is not None and len(found) >= limit:
+                                return found
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+            return found
 
     def save(self) -> None:
-        graph_file = f"{KNOWLEDGE_DIR}/knowledge_graph.json"
-        topic_data = {topic: list(cids) for topic, cids in self.topic_concepts.items()}
-        data = {
-            "concepts": self.concepts,
-            "relationships": self.relationships,
-            "topic_concepts": topic_data,
-            "last_updated": datetime.datetime.now().isoformat(),
-        }
-        with open(graph_file, "w") as f:
-            json.dump(data, f, indent=2)
+        """
+        Append changes since the last save to the edge log
+
+        Safe to call from a write-behind thread. Rewrites the snapshot
+        instead once the log holds more than compact_after records and more
+        records than the graph has concepts and edges.
+        """
+        with self._save_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                live = len(self.concepts) + self.edge_count
+            if not pending:
+                return
+            if self._log_records + len(pending) > max(self.compact_after, live):
+                self._compact(pending)
+                return
+            try:
+                with open(self.log_file, "a") as f:
+                    f.write("".join(json.dumps(record) + "\n" for record in pending))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception:
+                with self._lock:
+                    self._pending[:0] = pending
+                raise
+            self._log_records += len(pending)
+
+    def compact(self) -> None:
+        """Fold the edge log into a fresh snapshot"""
+        with self._save_lock:
+            self._compact()
+
+    def _compact(self, pending: List[Dict[str, Any]] = ()) -> None:
+        # Copy under the lock so the crawler can keep adding while we serialize
+        with self._lock:
+            data = {
+                "concepts": {cid: dict(c) for cid, c in self.concepts.items()},
+                "relationships": self.relationships,
+                "topic_concepts": {
+                    topic: list(cids) for topic, cids in self.topic_concepts.items()
+                },
+                "last_updated": datetime.datetime.now().isoformat(),
+            }
+            pending = list(pending) + self._pending
+            self._pending = []
+        try:
+            write_snapshot(self.graph_file, data, indent=2)
+        except Exception:
+            # The changes are in neither file yet; keep them for the next save
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+        # Replaying a log already folded into the snapshot is harmless, so a
+        # crash between these two steps loses nothing
+        open(self.log_file, "w").close()
+        self._log_records = 0
 
     def _load(self) -> None:
-        graph_file = f"{KNOWLEDGE_DIR}/knowledge_graph.json"
-        if os.path.exists(graph_file):
+        if os.path.exists(self.graph_file):
             try:
-                with open(graph_file, "r") as f:
+                with open(self.graph_file, "r") as f:
                     data = json.load(f)
-                    self.concepts = data.get("concepts", {})
-                    self.relationships = data.get("relationships", [])
-                    for topic, concept_ids in data.get("topic_concepts", {}).items():
-                        self.topic_concepts[topic] = set(concept_ids)
+                self.concepts = data.get("concepts", {})
+                for concept_id in self.concepts:
+                    self._intern(concept_id)
+                for edge in data.get("relationships", []):
+                    self._set_edge(edge)
+                for topic, concept_ids in data.get("topic_concepts", {}).items():
+                    self.topic_concepts[topic] = set(concept_ids)
             except Exception as e:
                 logger.error(f"Error loading knowledge graph: {e}")
+        if os.path.exists(self.log_file):
+            with open(self.log_file, "r") as f:
+                for line in f:
+                    try:
+                        self._replay(json.loads(line))
+                    except (ValueError, KeyError):
+                        # A torn final line from a crash mid-append
+                        logger.warning("Skipping unreadable knowledge graph log record")
+                        continue
+                    self._log_records += 1
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "concept":
+            self.concepts[record["id"]] = record["concept"]
+            self._intern(record["id"])
+        elif op == "topic":
+            self.topic_concepts[record["topic"]].add(record["id"])
+        elif op == "edge":
+            self._set_edge(record)
 
 
 class FactManager:
-    """Manages learned facts and their retrieval."""
+    """
+    Manages learned facts and their retrieval.
 
-    def __init__(self):
+    New facts are kept in memory and written behind: facts.json is replaced
+    atomically once flush_every facts are pending or flush_delay seconds have
+    passed since the first unsaved one. A fact that near-duplicates a known
+    one is merged into it instead of being stored again. MinHash signatures
+    are appended to a .minhash file next to facts.json, so start-up only
+    hashes facts whose stored signature is missing or stale.
+
+    Each instance rewrites facts.json from its own list, so everything in a
+    process should add facts through one instance, and close() it on exit.
+    """
+
+    def __init__(self, flush_delay: float = 5.0, flush_every: int = 50):
         self.facts = []
         self.by_topic = defaultdict(list)
         self.by_confidence = defaultdict(list)
+        self.duplicates = NearDuplicateIndex()
+        self.signature_file = SignatureFile(f"{os.path.splitext(FACTS_FILE)[0]}.minhash")
+        self._lock = threading.Lock()
         self._load_facts()
+        self._index_loaded_facts()
+        self.persister = WriteBehindPersister(
+            self.save_facts, max_delay=flush_delay, max_pending=flush_every,
+            name="fact-write-behind"
+        )
 
     def _load_facts(self):
         if os.path.exists(FACTS_FILE):
@@ -156,9 +390,59 @@ class FactManager:
             except:
                 self.facts = []
 
+    def _index_loaded_facts(self):
+        texts = [fact.get("text", "") for fact in self.facts]
+        stored, stale = self.signature_file.load(texts)
+        hashed = 0
+        for index, text in enumerate(texts):
+            self.duplicates.insert(index, text, stored.get(index))
+            if index not in stored and self.duplicates.signature(index):
+                hashed += 1
+        if hashed or stale:
+            self.signature_file.rewrite(self._signature_entries(0, len(texts)))
+        # Facts before this position have their signatures on disk
+        self._signed = len(texts)
+
+    def _signature_entries(self, start: int, end: int):
+        entries = []
+        for index in range(start, end):
+            signature = self.duplicates.signature(index)
+            if signature:
+                entries.append((index, self.facts[index].get("text", ""), signature))
+        return entries
+
     def save_facts(self):
-        with open(FACTS_FILE, "w") as f:
-            json.dump(self.facts, f, indent=2)
+        with self._lock:
+            facts = list(self.facts)
+            entries = self._signature_entries(self._signed, len(facts))
+        write_snapshot(FACTS_FILE, facts, indent=2)
+        self.signature_file.append(entries)
+        self._signed = len(facts)
+
+    def flush(self):
+        """Write pending facts now"""
+        self.persister.flush()
+
+    def close(self):
+        """Write pending facts and stop the write-behind thread"""
+        self.persister.stop()
+
+    @property
+    def duplicates_suppressed(self) -> int:
+        return self.duplicates.suppressed
+
+    def _merge(self, index: int, source: str, topics: List[str], confidence: float):
+        # Replace rather than mutate, so a save serializing the old fact is unaffected
+        fact = dict(self.facts[index])
+        fact["confidence"] = max(fact.get("confidence", 0), confidence)
+        fact["topics"] = list(fact.get("topics", []))
+        fact["topics"].extend(t for t in topics if t not in fact["topics"])
+        if source != fact.get("source"):
+            metadata = fact["metadata"] = dict(fact.get("metadata") or {})
+            sources = metadata["also_seen_in"] = list(metadata.get("also_seen_in", []))
+            if source not in sources:
+                sources.append(source)
+        self.facts[index] = fact
 
     def add_fact(
         self,
@@ -168,6 +452,28 @@ class FactManager:
         confidence: float = 0.7,
         metadata: Dict[str, Any] = None,
     ) -> int:
+        """
+        Store a fact, or fold it into a near-duplicate already known
+
+        Returns:
+            Index of the stored or merged-into fact
+        """
+        return self.add_or_merge_fact(fact_text, source, topics, confidence, metadata)[0]
+
+    def add_or_merge_fact(
+        self,
+        fact_text: str,
+        source: str,
+        topics: List[str],
+        confidence: float = 0.7,
+        metadata: Dict[str, Any] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Same as add_fact, but also report whether the fact was merged
+
+        Returns:
+            (index of the stored or merged-into fact, True if it was merged)
+        """
         fact = {
             "text": fact_text,
             "source": source,
@@ -176,18 +482,246 @@ class FactManager:
             "metadata": metadata or {},
             "learned_at": datetime.datetime.now().isoformat(),
         }
-        self.facts.append(fact)
-        self.save_facts()
-        return len(self.facts) - 1
+        with self._lock:
+            index = len(self.facts)
+            existing = self.duplicates.add(index, fact_text)
+            if existing is not None:
+                self._merge(existing, source, topics, confidence)
+                index = existing
+            else:
+                self.facts.append(fact)
+        self.persister.mark_dirty()
+        return index, existing is not None
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def extract_paragraphs(html: str, limit: int = 5, min_words: int = 6) -> List[str]:
+    """Pull the substantial paragraphs out of the first limit <p> tags of a page"""
+    soup = BeautifulSoup(html, "html.parser")
+    texts = []
+    for p in soup.find_all("p")[:limit]:
+        text = p.get_text().strip()
+        if len(text.split()) >= min_words:
+            texts.append(text)
+    return texts
+
+
+class HTTPCache:
+    """On-disk cache of response validators and the paragraphs parsed from each page."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if url in self._entries:
+                return self._entries[url]
+        entry = None
+        path = self._path(url)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    entry = json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], paragraphs: List[str]):
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "paragraphs": paragraphs,
+            "fetched_at": datetime.datetime.now().isoformat(),
+        }
+        write_snapshot(self._path(url), entry)
+        with self._lock:
+            self._entries[url] = entry
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Headers that let the server answer 304 if the page is unchanged"""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class CrawlFrontier:
+    """URLs waiting to be fetched, queued per host and served round-robin."""
+
+    def __init__(self):
+        self.seen = set()
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, url: str) -> bool:
+        """Queue url unless it was already queued; returns whether it was added"""
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self._queues.setdefault(_host(url), deque()).append(url)
+        self._size += 1
+        return True
+
+    def pop(self, busy: Callable[[str], bool]) -> Optional[str]:
+        """Next URL from the first host that busy() does not reject, or None"""
+        for host in list(self._queues):
+            if busy(host):
+                continue
+            queue = self._queues.pop(host)
+            url = queue.popleft()
+            if queue:
+                # Re-queue the host at the back so hosts take turns
+                self._queues[host] = queue
+            self._size -= 1
+            return url
+        return None
+
+
+class PoliteFetcher:
+    """
+    Fetches pages on a thread pool while staying polite to each host.
+
+    At most per_host requests run against one host at a time, and requests
+    to a host start at least host_delay seconds apart. With a cache, pages
+    are requested conditionally, so an unchanged page costs a 304 and no
+    parse.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[HTTPCache] = None,
+        max_workers: int = 8,
+        per_host: int = 2,
+        host_delay: float = 1.0,
+        timeout: float = 10,
+        user_agent: str = "DerekBot/1.0",
+    ):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.per_host = max(1, per_host)
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.stats = Counter()
+        self._next_request: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch and parse one page
+
+        Returns:
+            {"url", "status", "paragraphs", "not_modified", "error"}
+        """
+        host = _host(url)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_request.get(host, now))
+            self._next_request[host] = start + self.host_delay
+        if start > now:
+            time.sleep(start - now)
+
+        result = {"url": url, "status": None, "paragraphs": [], "not_modified": False, "error": None}
+        headers = {"User-Agent": self.user_agent}
+        if self.cache:
+            headers.update(self.cache.conditional_headers(url))
+        try:
+            r = requests.get(url, headers=headers, timeout=self.timeout)
+            result["status"] = r.status_code
+            if r.status_code == 304 and self.cache and self.cache.get(url):
+                result["not_modified"] = True
+                result["paragraphs"] = self.cache.get(url).get("paragraphs", [])
+            elif r.status_code == 200:
+                result["paragraphs"] = extract_paragraphs(r.text)
+                etag = r.headers.get("ETag")
+                last_modified = r.headers.get("Last-Modified")
+                if self.cache and (etag or last_modified):
+                    self.cache.put(url, etag, last_modified, result["paragraphs"])
+        except Exception as e:
+            result["error"] = str(e)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            if result["not_modified"]:
+                self.stats["not_modified"] += 1
+            if result["error"]:
+                self.stats["errors"] += 1
+        return result
+
+    def crawl(self, urls: List[str]) -> Iterator[Dict[str, Any]]:
+        """Fetch urls concurrently, yielding each result as it completes"""
+        frontier = CrawlFrontier()
+        for url in urls:
+            frontier.add(url)
+        active = Counter()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler") as pool:
+            while frontier or running:
+                while len(running) < self.max_workers:
+                    url = frontier.pop(lambda host: active[host] >= self.per_host)
+                    if url is None:
+                        break
+                    host = _host(url)
+                    active[host] += 1
+                    running[pool.submit(self.fetch, url)] = host
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    active[running.pop(future)] -= 1
+                    yield future.result()
 
 
 class WebCrawler:
     """Live web crawler that gathers real knowledge on specified topics."""
 
-    def __init__(self, topics: List[str] = None):
+    def __init__(
+        self,
+        topics: List[str] = None,
+        flush_delay: float = 5.0,
+        flush_every: int = 50,
+        max_workers: int = 8,
+        per_host: int = 2,
+        host_delay: float = 1.0,
+        fact_manager: Optional[FactManager] = None,
+        knowledge_graph: Optional[KnowledgeGraph] = None,
+    ):
         self.running = False
         self.crawler_thread = None
         self.topics = topics or CORE_TOPICS
+        self.flush_delay = flush_delay
+        self.flush_every = flush_every
+        # Shared with the owner when given, so there is one writer per file
+        self._owns_fact_manager = fact_manager is None
+        self.fact_manager = fact_manager or FactManager(flush_delay, flush_every)
+        self.knowledge_graph = knowledge_graph or KnowledgeGraph()
+        self._graph_writer = WriteBehindPersister(
+            self.knowledge_graph.save, max_delay=flush_delay,
+            max_pending=flush_every, name="graph-write-behind"
+        )
+        self.fetcher = PoliteFetcher(
+            HTTPCache(HTTP_CACHE_DIR),
+            max_workers=max_workers,
+            per_host=per_host,
+            host_delay=host_delay,
+        )
         self.status = {
             "running": False,
             "current_topic": None,
@@ -196,6 +730,10 @@ class WebCrawler:
             "last_update": None,
         }
         self._load_status()
+        self._status_writer = WriteBehindPersister(
+            self._write_status, max_delay=flush_delay, max_pending=flush_every,
+            name="crawler-status-write-behind"
+        )
 
     def _load_status(self):
         if os.path.exists(CRAWLER_STATUS_FILE):
@@ -205,9 +743,12 @@ class WebCrawler:
             except:
                 pass
 
+    def _write_status(self):
+        write_snapshot(CRAWLER_STATUS_FILE, dict(self.status), indent=2)
+
     def _save_status(self):
-        with open(CRAWLER_STATUS_FILE, "w") as f:
-            json.dump(self.status, f, indent=2)
+        """Queue a status write; the write-behind thread batches them"""
+        self._status_writer.mark_dirty()
 
     def start(self):
         if self.running:
@@ -215,6 +756,7 @@ class WebCrawler:
         self.running = True
         self.status["running"] = True
         self._save_status()
+        self._status_writer.flush()
         self.crawler_thread = threading.Thread(target=self._crawl_loop)
         self.crawler_thread.daemon = True
         self.crawler_thread.start()
@@ -223,39 +765,59 @@ class WebCrawler:
         self.running = False
         self.status["running"] = False
         self._save_status()
+        self._status_writer.flush()
+
+    def close(self):
+        """Stop crawling and the write-behind threads it owns"""
+        self.stop()
+        self._graph_writer.stop()
+        if self._owns_fact_manager:
+            self.fact_manager.close()
+        self._status_writer.stop()
 
     def get_status(self) -> Dict[str, Any]:
         return self.status
 
     def _crawl_loop(self):
-        fact_manager = FactManager()
-        knowledge_graph = KnowledgeGraph()
+        try:
+            self._crawl(self.fact_manager, self.knowledge_graph, self._graph_writer)
+        finally:
+            self._graph_writer.flush()
+            self.fact_manager.flush()
+            self._status_writer.flush()
+
+    def _crawl(self, fact_manager, knowledge_graph, graph_writer):
         while self.running:
             topic = random.choice(self.topics)
             self.status["current_topic"] = topic
             self._save_status()
-            for url in TOPIC_SOURCES.get(topic, []):
+            for page in self.fetcher.crawl(TOPIC_SOURCES.get(topic, [])):
+                url = page["url"]
+                if page["error"]:
+                    logger.error(f"Error crawling {url}: {page['error']}")
+                    continue
+                if page["not_modified"]:
+                    # Facts from an unchanged page were learned on an earlier pass
+                    self.status["pages_unchanged"] = self.status.get("pages_unchanged", 0) + 1
+                    continue
                 try:
-                    r = requests.get(
-                        url, headers={"User-Agent": "DerekBot/1.0"}, timeout=10
-                    )
-                    if r.status_code != 200:
-                        continue
-                    soup = BeautifulSoup(r.text, "html.parser")
-                    for p in soup.find_all("p")[:5]:
-                        text = p.get_text().strip()
-                        if len(text.split()) < 6:
-                            continue
-                        fact_manager.add_fact(
+                    for text in page["paragraphs"]:
+                        _, merged = fact_manager.add_or_merge_fact(
                             text, source=url, topics=[topic], confidence=0.85
                         )
+                        if merged:
+                            self.status["duplicates_suppressed"] = (
+                                self.status.get("duplicates_suppressed", 0) + 1
+                            )
+                            self._save_status()
+                            continue
                         cid = f"{topic}_{int(time.time())}_{random.randint(1000, 9999)}"
                         knowledge_graph.add_concept(
                             cid, topic.title(), {"fact": text}, topics=[topic]
                         )
+                        graph_writer.mark_dirty()
                         self.status["facts_discovered"] += 1
                         self._save_status()
-                    knowledge_graph.save()
                 except Exception as e:
                     logger.error(f"Error crawling {url}: {e}")
             self.status["topics_processed"] += 1
@@ -268,7 +830,7 @@ class KnowledgeEngine:
     def __init__(self):
         self.graph = KnowledgeGraph()
         self.fact_manager = FactManager()
-        self.crawler = WebCrawler()
+        self.crawler = WebCrawler(fact_manager=self.fact_manager, knowledge_graph=self.graph)
 
     def start_learning(self):
         logger.info("Starting knowledge engine")
@@ -277,12 +839,18 @@ class KnowledgeEngine:
     def stop_learning(self):
         self.crawler.stop()
 
+    def close(self):
+        """Stop learning and write out anything still buffered"""
+        self.crawler.close()
+        self.fact_manager.close()
+
     def get_learning_metrics(self):
         return {
             "facts_learned": len(self.fact_manager.facts),
             "topics_explored": len(
                 {t for f in self.fact_manager.facts for t in f.get("topics", [])}
             ),
+            "duplicates_suppressed": self.fact_manager.duplicates_suppressed,
             "last_updated": datetime.datetime.now().isoformat(),
             "crawler_status": self.crawler.get_status(),
         }
@@ -296,6 +864,7 @@ def get_knowledge_engine():
     global _knowledge_engine
     if _knowledge_engine is None:
         _knowledge_engine = KnowledgeEngine()
+        atexit.register(_knowledge_engine.close)
     return _knowledge_engine
 
 
@@ -304,7 +873,7 @@ if __name__ == "__main__":
     engine.start_learning()
     time.sleep(20)
     print(engine.get_learning_metrics())
-    engine.stop_learning
+    engine.stop_learning()
 
 # ==============================================================================
 # © 2025 Everett Nathaniel Christman
@@ -0,0 +1,364 @@
+"""
+Memory Subsystem Benchmark
+The Christman AI Project
+
+Measures MemoryMesh, MemoryEngine, MemoryManager and Database against
+synthetic histories of a given size. Each system/size pair runs in its own
+process, so the reported peak RSS belongs to that pair alone. Histories are
+generated from a fixed seed, so runs on the same machine are comparable.
+
+Operations timed (where the system has them):
+    store       one new memory on top of the history
+    retrieve    a relevance search for two random vocabulary words
+    retrieve_repeat  the same search again (served by caches where present)
+    recent      the most recent memories
+    save        persisting after the stores (incremental where supported)
+    snapshot    writing the whole history to disk
+    load        opening the persisted history in a fresh instance
+    query_intent     MemoryEngine only: the latest entries for an intent
+    bulk_store       Database only: inserting the history in batches
+
+Usage:
+    python memory_benchmark.py
+    python memory_benchmark.py --sizes 10000 100000 --systems mesh engine --output results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+SYSTEMS = ("mesh", "engine", "manager", "database")
+CATEGORIES = ("conversation", "learning", "preferences", "relationships", "context", "events")
+
+_VOCABULARY = (
+    "harbor lighthouse python garden aquarium music voice memory family friend "
+    "project alphavox derek everett learning dream story morning evening coffee "
+    "school lesson robot language sign gesture tablet walk beach museum library "
+    "song guitar piano painting weather rain sunshine snow holiday birthday doctor "
+    "therapy progress milestone question answer kindness patience courage"
+).split()
+
+
+def generate_history(size: int, seed: int = 7) -> Iterator[Dict]:
+    """Yield synthetic memories spread over the past year, oldest first"""
+    rng = random.Random(seed)
+    now = time.time()
+    span = 365 * 86400
+    for i in range(size):
+        epoch = now - span + span * i / max(size, 1)
+        words = rng.choices(_VOCABULARY, k=rng.randint(6, 14))
+        yield {
+            "id": f"{i:012x}",
+            "content": f"Memory {i}: " + " ".join(words),
+            "category": rng.choice(CATEGORIES),
+            "importance": round(rng.random(), 2),
+            "timestamp_epoch": epoch,
+            "timestamp": datetime.fromtimestamp(epoch).isoformat()
+        }
+
+
+def _query(rng: random.Random) -> str:
+    return " ".join(rng.sample(_VOCABULARY, 2))
+
+
+def _time(fn: Callable, count: int = 1) -> List[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _time_each(fn: Callable, args: List) -> List[float]:
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Reduce latency samples (seconds) to count, mean and percentiles in milliseconds"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(p):
+        return ordered[min(count - 1, int(p * count))] * 1000
+
+    return {
+        "count": count,
+        "mean_ms": sum(ordered) / count * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1] * 1000
+    }
+
+
+def bench_mesh(workdir: str, size: int, ops: int, queries: int, seed: int) -> Dict[str, List[float]]:
+    from memory_mesh import MemoryMesh
+    from cryptography.fernet import Fernet
+
+    key = Fernet.generate_key()
+    mesh = MemoryMesh(memory_dir=workdir, encryption_key=key)
+    with mesh._lock.write():
+        for memory in generate_history(size, seed):
+            memory.update(metadata={}, access_count=0, last_access=memory["timestamp"])
+            mesh._file_memory(memory, memory["timestamp"])
+    results = {"snapshot": _time(mesh.compact)}
+
+    rng = random.Random(seed + 1)
+    results["store"] = _time_each(
+        lambda content: mesh.store(content, category="events"),
+        [f"New memory about {_query(rng)}" for _ in range(ops)]
+    )
+    mesh.consolidate_all(force=True)
+    query_list = [_query(rng) for _ in range(queries)]
+    results["retrieve"] = _time_each(mesh.retrieve, query_list)
+    results["retrieve_repeat"] = _time_each(mesh.retrieve, query_list)
+    results["recent"] = _time(lambda: mesh.get_recent_memories(hours=24 * 30), 20)
+    results["save"] = _time(mesh.save_memories)
+    mesh.compact()
+    mesh.archive.close()
+
+    results["load"] = _time(lambda: MemoryMesh(memory_dir=workdir, encryption_key=key).archive.close())
+    return results
+
+
+def bench_engine(workdir: str, size: int, ops: int, queries: int, seed: int) -> Dict[str, List[float]]:
+    from memory_engine import MemoryEngine
+
+    path = os.path.join(workdir, "memory_store.json")
+    engine = MemoryEngine(path)
+    engine._memory = [
+        {"key": memory["id"], "value": memory["content"], "intent": memory["category"],
+         "input": memory["content"], "output": "", "timestamp": memory["timestamp"]}
+        for memory in generate_history(size, seed)
+    ]
+    engine._rebuild_index()
+    results = {"snapshot": _time(engine.save_memory)}
+
+    rng = random.Random(seed + 1)
+    results["store"] = _time_each(
+        lambda content: engine.save({"input": content, "output": "ok", "intent": "events"}),
+        [f"New memory about {_query(rng)}" for _ in range(ops)]
+    )
+    keys = [f"{rng.randrange(size):012x}" for _ in range(queries)]
+    results["retrieve"] = _time_each(engine.get_memory, keys)
+    results["query_intent"] = _time_each(
+        lambda intent: engine.query("", intent=intent), [rng.choice(CATEGORIES) for _ in range(queries)]
+    )
+    results["recent"] = _time(lambda: engine.get_recent_events(10), 20)
+    results["save"] = _time(engine.flush)
+    engine.close()
+
+    results["load"] = _time(lambda: MemoryEngine(path).close())
+    return results
+
+
+def bench_manager(workdir: str, size: int, ops: int, queries: int, seed: int) -> Dict[str, List[float]]:
+    from memory_manager import MemoryManager
+
+    memory_dir = os.path.join(workdir, "memory")
+    manager = MemoryManager(memory_dir)
+    # Keep saves out of the store timings; they are measured on their own
+    manager.auto_save_interval = ops + 1
+    for memory in generate_history(size, seed):
+        manager.long_term_memory[memory["id"]] = {
+            "value": memory["content"], "timestamp": memory["timestamp"], "access_count": 1
+        }
+    manager._rebuild_keyword_index()
+    results = {"snapshot": _time(manager.save)}
+
+    rng = random.Random(seed + 1)
+    results["store"] = _time_each(
+        lambda content: manager.store(f"note_{rng.random()}", content),
+        [f"New memory about {_query(rng)}" for _ in range(ops)]
+    )
+    query_list = [_query(rng) for _ in range(queries)]
+    results["retrieve"] = _time_each(manager.retrieve_relevant, query_list)
+    results["retrieve_repeat"] = _time_each(manager.retrieve_relevant, query_list)
+    results["save"] = _time(manager.save)
+    manager.close()
+
+    def load():
+        loaded = MemoryManager(memory_dir)
+        loaded.load()
+        loaded.close()
+
+    results["load"] = _time(load)
+    return results
+
+
+def bench_database(workdir: str, size: int, ops: int, queries: int, seed: int) -> Dict[str, List[float]]:
+    from database import Database
+
+    path = os.path.join(workdir, "derek.db")
+    db = Database(path)
+    db.create_tables()
+    batch = []
+    start = time.perf_counter()
+    for memory in generate_history(size, seed):
+        batch.append({"content": memory["content"], "type": memory["category"]})
+        if len(batch) == 10_000:
+            db.store_memories(batch)
+            batch = []
+    db.store_memories(batch)
+    results = {"bulk_store": [time.perf_counter() - start]}
+
+    rng = random.Random(seed + 1)
+    results["store"] = _time_each(
+        lambda content: db.store_memory(content, "events"),
+        [f"New memory about {_query(rng)}" for _ in range(ops)]
+    )
+    query_list = [_query(rng) for _ in range(queries)]
+    results["retrieve"] = _time_each(db.search_memories, query_list)
+    results["retrieve_repeat"] = _time_each(db.search_memories, query_list)
+    results["recent"] = _time(lambda: db.get_recent_memories(10), 20)
+    db.close()
+
+    def load():
+        loaded = Database(path)
+        loaded.create_tables()
+        loaded.get_recent_memories(1)
+        loaded.close()
+
+    results["load"] = _time(load)
+    return results
+
+
+BENCHMARKS = {
+    "mesh": bench_mesh,
+    "engine": bench_engine,
+    "manager": bench_manager,
+    "database": bench_database
+}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(system: str, size: int, ops: int = 1000, queries: int = 100, seed: int = 7) -> Dict:
+    """Run one system/size pair in this process and summarize it"""
+    workdir = tempfile.mkdtemp(prefix=f"derek_bench_{system}_")
+    # Per-operation log lines and prints would dominate the timings
+    logging.disable(logging.INFO)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            samples = BENCHMARKS[system](workdir, size, ops, queries, seed)
+        elapsed = time.perf_counter() - start
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "system": system,
+        "size": size,
+        "operations": {name: summarize(values) for name, values in samples.items()},
+        "wall_seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def run_isolated(system: str, size: int, ops: int, queries: int, seed: int) -> Dict:
+    """Run one pair in a child process so peak RSS is not shared between pairs"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+    try:
+        command = [
+            sys.executable, os.path.abspath(__file__), "--worker", system, str(size),
+            "--ops", str(ops), "--queries", str(queries), "--seed", str(seed),
+            "--result-file", result_path
+        ]
+        completed = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {"system": system, "size": size, "error": completed.stderr.strip()[-2000:]}
+        with open(result_path) as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+
+
+def print_table(results: List[Dict]):
+    print(f"{'system':<9} {'size':>9} {'operation':<16} {'count':>6} {'mean ms':>10} {'p95 ms':>10} {'peak RSS MB':>12}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['system']:<9} {result['size']:>9} FAILED: {result['error'].splitlines()[-1]}")
+            continue
+        rss = result["peak_rss_mb"]
+        for name, stats in result["operations"].items():
+            print(f"{result['system']:<9} {result['size']:>9} {name:<16} {stats['count']:>6} "
+                  f"{stats['mean_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+                  f"{rss if rss is None else round(rss, 1):>12}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Derek's memory subsystems")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--systems", nargs="+", choices=SYSTEMS, default=list(SYSTEMS))
+    parser.add_argument("--ops", type=int, default=1000, help="stores timed per run")
+    parser.add_argument("--queries", type=int, default=100, help="retrievals timed per run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="memory_benchmark_results.json")
+    parser.add_argument("--worker", nargs=2, metavar=("SYSTEM", "SIZE"), help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        result = run_benchmark(args.worker[0], int(args.worker[1]), args.ops, args.queries, args.seed)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    results = []
+    for size in args.sizes:
+        for system in args.systems:
+            print(f"⏱️  {system} with {size:,} memories...", flush=True)
+            results.append(run_isolated(system, size, args.ops, args.queries, args.seed))
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "ops": args.ops,
+        "queries": args.queries,
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print_table(results)
+    print(f"\n📊 Results written to {args.output}")
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
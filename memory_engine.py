@@ -2,51 +2,235 @@
 import json
 import logging
 import os
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from utils.snapshot import read_snapshot, write_snapshot
+
 logger = logging.getLogger(__name__)
 
 
 class MemoryEngine:
     """Handles memory persistence, retrieval, and contextual queries."""
 
-    def __init__(self, file_path: str = "./memory/memory_store.json"):
+    def __init__(
+        self,
+        file_path: str = "./memory/memory_store.json",
+        fsync_every: int = 20,
+        fsync_interval: float = 1.0,
+        compact_on_start: bool = False,
+        snapshot_format: str = "json",
+    ):
+        """
+        Entries are appended to a JSONL log next to the JSON snapshot at
+        ``file_path``; the snapshot is only rewritten by compaction. Each
+        entry gets an increasing ``seq``, so log entries the snapshot already
+        holds (left behind by a crash during compaction) are not replayed.
+
+        Args:
+            file_path: Path of the JSON snapshot
+            fsync_every: Force the log to disk after this many unsynced entries
+            fsync_interval: Force the log to disk once this many seconds have passed since the last sync
+            compact_on_start: Fold the log into the snapshot after loading
+            snapshot_format: "json" or "binary" for snapshots written from now
+                on; either is read, so compacting converts an existing file
+        """
         self.file_path = file_path
+        self.log_path = os.path.splitext(self.file_path)[0] + ".jsonl"
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.snapshot_format = snapshot_format
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
         self._memory: List[Dict[str, Any]] = []
+        self._intent_index: Dict[str, List[int]] = defaultdict(list)
+        self._key_index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._log_file = None
+        self._file_state = None
+        self._seq = 0  # highest seq assigned or loaded
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
         self.load_memory()
+        if compact_on_start:
+            self.compact()
 
     def load_memory(self):
-        """Load stored memory entries from disk."""
-        if os.path.exists(self.file_path):
-            try:
-                with open(self.file_path, "r", encoding="utf-8") as f:
-                    self._memory = json.load(f)
-                logger.info(f"Loaded {len(self._memory)} memory entries.")
-            except Exception as e:
-                logger.error(f"Failed to load memory file: {e}")
-                self._memory = []
-        else:
-            logger.info("No existing memory file found, starting fresh.")
+        """Load the snapshot, then replay entries appended to the log since."""
+        with self._lock:
             self._memory = []
+            if os.path.exists(self.file_path):
+                try:
+                    self._memory = read_snapshot(self.file_path)
+                except Exception as e:
+                    logger.error(f"Failed to load memory file: {e}")
+                    self._memory = []
+            else:
+                logger.info("No existing memory file found, starting fresh.")
+
+            # Entries written before seq existed count as 0
+            covered = max((entry.get("seq", 0) for entry in self._memory), default=0)
+            self._seq = covered
+            replayed = 0
+            if os.path.exists(self.log_path):
+                with open(self.log_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A torn final line is expected after a crash
+                            logger.warning("Skipping unreadable memory log line.")
+                            continue
+                        seq = entry.get("seq", 0)
+                        if seq and seq <= covered:
+                            continue
+                        self._memory.append(entry)
+                        self._seq = max(self._seq, seq)
+                        replayed += 1
+
+            self._rebuild_index()
+            self._file_state = self._stat_files()
+            logger.info(f"Loaded {len(self._memory)} memory entries ({replayed} from log).")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload if the snapshot or log changed on disk since this engine last
+        read or wrote them, e.g. because another process saved an entry.
+        """
+        with self._lock:
+            if self._stat_files() == self._file_state:
+                return False
+        self.close()
+        self.load_memory()
+        return True
+
+    def _stat_files(self):
+        state = []
+        for path in (self.file_path, self.log_path):
+            try:
+                st = os.stat(path)
+                state.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                state.append(None)
+        return tuple(state)
+
+    def _rebuild_index(self):
+        self._intent_index = defaultdict(list)
+        self._key_index = {}
+        for position, entry in enumerate(self._memory):
+            self._index_entry(position, entry)
+
+    def _index_entry(self, position: int, entry: Dict[str, Any]):
+        intent = entry.get("intent")
+        if intent is not None:
+            self._intent_index[intent].append(position)
+        key = entry.get("key")
+        if key is not None:
+            self._key_index[key] = position
 
     def save_memory(self):
-        """Persist memory to disk."""
-        try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump(self._memory, f, indent=2)
+        """Persist memory to disk as a full snapshot and empty the log."""
+        with self._lock:
+            self._write_snapshot()
             logger.info(f"Saved {len(self._memory)} memory entries.")
+
+    def compact(self):
+        """Fold the append log into the snapshot."""
+        if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == 0:
+            return
+        self.save_memory()
+
+    def _write_snapshot(self, truncate_first: bool = False):
+        try:
+            self._close_log()
+            if truncate_first:
+                self._truncate_log()
+            write_snapshot(self.file_path, self._memory, self.snapshot_format, indent=2)
+            # Only drop the log once the snapshot holding its entries is in place;
+            # if that is interrupted, replay skips entries up to the snapshot's seq
+            self._truncate_log()
+            self._file_state = self._stat_files()
         except Exception as e:
             logger.error(f"Failed to save memory: {e}")
 
-    def save(self, entry: Dict[str, Any]):
-        """Save a new entry into memory."""
+    def _truncate_log(self):
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+
+    def save(self, entry: Optional[Dict[str, Any]] = None):
+        """
+        Save a new entry into memory.
+
+        The entry is appended to the log and written to the OS immediately;
+        fsync is batched by ``fsync_every``/``fsync_interval``. Called with no
+        entry, forces pending writes to disk.
+        """
+        if entry is None:
+            self.flush()
+            return
+
         entry["timestamp"] = datetime.utcnow().isoformat() + "Z"
-        self._memory.append(entry)
-        self.save_memory()
+        with self._lock:
+            self._seq += 1
+            entry["seq"] = self._seq
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            self._index_entry(len(self._memory), entry)
+            self._memory.append(entry)
+            try:
+                if self._log_file is None:
+                    self._log_file = open(self.log_path, "a", encoding="utf-8")
+                self._log_file.write(line)
+                self._log_file.flush()
+                self._unsynced += 1
+                if (
+                    self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval
+                ):
+                    self._sync()
+                self._file_state = self._stat_files()
+            except Exception as e:
+                logger.error(f"Failed to append memory entry: {e}")
         logger.debug(f"Stored new memory entry: {entry}")
 
+    def add_memory(self, key: str, value: Any, category: str = "general"):
+        """Store a keyed value; the latest entry for a key wins."""
+        self.save({"key": key, "value": value, "category": category})
+
+    def get_memory(self, key: str) -> Any:
+        """Return the latest value stored under key, or None."""
+        with self._lock:
+            position = self._key_index.get(key)
+            if position is None:
+                return None
+            return self._memory[position].get("value")
+
+    def flush(self):
+        """Force any unsynced log entries to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        """Sync and close the append log."""
+        with self._lock:
+            self._close_log()
+
+    def _sync(self):
+        if self._log_file is not None and self._unsynced:
+            os.fsync(self._log_file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close_log(self):
+        if self._log_file is not None:
+            self._sync()
+            self._log_file.close()
+            self._log_file = None
+
     def query(self, text: str, intent: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieve contextually relevant memory entries.
@@ -59,10 +243,11 @@ class MemoryEngine:
             return {"context": "No prior context found."}
 
         # Optionally filter by intent
-        if intent:
-            relevant = [m for m in self._memory if m.get("intent") == intent]
-        else:
-            relevant = self._memory[-5:]  # last 5 items
+        with self._lock:
+            if intent:
+                relevant = [self._memory[i] for i in self._intent_index.get(intent, [])[-5:]]
+            else:
+                relevant = self._memory[-5:]  # last 5 items
 
         # Return summarized context
         context_snippets = [
@@ -76,8 +261,13 @@ class MemoryEngine:
 
     def clear(self):
         """Erase all memory (use with caution)."""
-        self._memory = []
-        self.save_memory()
+        with self._lock:
+            self._memory = []
+            self._intent_index = defaultdict(list)
+            self._key_index = {}
+            # An empty snapshot covers no seq, so drop the log before writing
+            # it; otherwise a crash in between would bring the entries back
+            self._write_snapshot(truncate_first=True)
         logger.warning("All memory has been cleared.")
 
 # ==============================================================================
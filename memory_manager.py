@@ -1,27 +1,351 @@
 # memory_manager.py
 import json
 import os
+import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Hashable, Set, Callable
 from json_guardian import JSONGuardian
+from memory_mesh import INDEX_STOPWORDS
+from utils.snapshot import read_snapshot, write_snapshot
 
 guardian = JSONGuardian()
 
 
+class GitBackupWorker:
+    """Commits memory files to git on a background thread.
+
+    Requests arriving within ``debounce_seconds`` of each other are coalesced
+    into one commit, so callers never wait on git.
+    """
+    
+    def __init__(self, repo_dir: Path, pathspec: str = "memory/", debounce_seconds: float = 5.0):
+        self.repo_dir = Path(repo_dir)
+        self.pathspec = pathspec
+        self.debounce_seconds = debounce_seconds
+        self.queue_depth = 0  # requests waiting to be folded into the next commit
+        self.last_backup_latency: Optional[float] = None
+        self.last_backup_at: Optional[str] = None
+        self.backups_completed = 0
+        self._last_request = 0.0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+    
+    def request_backup(self):
+        """Queue a backup and return immediately"""
+        with self._cond:
+            self.queue_depth += 1
+            self._last_request = time.monotonic()
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, daemon=True, name="memory-git-backup")
+                self._thread.start()
+            self._cond.notify()
+    
+    def stop(self, flush: bool = True, timeout: float = 30.0):
+        """Stop the worker, running any pending backup first if flush is set"""
+        with self._cond:
+            if not flush:
+                self.queue_depth = 0
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.queue_depth and not self._stopping:
+                    self._cond.wait()
+                if not self.queue_depth:
+                    return
+                # Wait for the burst to go quiet before committing
+                while not self._stopping:
+                    remaining = self._last_request + self.debounce_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self.queue_depth = 0
+            
+            started = time.monotonic()
+            self._backup()
+            self.last_backup_latency = time.monotonic() - started
+            self.last_backup_at = datetime.now().isoformat()
+            self.backups_completed += 1
+    
+    def _backup(self):
+        """Automatically backup memory to GitHub"""
+        try:
+            # Check if we're in a git repo
+            result = subprocess.run(
+                ['git', 'rev-parse', '--is-inside-work-tree'],
+                cwd=self.repo_dir,
+                capture_output=True,
+                text=True
+            )
+            
+            if result.returncode != 0:
+                return  # Not in a git repo, skip
+            
+            # Add memory files
+            subprocess.run(
+                ['git', 'add', self.pathspec],
+                cwd=self.repo_dir,
+                capture_output=True
+            )
+            
+            # Commit with timestamp
+            commit_msg = f"💾 Auto-backup: Derek's memory update ({datetime.now().strftime('%Y-%m-%d %H:%M')})"
+            subprocess.run(
+                ['git', 'commit', '-m', commit_msg],
+                cwd=self.repo_dir,
+                capture_output=True
+            )
+            
+            print("☁️  Memory backed up to GitHub")
+            
+        except Exception as e:
+            # Silently fail - GitHub backup is nice-to-have, not critical
+            pass
+
+
+_WORD_PATTERN = re.compile(r"\w\w+")
+
+
+def _keywords(text: str) -> Set[str]:
+    """Lowercase words of two or more characters, without stopwords"""
+    return set(_WORD_PATTERN.findall(text.lower())) - INDEX_STOPWORDS
+
+
+class KeywordIndex:
+    """Inverted index from keywords to the documents containing them"""
+    
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._doc_terms: Dict[Hashable, Set[str]] = {}
+    
+    def add(self, doc_id: Hashable, text: str):
+        """Index text under doc_id, replacing whatever was indexed there before"""
+        self.add_terms(doc_id, _keywords(text))
+    
+    def add_terms(self, doc_id: Hashable, terms: Set[str]):
+        """Index already extracted keywords under doc_id"""
+        self.remove(doc_id)
+        self._doc_terms[doc_id] = terms
+        for term in terms:
+            self._postings[term].add(doc_id)
+    
+    def remove(self, doc_id: Hashable):
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[term]
+    
+    def search(self, terms: Set[str]) -> Dict[Hashable, int]:
+        """Return {doc_id: number of terms it contains} for docs matching any term"""
+        matches: Dict[Hashable, int] = defaultdict(int)
+        for term in terms:
+            for doc_id in self._postings.get(term, ()):
+                matches[doc_id] += 1
+        return matches
+    
+    def clear(self):
+        self._postings.clear()
+        self._doc_terms.clear()
+    
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+
+class LegacyMemoryFiles:
+    """Lazily loaded legacy ``*.json`` memory files.
+
+    ``refresh()`` only records each file's size and mtime. A file is parsed
+    the first time it is read and kept in an LRU cache whose total size (by
+    on-disk bytes) stays under ``budget_bytes``; evicted files are simply
+    parsed again on their next access.
+    
+    ``terms()`` keeps each file's keywords apart from that cache, keyed by
+    its mtime and size and persisted to ``index_path``, so searches can find
+    files that were never loaded or have since been evicted.
+    """
+    
+    def __init__(self, memory_dir: Path, exclude: Set[str] = frozenset(),
+                 budget_bytes: int = 32 * 1024 * 1024,
+                 on_load: Optional[Callable[[str, Any], None]] = None,
+                 index_path: Optional[Path] = None):
+        self.memory_dir = Path(memory_dir)
+        self.exclude = set(exclude)
+        self.budget_bytes = budget_bytes
+        self.on_load = on_load
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.index_path = Path(index_path) if index_path else None
+        self._terms: Optional[Dict[str, Dict[str, Any]]] = None  # read on first use
+        self._terms_lock = threading.Lock()
+    
+    def refresh(self):
+        """Rebuild the manifest from the directory listing without parsing anything"""
+        manifest = {}
+        for file_path in self.memory_dir.glob("*.json"):
+            if file_path.name in self.exclude:
+                continue
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            manifest[file_path.stem] = {'path': file_path, 'size': stat.st_size, 'mtime': stat.st_mtime}
+        with self._lock:
+            self.manifest = manifest
+            for name in list(self._cache):
+                if name not in manifest:
+                    self._evict(name)
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the parsed contents of a legacy file, loading it if needed"""
+        with self._lock:
+            entry = self.manifest.get(name)
+            if entry is None:
+                return default
+            if name in self._cache:
+                self._cache.move_to_end(name)
+                return self._cache[name]
+        
+        data = self._read(entry)
+        if data is None:
+            return default
+        
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = data
+                self._cached_bytes += entry['size']
+                # Never evict the file that was just requested
+                while self._cached_bytes > self.budget_bytes and len(self._cache) > 1:
+                    self._evict(next(iter(self._cache)))
+        if self.on_load:
+            self.on_load(name, data)
+        return data
+    
+    def _read(self, entry: Dict[str, Any]) -> Any:
+        try:
+            with open(entry['path']) as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️  Error loading {entry['path']}: {e}")
+            return None
+    
+    def terms(self) -> Dict[str, Set[str]]:
+        """Return {file stem: keywords} for every listed file
+        
+        Only files that are new or changed since their terms were recorded
+        are read, and they are not added to the parse cache.
+        """
+        with self._lock:
+            manifest = dict(self.manifest)
+            cached = {name: self._cache[name] for name in manifest if name in self._cache}
+        
+        with self._terms_lock:
+            if self._terms is None:
+                self._terms = self._read_term_index()
+            changed = False
+            for name in list(self._terms):
+                if name not in manifest:
+                    del self._terms[name]
+                    changed = True
+            result = {}
+            for name, entry in manifest.items():
+                record = self._terms.get(name)
+                if record is None or record['mtime'] != entry['mtime'] or record['size'] != entry['size']:
+                    data = cached[name] if name in cached else self._read(entry)
+                    if data is None:
+                        continue
+                    record = {'mtime': entry['mtime'], 'size': entry['size'],
+                              'terms': sorted(_keywords(str(data)))}
+                    self._terms[name] = record
+                    changed = True
+                result[name] = set(record['terms'])
+            if changed and self.index_path is not None:
+                try:
+                    write_snapshot(self.index_path, self._terms)
+                except OSError as e:
+                    print(f"⚠️  Error saving legacy term index: {e}")
+        return result
+    
+    def _read_term_index(self) -> Dict[str, Dict[str, Any]]:
+        if self.index_path is None or not self.index_path.exists():
+            return {}
+        try:
+            data = read_snapshot(self.index_path)
+        except Exception as e:
+            print(f"⚠️  Error loading legacy term index: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def _evict(self, name: str):
+        self._cache.pop(name)
+        self._cached_bytes -= self.manifest.get(name, {}).get('size', 0)
+    
+    @property
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return list(self._cache)
+    
+    @property
+    def cached_bytes(self) -> int:
+        return self._cached_bytes
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.manifest
+    
+    def __len__(self) -> int:
+        return len(self.manifest)
+
+
 class MemoryManager:
     """Manager for Derek's long-term memory storage with persistent GitHub backup"""
     
-    def __init__(self, memory_dir="./memory"):
+    # Only this many of the latest conversation entries are searched
+    conversation_search_window = 20
+    # Entries must contain at least this share of the query's keywords
+    # (or the whole query) to be returned
+    min_match_share = 0.5
+    
+    def __init__(self, memory_dir="./memory", legacy_budget_bytes: int = 32 * 1024 * 1024,
+                 snapshot_format: str = "json"):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(parents=True, exist_ok=True)
         self.memories = {}
         self.memory_file = self.memory_dir / "persistent_memory.json"
+        # "json" or "binary"; load reads either, so the next save converts
+        self.snapshot_format = snapshot_format
+        self.legacy_index_file = self.memory_dir / "legacy_terms.json"
+        self.legacy_files = LegacyMemoryFiles(
+            self.memory_dir,
+            exclude={self.memory_file.name, self.legacy_index_file.name},
+            budget_bytes=legacy_budget_bytes,
+            on_load=self._index_legacy_file,
+            index_path=self.legacy_index_file
+        )
         self.conversation_memory = []  # Current session
         self.long_term_memory = {}  # Persistent across sessions
         self.save_counter = 0
         self.auto_save_interval = 5  # Auto-save every 5 interactions
+        self.backup_worker = GitBackupWorker(self.memory_dir.parent, pathspec=f"{self.memory_dir.name}/")
+        # Documents are ("long_term", key), ("session", key), ("legacy", file stem)
+        # or ("conversation", position); legacy files are indexed from their
+        # recorded terms by the first search after load()
+        self.keyword_index = KeywordIndex()
+        self._legacy_terms_indexed = False
     
     def load(self):
         """Load ALL memories from disk - both persistent and legacy files"""
@@ -30,29 +354,57 @@ class MemoryManager:
         # Load main persistent memory file
         if self.memory_file.exists():
             try:
-                with open(self.memory_file, 'r') as f:
-                    data = json.load(f)
-                    self.long_term_memory = data.get('long_term', {})
-                    self.conversation_memory = data.get('recent_conversations', [])
-                    print(f"✅ Loaded {len(self.long_term_memory)} long-term memories")
-                    print(f"✅ Loaded {len(self.conversation_memory)} recent conversations")
+                data = read_snapshot(self.memory_file)
+                self.long_term_memory = data.get('long_term', {})
+                self.conversation_memory = data.get('recent_conversations', [])
+                print(f"✅ Loaded {len(self.long_term_memory)} long-term memories")
+                print(f"✅ Loaded {len(self.conversation_memory)} recent conversations")
             except Exception as e:
                 print(f"⚠️  Error loading persistent memory: {e}")
                 self.long_term_memory = {}
                 self.conversation_memory = []
         
-        # Load legacy memory files
-        for file_path in self.memory_dir.glob("*.json"):
-            if file_path.name == "persistent_memory.json":
-                continue  # Already loaded above
-            try:
-                with open(file_path) as f:
-                    self.memories[file_path.stem] = json.load(f)
-            except Exception as e:
-                print(f"⚠️  Error loading {file_path}: {e}")
+        # Legacy memory files are only listed here; each is parsed on first access
+        self.legacy_files.refresh()
         
-        if self.memories:
-            print(f"✅ Loaded {len(self.memories)} legacy memory files")
+        if self.legacy_files:
+            print(f"✅ Found {len(self.legacy_files)} legacy memory files")
+        
+        self._rebuild_keyword_index()
+    
+    def _rebuild_keyword_index(self):
+        """Index every searchable store from scratch"""
+        self.keyword_index.clear()
+        for key, data in self.long_term_memory.items():
+            self._index_long_term(key, data)
+        for key, value in self.memories.items():
+            self.keyword_index.add(("session", key), str(value))
+        self._legacy_terms_indexed = False
+        start = max(0, len(self.conversation_memory) - self.conversation_search_window)
+        for position in range(start, len(self.conversation_memory)):
+            self._index_conversation(position)
+    
+    def _index_long_term(self, key: str, data: Dict[str, Any]):
+        self.keyword_index.add(("long_term", key), f"{key} {data.get('value', '')}")
+    
+    def _index_legacy_file(self, name: str, data: Any):
+        self.keyword_index.add(("legacy", name), str(data))
+    
+    def _index_legacy_terms(self):
+        if self._legacy_terms_indexed:
+            return
+        for name, terms in self.legacy_files.terms().items():
+            self.keyword_index.add_terms(("legacy", name), terms)
+        self._legacy_terms_indexed = True
+    
+    def get_legacy_memory(self, name: str, default: Any = None) -> Any:
+        """Return a legacy memory file's contents by file stem, loading it on demand"""
+        return self.legacy_files.get(name, default)
+    
+    def _index_conversation(self, position: int):
+        self.keyword_index.add(("conversation", position), self.conversation_memory[position].get('value', ''))
+        # Entries that slid out of the search window are no longer indexed
+        self.keyword_index.remove(("conversation", position - self.conversation_search_window))
     
     def save(self):
         """Save ALL memories to disk with automatic GitHub backup"""
@@ -70,8 +422,7 @@ class MemoryManager:
             }
             
             # Save to persistent file
-            with open(self.memory_file, 'w') as f:
-                json.dump(memory_data, f, indent=2)
+            write_snapshot(self.memory_file, memory_data, self.snapshot_format, indent=2)
             
             print(f"💾 Saved {len(self.long_term_memory)} memories to persistent storage")
             
@@ -84,44 +435,19 @@ class MemoryManager:
             print(f"⚠️  Error saving memory: {e}")
     
     def _backup_to_github(self):
-        """Automatically backup memory to GitHub"""
-        try:
-            # Check if we're in a git repo
-            result = subprocess.run(
-                ['git', 'rev-parse', '--is-inside-work-tree'],
-                cwd=self.memory_dir.parent,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                return  # Not in a git repo, skip
-            
-            # Add memory files
-            subprocess.run(
-                ['git', 'add', 'memory/'],
-                cwd=self.memory_dir.parent,
-                capture_output=True
-            )
-            
-            # Commit with timestamp
-            commit_msg = f"💾 Auto-backup: Derek's memory update ({datetime.now().strftime('%Y-%m-%d %H:%M')})"
-            subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                cwd=self.memory_dir.parent,
-                capture_output=True
-            )
-            
-            print("☁️  Memory backed up to GitHub")
-            
-        except Exception as e:
-            # Silently fail - GitHub backup is nice-to-have, not critical
-            pass
+        """Queue a GitHub backup; the commit runs on the backup worker thread"""
+        self.backup_worker.request_backup()
+    
+    def close(self):
+        """Save and wait for any queued GitHub backup to finish"""
+        self.save()
+        self.backup_worker.stop(flush=True)
     
     def store(self, key: str, value: Any):
         """Store a memory - both in session and long-term"""
         # Store in session
         self.memories[key] = value
+        self.keyword_index.add(("session", key), str(value))
         
         # Store in long-term with timestamp
         timestamp = datetime.now().isoformat()
@@ -130,6 +456,7 @@ class MemoryManager:
             'timestamp': timestamp,
             'access_count': self.long_term_memory.get(key, {}).get('access_count', 0) + 1
         }
+        self._index_long_term(key, self.long_term_memory[key])
         
         # Add to conversation memory
         self.conversation_memory.append({
@@ -137,47 +464,96 @@ class MemoryManager:
             'value': str(value)[:200],  # First 200 chars
             'timestamp': timestamp
         })
+        self._index_conversation(len(self.conversation_memory) - 1)
         
         # Auto-save periodically
         if len(self.conversation_memory) % self.auto_save_interval == 0:
             self.save()
     
-    def retrieve_relevant(self, query: str) -> str:
-        """Retrieve memories relevant to query - ALWAYS checks memory"""
-        relevant = []
+    def retrieve_relevant(self, query: str, limit: int = 5) -> str:
+        """Retrieve memories relevant to query - ALWAYS checks memory
+        
+        Candidates come from the keyword index; stopwords are ignored and an
+        entry needs ``min_match_share`` of the query's keywords or the whole
+        query. They are ranked by the share of query words they contain, with
+        a bonus for containing the whole query.
+        Long-term memories win ties over session memories and conversations.
+        """
         query_lower = query.lower()
+        terms = _keywords(query_lower)
+        if not terms:
+            return ""
+        self._index_legacy_terms()
         
-        # Check long-term memory first
-        for key, data in self.long_term_memory.items():
-            value = str(data.get('value', ''))
-            if query_lower in value.lower() or query_lower in key.lower():
+        conversation_start = len(self.conversation_memory) - self.conversation_search_window
+        ranked = []
+        for (source, ref), matched in self.keyword_index.search(terms).items():
+            if source == "long_term":
+                data = self.long_term_memory.get(ref)
+                if data is None:
+                    continue
+                text = str(data.get('value', ''))
+                haystack = f"{ref} {text}".lower()
+                priority = 2
+            elif source == "session":
+                if ref not in self.memories:
+                    continue
+                text = str(self.memories[ref])
+                haystack = text.lower()
+                priority = 1
+            elif source == "legacy":
+                # Parsed here if it was never loaded or was evicted since
+                if ref not in self.legacy_files:
+                    continue
+                text = str(self.legacy_files.get(ref, ''))
+                haystack = text.lower()
+                priority = 1
+            else:
+                if ref < conversation_start or ref >= len(self.conversation_memory):
+                    continue
+                text = self.conversation_memory[ref].get('value', '')
+                haystack = text.lower()
+                priority = 0
+            share = matched / len(terms)
+            whole = query_lower in haystack
+            if share < self.min_match_share and not whole:
+                continue
+            score = share + (1.0 if whole else 0.0)
+            ranked.append((score, priority, text, source, ref))
+        
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        
+        relevant = []
+        seen = set()
+        for score, priority, text, source, ref in ranked:
+            if text in seen:
+                continue
+            seen.add(text)
+            relevant.append(text)
+            if source == "long_term":
                 # Update access count
+                data = self.long_term_memory[ref]
                 data['access_count'] = data.get('access_count', 0) + 1
                 data['last_accessed'] = datetime.now().isoformat()
-                relevant.append(value)
-        
-        # Check session memories
-        for key, value in self.memories.items():
-            if query_lower in str(value).lower():
-                relevant.append(str(value))
-        
-        # Check recent conversations
-        for conv in self.conversation_memory[-20:]:  # Last 20 conversations
-            if query_lower in conv.get('value', '').lower():
-                relevant.append(conv.get('value', ''))
+            if len(relevant) >= limit:
+                break
         
-        # Return most relevant (unique)
-        unique_relevant = list(dict.fromkeys(relevant))  # Remove duplicates
-        return " | ".join(unique_relevant[:5]) if unique_relevant else ""
+        return " | ".join(relevant)
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get statistics about Derek's memory"""
         return {
             'long_term_memories': len(self.long_term_memory),
             'session_memories': len(self.memories),
+            'legacy_files': len(self.legacy_files),
+            'legacy_files_loaded': len(self.legacy_files.loaded),
+            'legacy_cache_bytes': self.legacy_files.cached_bytes,
             'recent_conversations': len(self.conversation_memory),
             'most_accessed': self._get_most_accessed(5),
-            'memory_file_exists': self.memory_file.exists()
+            'memory_file_exists': self.memory_file.exists(),
+            'backup_queue_depth': self.backup_worker.queue_depth,
+            'last_backup_latency': self.backup_worker.last_backup_latency,
+            'last_backup_at': self.backup_worker.last_backup_at
         }
     
     def _get_most_accessed(self, limit=5) -> List[str]:
@@ -13,17 +13,27 @@ Mimics human memory architecture:
 """
 
 import json
+import mmap
+import re
+import struct
 import time
+import zlib
+import heapq
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 import threading
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Sequence
+from contextlib import contextmanager
 import logging
 import os
 from cryptography.fernet import Fernet
 
+from utils.encryption import ChunkedCipher, is_chunked_file
+from utils.snapshot import decode_snapshot, encode_snapshot
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,18 +45,341 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Words too common to be useful as retrieval keys
+INDEX_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "in",
+    "is", "it", "me", "my", "of", "on", "or", "that", "the", "this", "to",
+    "was", "we", "what", "with", "you"
+})
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+MEMORY_CATEGORIES = ("conversation", "learning", "preferences", "relationships", "context", "events")
+
+
+def ensure_epoch(memory: Dict) -> float:
+    """Return the memory's timestamp as epoch seconds, caching it on the record"""
+    epoch = memory.get("timestamp_epoch")
+    if epoch is None:
+        epoch = datetime.fromisoformat(memory["timestamp"]).timestamp()
+        memory["timestamp_epoch"] = epoch
+    return epoch
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the lowercase terms used by the retrieval index"""
+    return {
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in INDEX_STOPWORDS
+    }
+
+
+class ReadWriteLock:
+    """
+    Lock allowing many concurrent readers or a single writer
+    
+    Waiting writers block new readers so consolidation cannot be starved by
+    a steady stream of retrievals. Neither side is reentrant.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+    
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            self.release_write()
+    
+    def try_write(self) -> bool:
+        """Take the write lock only if it is free right now; pair with release_write"""
+        with self._cond:
+            if self._writer or self._readers:
+                return False
+            self._writer = True
+            return True
+    
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class MemoryView(Sequence):
+    """
+    Read-only list of memories backed by an ID list and the canonical memory table
+    """
+    
+    def __init__(self, memory_ids: List[str], memories: Dict[str, Dict]):
+        self._memory_ids = memory_ids
+        self._memories = memories
+    
+    def __len__(self) -> int:
+        return len(self._memory_ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._memories[memory_id] for memory_id in self._memory_ids[index]]
+        return self._memories[self._memory_ids[index]]
+    
+    def __iter__(self):
+        for memory_id in self._memory_ids:
+            yield self._memories[memory_id]
+    
+    def __repr__(self) -> str:
+        return f"MemoryView({len(self)} memories)"
+
+
+class RetrievalCache:
+    """
+    Bounded LRU of retrieval results
+    
+    Each entry remembers the mesh generation it was computed at; once any
+    write bumps the generation, older entries are treated as misses.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple, generation: int) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: tuple, generation: int, results: List[Dict]):
+        with self._lock:
+            self._entries[key] = (generation, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ColdArchive:
+    """
+    Append-only on-disk tier for aged memories
+    
+    Each archive run writes one new, never modified segment of length-prefixed
+    records (zlib-compressed, then encrypted) plus a small term index. Only the
+    indexes stay in RAM; records are read through mmap when a search needs them.
+    """
+    
+    _LENGTH = struct.Struct(">I")
+    # Extra candidates decoded beyond a search limit, since the term count
+    # used to pick them only approximates the final relevance
+    search_margin = 5
+    
+    def __init__(self, archive_dir: Path, cipher: Optional[Fernet] = None):
+        self.archive_dir = Path(archive_dir)
+        self.cipher = cipher
+        self.postings: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+        self.locations: Dict[str, Tuple[int, int]] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._next_segment = 1
+        self._lock = threading.Lock()
+        self.load()
+    
+    def __len__(self) -> int:
+        return len(self.locations)
+    
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self.locations
+    
+    @property
+    def segment_count(self) -> int:
+        return len({segment for segment, offset in self.locations.values()})
+    
+    def _segment_path(self, segment: int, suffix: str) -> Path:
+        return self.archive_dir / f"segment_{segment:06d}{suffix}"
+    
+    def _encode(self, payload: Any) -> bytes:
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        return self.cipher.encrypt(data) if self.cipher else data
+    
+    def _decode(self, data: bytes) -> Any:
+        if self.cipher:
+            data = self.cipher.decrypt(data)
+        return json.loads(zlib.decompress(data).decode())
+    
+    def load(self):
+        """Read the term index of every segment; records stay on disk"""
+        with self._lock:
+            if not self.archive_dir.exists():
+                return
+            # A segment only counts once its index exists, so a crash while
+            # archiving leaves no half-visible segment behind
+            for index_file in sorted(self.archive_dir.glob("segment_*.idx")):
+                segment = int(index_file.stem.split("_")[1])
+                try:
+                    index = self._decode(index_file.read_bytes())
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable archive index {index_file.name}: {e}")
+                    continue
+                for memory_id, offset in index["ids"].items():
+                    self.locations[memory_id] = (segment, offset)
+                for term, offsets in index["terms"].items():
+                    self.postings[term].update((segment, offset) for offset in offsets)
+                self._next_segment = max(self._next_segment, segment + 1)
+    
+    def append(self, memories: List[Dict]) -> int:
+        """Write memories to a new segment and index them; returns the segment number"""
+        with self._lock:
+            segment = self._next_segment
+            chunks = []
+            offset = 0
+            ids = {}
+            terms = defaultdict(list)
+            for memory in memories:
+                record = self._encode(memory)
+                chunks.append(self._LENGTH.pack(len(record)))
+                chunks.append(record)
+                ids[memory["id"]] = offset
+                for term in tokenize(memory["content"]):
+                    terms[term].append(offset)
+                offset += self._LENGTH.size + len(record)
+            
+            self.archive_dir.mkdir(exist_ok=True, parents=True)
+            self._write_atomic(self._segment_path(segment, ".seg"), b"".join(chunks))
+            self._write_atomic(self._segment_path(segment, ".idx"), self._encode({"ids": ids, "terms": terms}))
+            
+            for memory_id, record_offset in ids.items():
+                self.locations[memory_id] = (segment, record_offset)
+            for term, offsets in terms.items():
+                self.postings[term].update((segment, record_offset) for record_offset in offsets)
+            self._next_segment = segment + 1
+            return segment
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        temp_file = path.with_suffix(".tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    
+    def search(self, terms: Set[str], exclude: Set[str] = frozenset(),
+               limit: Optional[int] = None) -> List[Dict]:
+        """
+        Decode the archived memories sharing at least one term
+        
+        With a limit, candidates are ranked by how many of the terms they are
+        indexed under (newest first on ties) and only the best
+        ``limit + search_margin`` are decoded.
+        """
+        with self._lock:
+            matches: Dict[Tuple[int, int], int] = defaultdict(int)
+            for term in terms:
+                for location in self.postings.get(term, ()):
+                    matches[location] += 1
+        
+        if limit is None:
+            locations = sorted(matches)
+        else:
+            locations = heapq.nlargest(limit + self.search_margin, matches,
+                                       key=lambda location: (matches[location], location))
+        
+        memories = []
+        for segment, offset in locations:
+            try:
+                memory = self.read(segment, offset)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable archive record {segment}:{offset}: {e}")
+                continue
+            if memory["id"] not in exclude:
+                memories.append(memory)
+        return memories
+    
+    def read(self, segment: int, offset: int) -> Dict:
+        """Decode one record from a memory-mapped segment"""
+        segment_map = self._map(segment)
+        (length,) = self._LENGTH.unpack_from(segment_map, offset)
+        start = offset + self._LENGTH.size
+        return self._decode(segment_map[start:start + length])
+    
+    def _map(self, segment: int) -> mmap.mmap:
+        with self._lock:
+            segment_map = self._maps.get(segment)
+            if segment_map is None:
+                with open(self._segment_path(segment, ".seg"), 'rb') as f:
+                    segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[segment] = segment_map
+            return segment_map
+    
+    def close(self):
+        with self._lock:
+            for segment_map in self._maps.values():
+                segment_map.close()
+            self._maps = {}
+    
+    def clear(self):
+        """Delete every segment"""
+        self.close()
+        with self._lock:
+            if self.archive_dir.exists():
+                for path in self.archive_dir.glob("segment_*"):
+                    path.unlink()
+            self.postings = defaultdict(set)
+            self.locations = {}
+            self._next_segment = 1
+
+
 class MemoryMesh:
     """
     Human-like memory system with automatic categorization and consolidation
     """
     
-    def __init__(self, memory_dir: str = "derek_memory", encryption_key: Optional[bytes] = None):
+    def __init__(self, memory_dir: str = "derek_memory", encryption_key: Optional[bytes] = None,
+                 snapshot_format: str = "json"):
         """
         Initialize the Memory Mesh
         
         Args:
             memory_dir: Directory to store persistent memory files
             encryption_key: Optional Fernet key for encrypting memory files
+            snapshot_format: "json" or "binary" for snapshots written by
+                compaction; both are read, so compact() converts existing files
         """
         self.memory_dir = Path(memory_dir)
         try:
@@ -59,39 +392,82 @@ class MemoryMesh:
         
         self.encryption_key = encryption_key or Fernet.generate_key()
         self.cipher = Fernet(self.encryption_key) if self.encryption_key else None
+        # Snapshots are streamed through chunked encryption; journal and
+        # archive records are small and stay individual Fernet tokens
+        self.chunked = ChunkedCipher(self.encryption_key) if self.encryption_key else None
+        self.snapshot_format = snapshot_format
         self.working_memory = []
         self.working_memory_limit = 7
-        self.episodic_memory = []
-        self.semantic_memory = {
-            "conversation": [],
-            "learning": [],
-            "preferences": [],
-            "relationships": [],
-            "context": [],
-            "events": []
-        }
+        # Every memory is held once, keyed by ID; episodic order and
+        # semantic categories are ID lists into this table
+        self.memories: Dict[str, Dict] = {}
+        self._episodic_ids: List[str] = []
+        self._semantic_ids: Dict[str, List[str]] = {category: [] for category in MEMORY_CATEGORIES}
         self.memory_importance = {}
         self.memory_access_count = defaultdict(int)
         self.memory_last_access = {}
+        self.memory_index: Dict[str, Set[str]] = defaultdict(set)
         self.consolidation_threshold = 5
         self.last_consolidation = time.time()
         self.auto_consolidate = True
-        self._lock = threading.Lock()
+        # Saves append encrypted records to the journal; once it holds this many
+        # records it is compacted into the snapshot files in the background
+        self.journal_file = self.memory_dir / "memory_journal.log"
+        self.journal_compact_threshold = 500
+        self._journal_pending: List[Dict] = []
+        self._journal_records = 0
+        self._dirty_access: Set[str] = set()
+        self._compaction_thread: Optional[threading.Thread] = None
+        # Retrievals share the read lock; access bumps go through a deque
+        # (append is atomic) and are applied by whoever next holds the write lock
+        self._access_buffer = deque()
+        self.access_buffer_limit = 1024
+        # Serializes journal file I/O so it can happen outside the write lock
+        self._journal_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._lock = ReadWriteLock()
+        # Bumped by every change to the stores or index; cached retrievals
+        # from an older generation are recomputed
+        self._generation = 0
+        self.retrieval_cache = RetrievalCache()
+        # Old, unimportant and rarely recalled memories move to the cold
+        # archive; it is only searched when the hot tier comes up short
+        self.archive_after_days = 30
+        self.archive_importance_threshold = 0.3
+        self.archive_max_access = 1
+        self.archive = ColdArchive(self.memory_dir / "archive", self.cipher)
         
         try:
             self.load_memories()
         except Exception as e:
             logger.warning(f"Failed to load memories, starting fresh: {e}")
-            self.episodic_memory = []
-            self.semantic_memory = {k: [] for k in self.semantic_memory}
+            self.memories = {}
+            self._episodic_ids = []
+            self._semantic_ids = {category: [] for category in MEMORY_CATEGORIES}
             self.memory_importance = {}
             self.memory_access_count = defaultdict(int)
             self.memory_last_access = {}
+            self.memory_index = defaultdict(set)
+            self._journal_records = 0
+            self._generation += 1
         
         logger.info("🧠 Memory Mesh initialized")
         logger.info(f"   Working Memory: {len(self.working_memory)} items")
         logger.info(f"   Episodic Memory: {len(self.episodic_memory)} experiences")
-        logger.info(f"   Semantic Memory: {sum(len(v) for v in self.semantic_memory.values())} facts")
+        logger.info(f"   Semantic Memory: {sum(len(v) for v in self._semantic_ids.values())} facts")
+    
+    @property
+    def episodic_memory(self) -> MemoryView:
+        """Long-term memories in the order they were consolidated"""
+        return MemoryView(self._episodic_ids, self.memories)
+    
+    @property
+    def semantic_memory(self) -> Dict[str, MemoryView]:
+        """Long-term memories grouped by category"""
+        return {
+            category: MemoryView(memory_ids, self.memories)
+            for category, memory_ids in self._semantic_ids.items()
+        }
     
     def store(self, content: str, category: str = "auto", importance: float = 0.5, metadata: Dict = None) -> str:
         """
@@ -115,12 +491,14 @@ class MemoryMesh:
             importance = 0.5
         
         memory_id = self._generate_memory_id(content)
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        timestamp = now.isoformat()
         
         memory = {
             "id": memory_id,
             "content": content.strip(),
             "timestamp": timestamp,
+            "timestamp_epoch": now.timestamp(),
             "importance": importance,
             "metadata": metadata or {},
             "access_count": 0,
@@ -129,15 +507,17 @@ class MemoryMesh:
         
         if category == "auto":
             category = self._auto_categorize(content, metadata)
-        elif category not in self.semantic_memory and category != "episodic":
+        elif category not in MEMORY_CATEGORIES and category != "episodic":
             logger.warning(f"Invalid category {category}, defaulting to context")
             category = "context"
         
         memory["category"] = category
         
-        with self._lock:
+        with self._lock.write():
+            self.memories[memory_id] = memory
             self.working_memory.append(memory)
             self.memory_importance[memory_id] = importance
+            self._index_memory(memory)
         
             if len(self.working_memory) > self.working_memory_limit:
                 self._consolidate_overflow()
@@ -150,7 +530,7 @@ class MemoryMesh:
         content_lower = content.lower()
         metadata = metadata or {}
         
-        if metadata.get("type") in self.semantic_memory:
+        if metadata.get("type") in MEMORY_CATEGORIES:
             return metadata["type"]
         if metadata.get("speaker"):
             return "conversation"
@@ -169,57 +549,97 @@ class MemoryMesh:
         return "context"
     
     def _consolidate_overflow(self):
-        """Consolidate working memory when it's too full"""
-        with self._lock:
-            sorted_memories = sorted(
-                self.working_memory,
-                key=lambda m: (m["importance"], m["timestamp"]),
-                reverse=False
-            )
-            
-            while len(self.working_memory) > self.working_memory_limit:
-                memory = sorted_memories.pop(0)
-                self._consolidate_memory(memory)
-                self.working_memory.remove(memory)
+        """Consolidate working memory when it's too full (caller holds the write lock)"""
+        sorted_memories = sorted(
+            self.working_memory,
+            key=lambda m: (m["importance"], ensure_epoch(m)),
+            reverse=False
+        )
+        
+        while len(self.working_memory) > self.working_memory_limit:
+            memory = sorted_memories.pop(0)
+            self._consolidate_memory(memory)
+            self.working_memory.remove(memory)
     
     def consolidate_all(self, force: bool = False):
         """Consolidate all working memory to long-term storage"""
-        with self._lock:
+        with self._lock.write():
             if not force and len(self.working_memory) < self.consolidation_threshold:
                 return
             
             logger.info("🌙 Consolidating memories...")
             consolidated_count = len(self.working_memory)
-            for memory in self.working_memory[:]:
+            for memory in self.working_memory:
                 self._consolidate_memory(memory)
             
             self.working_memory.clear()
             self.last_consolidation = time.time()
-            self.save_memories()
-            
-            logger.info(f"✅ Consolidated {consolidated_count} memories")
+        
+        # Journal I/O happens after the write lock is released
+        self.save_memories()
+        
+        logger.info(f"✅ Consolidated {consolidated_count} memories")
     
     def _consolidate_memory(self, memory: Dict):
-        """Move a memory from working to long-term storage"""
-        with self._lock:
-            category = memory.get("category", "context")
-            self.episodic_memory.append(memory)
-            if category in self.semantic_memory:
-                self.semantic_memory[category].append(memory)
-            else:
-                self.semantic_memory["context"].append(memory)
-            
-            memory_id = memory["id"]
-            self.memory_last_access[memory_id] = datetime.now().isoformat()
+        """Move a memory from working to long-term storage (caller holds the write lock)"""
+        last_access = datetime.now().isoformat()
+        self._file_memory(memory, last_access)
+        self._journal_pending.append({"op": "memory", "memory": memory, "last_access": last_access})
+    
+    def _file_memory(self, memory: Dict, last_access: str):
+        """File a memory into the long-term stores (caller holds the write lock)"""
+        memory_id = memory["id"]
+        category = memory.get("category", "context")
+        ensure_epoch(memory)
+        if memory_id not in self.memories:
+            self._index_memory(memory)
+        self.memories[memory_id] = memory
+        self.memory_importance.setdefault(memory_id, memory.get("importance", 0.5))
+        self._episodic_ids.append(memory_id)
+        if category in self._semantic_ids:
+            self._semantic_ids[category].append(memory_id)
+        else:
+            self._semantic_ids["context"].append(memory_id)
+        
+        self.memory_last_access[memory_id] = last_access
+        self._generation += 1
+    
+    def _index_memory(self, memory: Dict):
+        """Add a memory's terms to the retrieval index (caller holds the write lock)"""
+        memory_id = memory["id"]
+        for term in tokenize(memory["content"]):
+            self.memory_index[term].add(memory_id)
+        self._generation += 1
+    
+    def _unindex_memory(self, memory_id: str):
+        """Remove a memory from the retrieval index (caller holds the write lock)"""
+        memory = self.memories.get(memory_id)
+        if memory is None:
+            return
+        for term in tokenize(memory["content"]):
+            postings = self.memory_index.get(term)
+            if postings is None:
+                continue
+            postings.discard(memory_id)
+            if not postings:
+                del self.memory_index[term]
+        self._generation += 1
+    
+    def _rebuild_index(self):
+        """Rebuild the retrieval index from all loaded memories (caller holds the write lock)"""
+        self.memory_index = defaultdict(set)
+        for memory in self.memories.values():
+            self._index_memory(memory)
     
     def _start_consolidation_thread(self):
         """Start background thread for automatic consolidation"""
         def consolidation_loop():
             while self.auto_consolidate:
                 time.sleep(300)
-                with self._lock:
-                    if len(self.working_memory) >= self.consolidation_threshold:
-                        self.consolidate_all()
+                # Checks the threshold itself and holds the write lock only
+                # while filing memories, not while writing the journal
+                self.consolidate_all()
+                self.archive_cold_memories()
         
         thread = threading.Thread(target=consolidation_loop, daemon=True)
         thread.start()
@@ -245,39 +665,69 @@ class MemoryMesh:
             logger.warning(f"Invalid limit {limit}, defaulting to 5")
             limit = 5
         
-        query_lower = query.lower()
-        results = []
+        # Scoring only depends on the lowercased words, so spacing and case
+        # differences share a cache entry
+        query_lower = " ".join(query.lower().split())
+        query_terms = tokenize(query_lower)
+        cache_key = (query_lower, category, limit)
         
-        with self._lock:
-            for memory in self.working_memory:
-                score = self._calculate_relevance(memory, query_lower)
-                if score > 0:
-                    results.append((score, memory))
-                    self._mark_accessed(memory["id"])
+        with self._lock.read():
+            cached = self.retrieval_cache.get(cache_key, self._generation)
+        
+        if cached is not None:
+            for memory in cached:
+                self._mark_accessed(memory["id"])
+            self._drain_access_buffer()
+            logger.info(f"🔍 Retrieved {len(cached)} memories for query '{query}' (cached)")
+            return cached
+        
+        with self._lock.read():
+            generation = self._generation
+            candidate_ids = set()
+            for term in query_terms:
+                candidate_ids.update(self.memory_index.get(term, ()))
             
-            for memory in self.episodic_memory:
-                if category and memory.get("category") != category:
+            working_ids = {memory["id"] for memory in self.working_memory}
+            now = time.time()
+            results = []
+            for memory_id in candidate_ids:
+                memory = self.memories.get(memory_id)
+                if memory is None:
                     continue
-                score = self._calculate_relevance(memory, query_lower)
+                if category and memory_id not in working_ids and memory.get("category") != category:
+                    continue
+                score = self._calculate_relevance(memory, query_lower, now)
                 if score > 0:
                     results.append((score, memory))
-                    self._mark_accessed(memory["id"])
             
-            categories_to_search = [category] if category else self.semantic_memory.keys()
-            for cat in categories_to_search:
-                for memory in self.semantic_memory.get(cat, []):
-                    score = self._calculate_relevance(memory, query_lower)
+            top_results = heapq.nlargest(limit, results, key=lambda x: x[0])
+            
+            # The cold archive only fills slots the hot tier left empty
+            if len(top_results) < limit and len(self.archive):
+                archived = []
+                for memory in self.archive.search(query_terms, exclude=self.memories.keys(),
+                                                  limit=limit - len(top_results)):
+                    if category and memory.get("category") != category:
+                        continue
+                    score = self._calculate_relevance(memory, query_lower, now)
                     if score > 0:
-                        results.append((score, memory))
-                        self._mark_accessed(memory["id"])
+                        archived.append((score, memory))
+                top_results += heapq.nlargest(limit - len(top_results), archived, key=lambda x: x[0])
+        
+        memories = [memory for score, memory in top_results]
+        self.retrieval_cache.put(cache_key, generation, memories)
         
-        results.sort(key=lambda x: x[0], reverse=True)
-        logger.info(f"🔍 Retrieved {len(results[:limit])} memories for query '{query}'")
-        return [memory for score, memory in results[:limit]]
+        for memory in memories:
+            self._mark_accessed(memory["id"])
+        self._drain_access_buffer()
+        
+        logger.info(f"🔍 Retrieved {len(memories)} memories for query '{query}' "
+                    f"({len(candidate_ids)} candidates)")
+        return memories
     
     def get_working_memory(self) -> List[Dict]:
         """Return current working memory"""
-        with self._lock:
+        with self._lock.read():
             return self.working_memory[:]
     
     def get_recent_memories(self, hours: int = 2, limit: int = 10) -> List[Dict]:
@@ -291,14 +741,13 @@ class MemoryMesh:
         Returns:
             List of recent memories
         """
-        with self._lock:
-            cutoff = datetime.now() - timedelta(hours=hours)
-            recent = [
-                mem for mem in self.episodic_memory + self.working_memory
-                if datetime.fromisoformat(mem["timestamp"]) >= cutoff
-            ]
-            recent.sort(key=lambda x: x["timestamp"], reverse=True)
-            return recent[:limit]
+        with self._lock.read():
+            cutoff = time.time() - hours * 3600
+            return heapq.nlargest(
+                limit,
+                (mem for mem in self.memories.values() if mem["timestamp_epoch"] >= cutoff),
+                key=lambda mem: mem["timestamp_epoch"]
+            )
     
     def get_by_category(self, category: str, limit: int = 5) -> List[Dict]:
         """
@@ -315,12 +764,12 @@ class MemoryMesh:
             logger.error("Invalid category: must be non-empty string")
             raise ValueError("Category must be a non-empty string")
         
-        with self._lock:
-            if category in self.semantic_memory:
-                return self.semantic_memory[category][-limit:]
+        with self._lock.read():
+            if category in self._semantic_ids:
+                return MemoryView(self._semantic_ids[category], self.memories)[-limit:]
             return []
     
-    def _calculate_relevance(self, memory: Dict, query: str) -> float:
+    def _calculate_relevance(self, memory: Dict, query: str, now: Optional[float] = None) -> float:
         """Calculate memory relevance to query"""
         score = 0.0
         content = memory["content"].lower()
@@ -335,8 +784,8 @@ class MemoryMesh:
         importance = memory.get("importance", 0.5)
         score += importance * 0.2
         
-        timestamp = datetime.fromisoformat(memory["timestamp"])
-        age_hours = (datetime.now() - timestamp).total_seconds() / 3600
+        now = now if now is not None else time.time()
+        age_hours = (now - memory["timestamp_epoch"]) / 3600
         recency_score = max(0, 1 - (age_hours / (24 * 7)))
         score += recency_score * 0.1
         
@@ -347,103 +796,387 @@ class MemoryMesh:
         return score
     
     def _mark_accessed(self, memory_id: str):
-        """Mark memory as accessed"""
-        with self._lock:
+        """Mark memory as accessed; safe to call without holding any lock"""
+        self._access_buffer.append((memory_id, datetime.now().isoformat()))
+    
+    def _drain_access_buffer(self):
+        """Apply buffered access bumps if the write lock is free or the buffer is full"""
+        if not self._access_buffer:
+            return
+        if self._lock.try_write():
+            try:
+                self._apply_access_buffer()
+            finally:
+                self._lock.release_write()
+        elif len(self._access_buffer) >= self.access_buffer_limit:
+            with self._lock.write():
+                self._apply_access_buffer()
+    
+    def _apply_access_buffer(self):
+        """Fold buffered access bumps into the counters (caller holds the write lock)"""
+        while self._access_buffer:
+            memory_id, accessed_at = self._access_buffer.popleft()
+            if memory_id not in self.memories:
+                # Archived (or since cleared) memories keep no counters
+                continue
             self.memory_access_count[memory_id] += 1
-            self.memory_last_access[memory_id] = datetime.now().isoformat()
+            self.memory_last_access[memory_id] = accessed_at
+            self._dirty_access.add(memory_id)
     
     def save_memories(self):
-        """Save all memories to disk with encryption"""
+        """
+        Persist changes since the last save by appending them to the journal
+        
+        Each record is encrypted on its own, so the cost of a save depends on
+        what changed rather than on the size of the whole memory store.
+        """
         try:
-            with self._lock:
-                episodic_file = self.memory_dir / "episodic_memory.json"
-                data = json.dumps(self.episodic_memory, indent=2).encode()
-                if self.cipher:
-                    data = self.cipher.encrypt(data)
-                with open(episodic_file, 'wb') as f:
-                    f.write(data)
-                
-                semantic_file = self.memory_dir / "semantic_memory.json"
-                data = json.dumps(self.semantic_memory, indent=2).encode()
-                if self.cipher:
-                    data = self.cipher.encrypt(data)
-                with open(semantic_file, 'wb') as f:
-                    f.write(data)
-                
-                metadata = {
-                    "importance": self.memory_importance,
-                    "access_count": dict(self.memory_access_count),
-                    "last_access": self.memory_last_access
-                }
-                metadata_file = self.memory_dir / "memory_metadata.json"
-                data = json.dumps(metadata, indent=2).encode()
-                if self.cipher:
-                    data = self.cipher.encrypt(data)
-                with open(metadata_file, 'wb') as f:
-                    f.write(data)
-                
-                logger.info("💾 Memories saved to disk")
+            with self._journal_lock:
+                written = self._flush_journal()
+                compact = (
+                    self._journal_records >= self.journal_compact_threshold
+                    and not self._compaction_running()
+                )
+                if compact:
+                    self._compaction_thread = threading.Thread(target=self._compact_in_background, daemon=True)
+                    self._compaction_thread.start()
+            
+            if written:
+                logger.info(f"💾 Journaled {written} memory changes")
         except Exception as e:
             logger.error(f"⚠️ Error saving memories: {e}")
             raise
     
+    def _flush_journal(self) -> int:
+        """
+        Append pending changes to the journal (caller holds the journal lock)
+        
+        Only collecting the records needs the write lock; encryption and the
+        file write happen after it is released.
+        """
+        with self._lock.write():
+            self._apply_access_buffer()
+            records = self._journal_pending
+            for memory_id in self._dirty_access:
+                records.append({
+                    "op": "access",
+                    "id": memory_id,
+                    "count": self.memory_access_count.get(memory_id, 0),
+                    "last_access": self.memory_last_access.get(memory_id)
+                })
+            self._journal_pending = []
+            self._dirty_access = set()
+        if not records:
+            return 0
+        
+        lines = []
+        for record in records:
+            data = json.dumps(record, separators=(",", ":")).encode()
+            if self.cipher:
+                data = self.cipher.encrypt(data)
+            lines.append(data + b"\n")
+        
+        with open(self.journal_file, 'ab') as f:
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._journal_records += len(records)
+        return len(records)
+    
+    def _compaction_running(self) -> bool:
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+    
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"⚠️ Background memory compaction failed: {e}")
+    
+    def compact(self):
+        """
+        Fold the journal into the snapshot files
+        
+        State is copied under the read lock; serialization, encryption and
+        writing happen outside it. Journal records appended meanwhile are kept,
+        and anything they repeat from the snapshot is ignored on replay.
+        
+        Cold memories are archived afterwards, so the aging policy runs
+        whenever the journal threshold triggers a background compaction.
+        """
+        with self._compact_lock:
+            self._compact()
+        self.archive_cold_memories()
+    
+    def _compact(self):
+        with self._journal_lock:
+            self._flush_journal()
+            journal_offset = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+        
+        with self._lock.read():
+            episodic = self.episodic_memory[:]
+            semantic = {category: ids[:] for category, ids in self._semantic_ids.items()}
+            metadata = {
+                "importance": dict(self.memory_importance),
+                "access_count": dict(self.memory_access_count),
+                "last_access": dict(self.memory_last_access)
+            }
+            # Working memory is never persisted, so neither are its postings
+            working_ids = {memory["id"] for memory in self.working_memory}
+            index_data = {}
+            for term, ids in self.memory_index.items():
+                persisted = [memory_id for memory_id in ids if memory_id not in working_ids]
+                if persisted:
+                    index_data[term] = persisted
+        
+        self._write_snapshot_file("episodic_memory.json", episodic)
+        # Categories are saved as ID lists; the memories live in the episodic file
+        self._write_snapshot_file("semantic_memory.json", semantic)
+        self._write_snapshot_file("memory_metadata.json", metadata)
+        self._write_snapshot_file("memory_index.json", index_data)
+        
+        with self._journal_lock:
+            tail = b""
+            if self.journal_file.exists():
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(journal_offset)
+                    tail = f.read()
+            temp_file = self.journal_file.with_suffix(".tmp")
+            with open(temp_file, 'wb') as f:
+                f.write(tail)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.journal_file)
+            self._journal_records = tail.count(b"\n")
+        
+        logger.info(f"🗜️ Compacted memories into snapshot ({len(episodic)} experiences)")
+    
+    def _write_snapshot_file(self, name: str, payload: Any):
+        """Encrypt and atomically replace one snapshot file"""
+        path = self.memory_dir / name
+        if self.chunked and self.snapshot_format == "json":
+            self.chunked.write_json(path, payload)
+            return
+        data = encode_snapshot(payload, self.snapshot_format)
+        if self.chunked:
+            with self.chunked.open(path, "wb") as f:
+                f.write(data)
+            return
+        temp_file = path.with_suffix(".tmp")
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    
+    def _read_snapshot_file(self, name: str, label: str) -> Any:
+        """Decrypt and parse one snapshot file, or return None if it does not exist"""
+        path = self.memory_dir / name
+        if not path.exists():
+            return None
+        try:
+            if is_chunked_file(path):
+                with self.chunked.open(path, "rb") as f:
+                    return decode_snapshot(f.read())
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Snapshots written before chunked encryption are one Fernet token
+            if self.cipher:
+                data = self.cipher.decrypt(data)
+            return decode_snapshot(data)
+        except Exception as e:
+            logger.error(f"Decryption failed for {label}: {e}")
+            raise
+    
     def load_memories(self):
         """Load memories from disk with decryption"""
         try:
-            with self._lock:
-                episodic_file = self.memory_dir / "episodic_memory.json"
-                if episodic_file.exists():
-                    with open(episodic_file, 'rb') as f:
-                        data = f.read()
-                        if self.cipher:
-                            try:
-                                data = self.cipher.decrypt(data)
-                            except Exception as e:
-                                logger.error(f"Decryption failed for episodic memory: {e}")
-                                raise
-                        self.episodic_memory = json.loads(data.decode())
+            with self._journal_lock, self._lock.write():
+                self._generation += 1
+                episodic = self._read_snapshot_file("episodic_memory.json", "episodic memory")
+                if episodic is not None:
+                    for memory in episodic:
+                        ensure_epoch(memory)
+                    self.memories = {memory["id"]: memory for memory in episodic}
+                    self._episodic_ids = [memory["id"] for memory in episodic]
+                
+                semantic = self._read_snapshot_file("semantic_memory.json", "semantic memory")
+                if semantic is not None:
+                    self._semantic_ids = {category: [] for category in MEMORY_CATEGORIES}
+                    for category, entries in semantic.items():
+                        memory_ids = self._semantic_ids.setdefault(category, [])
+                        for entry in entries:
+                            # Older files stored a full copy of each memory here
+                            if isinstance(entry, dict):
+                                ensure_epoch(entry)
+                                self.memories.setdefault(entry["id"], entry)
+                                entry = entry["id"]
+                            if entry in self.memories:
+                                memory_ids.append(entry)
+                
+                # Snapshot files are replaced one at a time, so after a crash
+                # part way the category lists can predate the episodic file
+                categorized = set()
+                for memory_ids in self._semantic_ids.values():
+                    categorized.update(memory_ids)
+                for memory_id in self._episodic_ids:
+                    if memory_id not in categorized:
+                        category = self.memories[memory_id].get("category", "context")
+                        self._semantic_ids.get(category, self._semantic_ids["context"]).append(memory_id)
+                        categorized.add(memory_id)
                 
-                semantic_file = self.memory_dir / "semantic_memory.json"
-                if semantic_file.exists():
-                    with open(semantic_file, 'rb') as f:
-                        data = f.read()
-                        if self.cipher:
-                            try:
-                                data = self.cipher.decrypt(data)
-                            except Exception as e:
-                                logger.error(f"Decryption failed for semantic memory: {e}")
-                                raise
-                        self.semantic_memory = json.loads(data.decode())
+                metadata = self._read_snapshot_file("memory_metadata.json", "metadata")
+                if metadata is not None:
+                    self.memory_importance = metadata.get("importance", {})
+                    self.memory_access_count = defaultdict(int, metadata.get("access_count", {}))
+                    self.memory_last_access = metadata.get("last_access", {})
                 
-                metadata_file = self.memory_dir / "memory_metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'rb') as f:
-                        data = f.read()
-                        if self.cipher:
-                            try:
-                                data = self.cipher.decrypt(data)
-                            except Exception as e:
-                                logger.error(f"Decryption failed for metadata: {e}")
-                                raise
-                        metadata = json.loads(data.decode())
-                        self.memory_importance = metadata.get("importance", {})
-                        self.memory_access_count = defaultdict(int, metadata.get("access_count", {}))
-                        self.memory_last_access = metadata.get("last_access", {})
+                self._load_index()
+                self._replay_journal()
+                # A crash between writing a segment and journaling the move
+                # leaves memories in both tiers; finish the move
+                self._remove_memories([memory_id for memory_id in self.memories if memory_id in self.archive])
                 
                 logger.info("📂 Memories loaded from disk")
         except Exception as e:
             logger.error(f"⚠️ Error loading memories: {e}")
             raise
     
+    def _load_index(self):
+        """Load the persisted retrieval index, rebuilding it if missing or unreadable (caller holds the write lock)"""
+        for memory in self.working_memory:
+            self.memories[memory["id"]] = memory
+        
+        if (self.memory_dir / "memory_index.json").exists():
+            try:
+                index_data = self._read_snapshot_file("memory_index.json", "memory index")
+                # Postings for memories that are not loaded (e.g. working memory
+                # saved by older versions) are dropped; unindexed ones are added
+                self.memory_index = defaultdict(set)
+                indexed_ids = set()
+                for term, ids in index_data.items():
+                    known = self.memories.keys() & set(ids)
+                    if known:
+                        self.memory_index[term] = known
+                        indexed_ids.update(known)
+                for memory_id in self.memories.keys() - indexed_ids:
+                    self._index_memory(self.memories[memory_id])
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load memory index, rebuilding: {e}")
+        
+        self._rebuild_index()
+    
+    def _replay_journal(self):
+        """Apply journal records written since the last compaction (caller holds both locks)"""
+        self._journal_records = 0
+        if not self.journal_file.exists():
+            return
+        
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = self.cipher.decrypt(line) if self.cipher else line
+                    record = json.loads(data.decode())
+                except Exception as e:
+                    # A torn final write is expected after a crash
+                    logger.warning(f"Skipping unreadable journal record: {e}")
+                    continue
+                self._apply_journal_record(record)
+                self._journal_records += 1
+    
+    def _apply_journal_record(self, record: Dict):
+        """Apply one journal record; replaying a record twice is harmless"""
+        op = record.get("op")
+        if op == "memory":
+            memory = record["memory"]
+            if memory["id"] not in self.memories:
+                self._file_memory(memory, record.get("last_access") or memory["timestamp"])
+        elif op == "access":
+            self.memory_access_count[record["id"]] = record["count"]
+            if record.get("last_access"):
+                self.memory_last_access[record["id"]] = record["last_access"]
+        elif op == "archive":
+            self._remove_memories(record["ids"])
+        elif op == "clear":
+            self._reset_stores()
+    
+    def archive_cold_memories(self, now: Optional[float] = None) -> int:
+        """
+        Move aged, low-importance, rarely accessed long-term memories to the cold archive
+        
+        Returns:
+            Number of memories archived
+        """
+        now = now if now is not None else time.time()
+        cutoff = now - self.archive_after_days * 86400
+        
+        with self._lock.read():
+            working_ids = {memory["id"] for memory in self.working_memory}
+            cold = {}
+            for memory_id in self._episodic_ids:
+                if memory_id in working_ids or memory_id in cold:
+                    continue
+                memory = self.memories[memory_id]
+                if (memory["timestamp_epoch"] < cutoff
+                        and self.memory_importance.get(memory_id, memory["importance"]) < self.archive_importance_threshold
+                        and self.memory_access_count.get(memory_id, 0) <= self.archive_max_access):
+                    cold[memory_id] = dict(
+                        memory,
+                        access_count=self.memory_access_count.get(memory_id, 0),
+                        last_access=self.memory_last_access.get(memory_id, memory["last_access"])
+                    )
+        if not cold:
+            return 0
+        
+        # Segment I/O happens outside the lock; until the move below, a
+        # memory in both tiers is served from the hot one
+        self.archive.append(list(cold.values()))
+        with self._lock.write():
+            self._remove_memories(cold)
+            self._journal_pending.append({"op": "archive", "ids": list(cold)})
+        self.save_memories()
+        
+        logger.info(f"🧊 Archived {len(cold)} cold memories")
+        return len(cold)
+    
+    def _remove_memories(self, memory_ids):
+        """Drop memories from the long-term stores and index (caller holds the write lock)"""
+        memory_ids = set(memory_ids) & self.memories.keys()
+        if not memory_ids:
+            return
+        for memory_id in memory_ids:
+            self._unindex_memory(memory_id)
+            del self.memories[memory_id]
+            self.memory_importance.pop(memory_id, None)
+            self.memory_access_count.pop(memory_id, None)
+            self.memory_last_access.pop(memory_id, None)
+            self._dirty_access.discard(memory_id)
+        self._episodic_ids[:] = [memory_id for memory_id in self._episodic_ids if memory_id not in memory_ids]
+        for category_ids in self._semantic_ids.values():
+            category_ids[:] = [memory_id for memory_id in category_ids if memory_id not in memory_ids]
+        self._generation += 1
+    
     def get_stats(self) -> Dict:
         """Get memory system statistics"""
-        with self._lock:
+        with self._lock.read():
             return {
                 "working_memory_count": len(self.working_memory),
-                "episodic_memory_count": len(self.episodic_memory),
-                "semantic_memory_count": sum(len(v) for v in self.semantic_memory.values()),
-                "total_memories": len(self.working_memory) + len(self.episodic_memory),
-                "categories": {k: len(v) for k, v in self.semantic_memory.items()},
+                "episodic_memory_count": len(self._episodic_ids),
+                "semantic_memory_count": sum(len(v) for v in self._semantic_ids.values()),
+                "total_memories": len(self.memories),
+                "categories": {k: len(v) for k, v in self._semantic_ids.items()},
+                "indexed_terms": len(self.memory_index),
+                "journal_records": self._journal_records + len(self._journal_pending),
+                "pending_access_updates": len(self._access_buffer),
+                "retrieval_cache_entries": len(self.retrieval_cache),
+                "retrieval_cache_hits": self.retrieval_cache.hits,
+                "retrieval_cache_misses": self.retrieval_cache.misses,
+                "archived_memories": len(self.archive),
+                "archive_segments": self.archive.segment_count,
                 "last_consolidation": datetime.fromtimestamp(self.last_consolidation).isoformat()
             }
     
@@ -453,14 +1186,29 @@ class MemoryMesh:
             logger.warning("⚠️ Must confirm to clear all memories")
             return
         
-        with self._lock:
+        with self._lock.write():
             self.working_memory.clear()
-            self.episodic_memory.clear()
-            self.semantic_memory = {k: [] for k in self.semantic_memory}
-            self.memory_importance.clear()
-            self.memory_access_count.clear()
-            self.memory_last_access.clear()
+            self._reset_stores()
+            # Earlier journal records are superseded; the next save persists the clear
+            self._journal_pending = [{"op": "clear"}]
+            self._dirty_access = set()
+            self._access_buffer.clear()
+            # Archive segments are deleted right away rather than journaled
+            self.archive.clear()
             logger.info("🗑️ All memories cleared")
+    
+    def _reset_stores(self):
+        """Empty the long-term stores and their bookkeeping (caller holds the write lock)"""
+        self.memories = {memory["id"]: memory for memory in self.working_memory}
+        self._episodic_ids = []
+        self._semantic_ids = {category: [] for category in MEMORY_CATEGORIES}
+        self.memory_importance = {memory["id"]: memory["importance"] for memory in self.working_memory}
+        self.memory_access_count = defaultdict(int)
+        self.memory_last_access = {}
+        self.memory_index = defaultdict(set)
+        self._generation += 1
+        for memory in self.working_memory:
+            self._index_memory(memory)
 
     def _generate_memory_id(self, content: str) -> str:
         """Generate unique ID for memory"""
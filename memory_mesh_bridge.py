@@ -4,7 +4,9 @@ Allows seamless integration of MemoryMesh with existing Derek code
 """
 
 from memory_mesh import MemoryMesh
+from utils.write_behind import WriteBehindPersister
 from typing import Any, Dict, List, Optional
+import atexit
 import logging
 
 # Configure logging
@@ -18,23 +20,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
 class MemoryMeshBridge:
     """
     Bridge adapter to make MemoryMesh compatible with existing Derek code
     Provides the same interface as old MemoryManager but with MemoryMesh power
     """
     
-    def __init__(self, memory_dir: str = "./derek_memory", encryption_key: Optional[bytes] = None):
+    def __init__(self, memory_dir: str = "./derek_memory", encryption_key: Optional[bytes] = None,
+                 flush_delay: float = 5.0, flush_every: int = 10):
         """
         Initialize MemoryMesh with bridge interface
         
         Args:
             memory_dir: Directory for memory files
             encryption_key: Optional Fernet key for encryption
+            flush_delay: Max seconds a change marked with mark_dirty() waits before saving
+            flush_every: Save after this many mark_dirty() calls even if flush_delay has not passed
         """
         try:
             self.mesh = MemoryMesh(memory_dir=memory_dir, encryption_key=encryption_key)
             self.memory_file = self.mesh.memory_dir / "persistent_memory.json"
+            self.persister = WriteBehindPersister(self.save, max_delay=flush_delay, max_pending=flush_every,
+                                                  name="memory-write-behind")
+            atexit.register(self.close)
             logger.info("🧠 Memory Mesh Bridge initialized")
         except Exception as e:
             logger.error(f"Failed to initialize MemoryMesh: {e}")
@@ -65,6 +74,18 @@ class MemoryMeshBridge:
             logger.error(f"Failed to save memories: {e}")
             raise
     
+    def mark_dirty(self):
+        """Schedule a save on the write-behind thread instead of saving inline"""
+        if not hasattr(self, 'persister') or self.persister is None:
+            self.save()
+            return
+        self.persister.mark_dirty()
+    
+    def close(self):
+        """Flush pending changes and stop the write-behind thread"""
+        if getattr(self, 'persister', None) is not None:
+            self.persister.stop()
+    
     def store(self, key: str, value: Any):
         """
         Store a memory - intelligently categorizes and manages
@@ -5,11 +5,13 @@ This module provides integration between AlphaVox and knowledge sources,
 including both internal knowledge bases and external APIs.
 """
 
+import heapq
 import json
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +23,94 @@ logger = logging.getLogger(__name__)
 _knowledge_integration = None
 
 
+class FactIndex:
+    """Topic partitions and a keyword posting index over a list of facts.
+
+    Facts are indexed by their whitespace-separated lowercase words. A query
+    term matches a fact when it is a substring of the fact text, exactly as
+    the old linear scan did; since query terms contain no whitespace, that is
+    the same as being a substring of one of the fact's words, so each term is
+    expanded against the vocabulary once and cached.
+    """
+
+    def __init__(self, facts: Optional[List[Dict[str, Any]]] = None, max_cached_terms: int = 1024):
+        self.facts = facts if facts is not None else []
+        self.by_topic: Dict[Any, Set[int]] = defaultdict(set)
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.max_cached_terms = max_cached_terms
+        self._expansions: Dict[str, Set[str]] = {}
+        for fact_id, fact in enumerate(self.facts):
+            self._index(fact_id, fact)
+
+    def _index(self, fact_id: int, fact: Dict[str, Any]):
+        topic = fact.get("topic")
+        if topic is not None and not isinstance(topic, (list, dict)):
+            self.by_topic[topic].add(fact_id)
+        for word in set((fact.get("text") or "").lower().split()):
+            if word not in self.postings:
+                for term, words in self._expansions.items():
+                    if term in word:
+                        words.add(word)
+            self.postings[word].add(fact_id)
+
+    def add(self, fact: Dict[str, Any]) -> int:
+        """Append a fact and index it; returns its position"""
+        self.facts.append(fact)
+        fact_id = len(self.facts) - 1
+        self._index(fact_id, fact)
+        return fact_id
+
+    def _matching(self, term: str) -> Set[int]:
+        """IDs of facts whose text contains term"""
+        words = self._expansions.get(term)
+        if words is None:
+            if len(self._expansions) >= self.max_cached_terms:
+                self._expansions.clear()
+            words = self._expansions[term] = {w for w in self.postings if term in w}
+        if len(words) == 1:
+            return self.postings[next(iter(words))]
+        matches = set()
+        for word in words:
+            matches |= self.postings[word]
+        return matches
+
+    def search(self, query: str, topic: Optional[str] = None, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Score only the facts that share a term with the query
+
+        Relevance is the fraction of query terms found in the fact text.
+        """
+        query_terms = query.lower().split()
+        if not query_terms:
+            return []
+        allowed = None
+        if topic:
+            allowed = self.by_topic.get(topic)
+            if not allowed:
+                return []
+
+        scores = Counter()
+        for term in query_terms:
+            matches = self._matching(term)
+            if allowed is not None:
+                matches = matches & allowed
+            scores.update(matches)
+
+        # Ties keep fact order, as the stable sort over a full scan did
+        best = heapq.nlargest(max_results, scores.items(), key=lambda item: (item[1], -item[0]))
+        results = []
+        for fact_id, score in best:
+            fact = self.facts[fact_id]
+            results.append(
+                {
+                    "text": fact.get("text"),
+                    "topic": fact.get("topic"),
+                    "source": fact.get("source"),
+                    "relevance": score / len(query_terms),
+                }
+            )
+        return results
+
+
 class KnowledgeIntegration:
     """Handles integration between AlphaVox and knowledge sources.
 
@@ -74,6 +164,7 @@ class KnowledgeIntegration:
                 logger.info(f"Loaded {len(self.facts)} facts from knowledge base")
             except Exception as e:
                 logger.error(f"Error loading facts: {e}")
+        self.fact_index = FactIndex(self.facts)
 
         # Load topics
         self.topics = []
@@ -119,32 +210,8 @@ class KnowledgeIntegration:
             except Exception as e:
                 logger.error(f"Error querying knowledge engine: {e}")
 
-        # Fall back to basic search
-        results = []
-
-        # Filter by topic if provided
-        filtered_facts = self.facts
-        if topic:
-            filtered_facts = [f for f in self.facts if f.get("topic") == topic]
-
-        # Simple keyword matching (very basic)
-        query_terms = query.lower().split()
-        for fact in filtered_facts:
-            text = fact.get("text", "").lower()
-            score = sum(1 for term in query_terms if term in text)
-            if score > 0:
-                results.append(
-                    {
-                        "text": fact.get("text"),
-                        "topic": fact.get("topic"),
-                        "source": fact.get("source"),
-                        "relevance": score / len(query_terms),
-                    }
-                )
-
-        # Sort by relevance and limit results
-        results.sort(key=lambda x: x["relevance"], reverse=True)
-        results = results[:max_results]
+        # Fall back to the local fact index
+        results = self.fact_index.search(query, topic, max_results)
 
         return {
             "query": query,
@@ -154,6 +221,17 @@ class KnowledgeIntegration:
             "engine": "basic",
         }
 
+    def add_fact(self, fact: Dict[str, Any]) -> int:
+        """Add a fact to the in-memory knowledge base and its index.
+
+        Args:
+            fact: Fact dict with "text" and optionally "topic" and "source"
+
+        Returns:
+            Position of the fact in self.facts
+        """
+        return self.fact_index.add(fact)
+
     def get_topics(self) -> List[Dict[str, Any]]:
         """Get available topics in the knowledge base.
 
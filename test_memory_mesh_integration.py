@@ -82,6 +82,8 @@ def test_memory_mesh_core():
     
     # Verify files exist
     memory_dir = Path("./test_derek_memory")
+    assert (memory_dir / "memory_journal.log").exists(), "Memory journal should exist"
+    memory.compact()
     assert (memory_dir / "episodic_memory.json").exists(), "Episodic memory file should exist"
     assert (memory_dir / "semantic_memory.json").exists(), "Semantic memory file should exist"
     assert (memory_dir / "memory_metadata.json").exists(), "Metadata file should exist"
@@ -139,7 +141,7 @@ def test_memory_mesh_bridge():
     print("\n4️⃣  Testing old save interface...")
     bridge.save()
     memory_dir = Path("./test_derek_memory_bridge")
-    assert (memory_dir / "episodic_memory.json").exists(), "Should save episodic memory"
+    assert (memory_dir / "memory_journal.log").exists(), "Should journal memories"
     print("   ✅ Save works")
     
     # Test 5: Load with old interface
@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from advanced_learning import AdvancedLearningSystem
+
+
+class TestAdvancedLearningSystem(unittest.TestCase):
+    """Test suite for AdvancedLearningSystem knowledge updates"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="test_advanced_learning_")
+        self.system = AdvancedLearningSystem()
+        self.system.knowledge_dir = self.test_dir
+        self.source = self.system.external_knowledge_sources["communication_research"]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_repeated_updates_are_suppressed(self):
+        """Test that entries already seen from a source are not stored again"""
+        first = self.system.process_knowledge_update("communication_research", self.source, 1.0)
+        second = self.system.process_knowledge_update("communication_research", self.source, 2.0)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(second, [])
+        self.assertEqual(self.system.duplicates_suppressed, 2)
+        self.assertEqual(len(self.system.advancement_opportunities), 2)
+
+    def test_new_entries_are_saved(self):
+        """Test that unseen entries are still written to disk"""
+        self.system.process_knowledge_update("assistive_technology",
+                                             self.system.external_knowledge_sources["assistive_technology"],
+                                             1.0)
+
+        category_dir = os.path.join(self.test_dir, "assistive_technology")
+        self.assertTrue(os.path.exists(os.path.join(category_dir, "latest.json")))
+        self.assertEqual(self.system.duplicates_suppressed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
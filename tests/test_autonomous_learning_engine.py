@@ -161,6 +161,37 @@ class TestAutonomousLearningEngine(unittest.TestCase):
         self.assertEqual(loaded_knowledge["domain"], "test_domain")
         self.assertEqual(loaded_knowledge["content"], "test content")
     
+    def test_store_knowledge_suppresses_duplicate_content(self):
+        """Test that content repeated under another topic is stored once"""
+        self.engine.derek = MagicMock()
+        content = ("Sensory processing differences affect how autistic people "
+                   "experience sound, light and touch in everyday settings")
+        first = {"domain": "autism", "subtopic": "sensory_processing",
+                 "content": content, "key_concepts": ["sensory"], "mastery": 0.5}
+        second = dict(first, subtopic="sensory_integration", content=content + ".")
+
+        self.engine._store_knowledge(first, first)
+        self.engine._store_knowledge(second, second)
+
+        entry = self.engine.knowledge_base["autism.sensory_integration"]
+        self.assertEqual(entry["duplicate_of"], "autism.sensory_processing")
+        self.assertNotIn("content", entry)
+        self.assertEqual(self.engine.get_learning_status()["duplicates_suppressed"], 1)
+        self.assertEqual(self.engine.derek.memory.store.call_count, 1)
+
+    def test_relearning_same_topic_is_not_a_duplicate(self):
+        """Test that updating a topic with similar content replaces it"""
+        self.engine.derek = MagicMock()
+        knowledge = {"domain": "autism", "subtopic": "sensory_processing",
+                     "content": "Weighted blankets can help some children settle at night",
+                     "mastery": 0.5}
+
+        self.engine._store_knowledge(knowledge, knowledge)
+        self.engine._store_knowledge(knowledge, dict(knowledge, mastery=0.8))
+
+        self.assertEqual(self.engine.knowledge_base["autism.sensory_processing"]["mastery"], 0.8)
+        self.assertEqual(self.engine.content_index.suppressed, 0)
+
     def test_extract_key_concepts(self):
         """Test extracting key concepts from content"""
         content = """
@@ -0,0 +1,96 @@
+import unittest
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import Database
+
+
+class TestDatabase(unittest.TestCase):
+    """Test suite for Database"""
+
+    def setUp(self):
+        """Create a database in a temporary directory"""
+        self.test_dir = tempfile.mkdtemp(prefix="test_database_")
+        self.db = Database(db_path=str(Path(self.test_dir) / "derek.db"))
+        self.db.create_tables()
+
+    def tearDown(self):
+        """Close connections and remove the database"""
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_wal_journal_mode(self):
+        """Test that the database runs in WAL mode"""
+        mode = self.db.fetch_one("PRAGMA journal_mode")
+        self.assertEqual(list(mode.values())[0].lower(), "wal")
+
+    def test_indexes_created(self):
+        """Test that lookup indexes exist"""
+        names = {
+            row["name"] for row in self.db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        self.assertIn("idx_memories_timestamp", names)
+        self.assertIn("idx_memories_type", names)
+
+    def test_batched_store_and_search(self):
+        """Test batched inserts are searchable through FTS"""
+        count = self.db.store_memories([
+            {"content": "Everett built AlphaVox", "type": "relationships"},
+            {"content": "Derek enjoys lighthouse stories", "type": "preferences"},
+            {"content": "AlphaVox helps nonverbal people", "type": "learning"},
+        ])
+
+        self.assertEqual(count, 3)
+        self.assertTrue(self.db.fts_enabled)
+        results = self.db.search_memories("alphavox?")
+        self.assertEqual(len(results), 2)
+        typed = self.db.search_memories("AlphaVox", memory_type="learning")
+        self.assertEqual([r["content"] for r in typed], ["AlphaVox helps nonverbal people"])
+
+    def test_search_interactions(self):
+        """Test interaction search covers input and response"""
+        self.db.store_interactions([
+            {"user_id": "everett", "input": "How are you?", "response": "Feeling curious today"},
+            {"user_id": "guest", "input": "Tell me about tides", "response": "Tides follow the moon"},
+        ])
+        self.db.store_interaction("everett", "What about tides?", "Still the moon")
+
+        results = self.db.search_interactions("tides", user_id="everett")
+
+        self.assertEqual([r["input"] for r in results], ["What about tides?"])
+
+    def test_existing_rows_indexed_on_upgrade(self):
+        """Test that rows written before FTS existed become searchable"""
+        for trigger in ("insert", "delete", "update"):
+            self.db.execute(f"DROP TRIGGER memories_fts_{trigger}")
+        self.db.execute("DROP TABLE memories_fts")
+        self.db.execute("INSERT INTO memories (content, type) VALUES ('Old garden note', 'events')")
+
+        self.db.create_tables()
+
+        self.assertEqual(len(self.db.search_memories("garden")), 1)
+
+    def test_per_thread_connections(self):
+        """Test that each thread uses its own connection"""
+        connections = []
+
+        def worker():
+            connections.append(self.db.connection)
+            self.db.store_memory("Written from a worker thread")
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(connections[0], self.db.connection)
+        self.assertEqual(len(self.db.search_memories("worker")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.dedup import NearDuplicateIndex, minhash
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test suite for MinHash LSH duplicate detection"""
+
+    TEXT = ("Speech recognition systems convert spoken language into text using "
+            "acoustic and language models trained on large corpora")
+
+    def test_signature_is_stable(self):
+        """Test that signatures depend only on the words of the text"""
+        self.assertEqual(minhash(self.TEXT), minhash(self.TEXT.upper() + "!"))
+        self.assertEqual(len(minhash(self.TEXT)), 64)
+        self.assertEqual(minhash("  ...  "), ())
+
+    def test_near_duplicate_is_suppressed(self):
+        """Test that a one-word edit is caught and counted"""
+        index = NearDuplicateIndex()
+        self.assertIsNone(index.add("a", self.TEXT))
+
+        duplicate_of = index.add("b", self.TEXT.replace("large", "huge"))
+
+        self.assertEqual(duplicate_of, "a")
+        self.assertEqual(index.suppressed, 1)
+        self.assertEqual(len(index), 1)
+
+    def test_unrelated_text_is_kept(self):
+        """Test that different texts are both indexed"""
+        index = NearDuplicateIndex()
+        index.add("a", self.TEXT)
+
+        self.assertIsNone(index.add("b", "Family meals give children a sense of routine and belonging"))
+        self.assertEqual(len(index), 2)
+
+    def test_same_key_replaces_signature(self):
+        """Test that re-adding a key updates it and remove forgets it"""
+        index = NearDuplicateIndex()
+        index.add("a", self.TEXT)
+
+        self.assertIsNone(index.add("a", self.TEXT))
+        index.remove("a")
+
+        self.assertIsNone(index.find(self.TEXT))
+        self.assertEqual(index.suppressed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
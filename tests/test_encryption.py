@@ -0,0 +1,180 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.fernet import Fernet
+
+from utils import encryption
+from utils.encryption import ChunkedCipher, Encryptor, is_chunked_file
+
+
+class TestChunkedCipher(unittest.TestCase):
+    """Test suite for the chunked encrypted file format"""
+
+    def setUp(self):
+        """Create a cipher with small chunks and a scratch directory"""
+        self.test_dir = tempfile.mkdtemp(prefix="test_encryption_")
+        self.cipher = ChunkedCipher(Fernet.generate_key(), chunk_size=16)
+        self.path = os.path.join(self.test_dir, "data.enc")
+
+    def tearDown(self):
+        """Clean up scratch files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, data):
+        with self.cipher.open(self.path, "wb") as f:
+            f.write(data)
+
+    def _read(self):
+        with self.cipher.open(self.path, "rb") as f:
+            return f.read()
+
+    def test_round_trip(self):
+        """Test that data of every length around chunk boundaries round-trips"""
+        for length in (0, 1, 15, 16, 17, 32, 100):
+            data = os.urandom(length)
+            self._write(data)
+            self.assertEqual(self._read(), data)
+
+    def test_ciphertext_overhead_is_per_chunk(self):
+        """Test that the file holds raw ciphertext rather than base64"""
+        data = os.urandom(160)
+        self._write(data)
+
+        expected = ChunkedCipher.HEADER.size + 160 + 10 * ChunkedCipher.TAG_SIZE
+        self.assertEqual(os.path.getsize(self.path), expected)
+        self.assertTrue(is_chunked_file(self.path))
+
+    def test_random_access_chunk(self):
+        """Test that a single chunk decrypts without reading the rest"""
+        data = bytes(range(50))
+        self._write(data)
+
+        with self.cipher.open(self.path, "rb") as f:
+            self.assertEqual(f.chunk_count, 4)
+            self.assertEqual(f.read_chunk(2), data[32:48])
+            self.assertEqual(f.read_chunk(3), data[48:])
+            with self.assertRaises(IndexError):
+                f.read_chunk(4)
+
+    def test_truncation_detected(self):
+        """Test that dropping trailing chunks fails authentication"""
+        self._write(os.urandom(64))
+        size = os.path.getsize(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(size - (16 + ChunkedCipher.TAG_SIZE))
+
+        with self.assertRaises(Exception):
+            self._read()
+
+    def test_tampering_detected(self):
+        """Test that a flipped ciphertext byte fails authentication"""
+        self._write(os.urandom(40))
+        with open(self.path, 'r+b') as f:
+            f.seek(ChunkedCipher.HEADER.size + 3)
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 1]))
+
+        with self.assertRaises(Exception):
+            self._read()
+
+    def test_wrong_key_rejected(self):
+        """Test that another key cannot decrypt the file"""
+        self._write(b"private memories")
+        other = ChunkedCipher(Fernet.generate_key(), chunk_size=16)
+
+        with self.assertRaises(Exception):
+            with other.open(self.path, "rb") as f:
+                f.read()
+
+    def test_failed_write_keeps_previous_file(self):
+        """Test that an exception while writing leaves the old file in place"""
+        self._write(b"original")
+
+        with self.assertRaises(RuntimeError):
+            with self.cipher.open(self.path, "wb") as f:
+                f.write(b"replacement")
+                raise RuntimeError("interrupted")
+
+        self.assertEqual(self._read(), b"original")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_stream_round_trip(self):
+        """Test encrypting and decrypting between open streams"""
+        data = os.urandom(1000)
+        encrypted = io.BytesIO()
+        self.cipher.encrypt_stream(io.BytesIO(data), encrypted)
+        encrypted.seek(0)
+        decrypted = io.BytesIO()
+
+        self.cipher.decrypt_stream(encrypted, decrypted)
+
+        self.assertEqual(decrypted.getvalue(), data)
+
+    def test_json_round_trip(self):
+        """Test that JSON payloads stream into and out of encrypted files"""
+        payload = {"memories": [{"id": str(i), "content": "é" * i} for i in range(20)]}
+
+        self.cipher.write_json(self.path, payload)
+
+        self.assertEqual(self.cipher.read_json(self.path), payload)
+
+    def test_failed_json_write_keeps_previous_file(self):
+        """Test that a payload failing to serialize does not replace the file"""
+        self.cipher.write_json(self.path, {"good": True})
+        payload = {"padding": "x" * (self.cipher.chunk_size * 3), "bad": object()}
+
+        with self.assertRaises(TypeError):
+            self.cipher.write_json(self.path, payload)
+
+        self.assertEqual(self.cipher.read_json(self.path), {"good": True})
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+
+class TestEncryptFile(unittest.TestCase):
+    """Test suite for the module-level encrypted file helpers"""
+
+    def setUp(self):
+        """Use a fresh global encryptor with a known key"""
+        self.test_dir = tempfile.mkdtemp(prefix="test_encrypt_file_")
+        self.key = Fernet.generate_key()
+        with patch.dict(os.environ, {"ENCRYPTION_KEY": self.key.decode()}):
+            self.encryptor = Encryptor()
+        patcher = patch.object(encryption, "_encryptor", self.encryptor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up scratch files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_encrypt_file_writes_chunked_format(self):
+        """Test that encrypt_file output is chunked and decrypts back"""
+        path = os.path.join(self.test_dir, "analytics.enc")
+
+        encryption.encrypt_file(path, {"sessions": 3})
+
+        self.assertTrue(is_chunked_file(path))
+        self.assertEqual(encryption.decrypt_file(path), {"sessions": 3})
+
+    def test_decrypt_file_reads_legacy_fernet(self):
+        """Test that files from before the chunked format still load"""
+        path = os.path.join(self.test_dir, "legacy.enc")
+        with open(path, 'wb') as f:
+            f.write(Fernet(self.key).encrypt(json.dumps({"facts": 1}).encode()))
+
+        self.assertEqual(encryption.decrypt_file(path), {"facts": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,506 @@
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import knowledge_engine
+from knowledge_engine import (CrawlFrontier, FactManager, HTTPCache, KnowledgeGraph,
+                              PoliteFetcher, WebCrawler)
+
+
+class KnowledgeDirTestCase(unittest.TestCase):
+    """Points the knowledge engine's files at a temporary directory"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="test_knowledge_engine_")
+        self.facts_file = f"{self.test_dir}/facts.json"
+        self.status_file = f"{self.test_dir}/crawler_status.json"
+        self.graph_file = f"{self.test_dir}/knowledge_graph.json"
+        for name, value in (("KNOWLEDGE_DIR", self.test_dir),
+                            ("FACTS_FILE", self.facts_file),
+                            ("CRAWLER_STATUS_FILE", self.status_file),
+                            ("HTTP_CACHE_DIR", f"{self.test_dir}/http_cache")):
+            patcher = patch.object(knowledge_engine, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up knowledge files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read(self, path):
+        with open(path) as f:
+            return json.load(f)
+
+
+class TestKnowledgeGraph(KnowledgeDirTestCase):
+    """Test suite for the adjacency-indexed knowledge graph"""
+
+    def _graph(self, **kwargs):
+        graph = KnowledgeGraph(**kwargs)
+        for name in ("ai", "ml", "nlp", "speech", "music"):
+            graph.add_concept(name, name.upper(), {}, topics=["tech"])
+        graph.add_relationship("ai", "includes", "ml", strength=0.9)
+        graph.add_relationship("ml", "includes", "nlp")
+        graph.add_relationship("nlp", "includes", "speech")
+        graph.add_relationship("speech", "related_to", "music")
+        return graph
+
+    def test_neighbors_by_direction(self):
+        """Test that outgoing and incoming edges are both indexed"""
+        graph = self._graph()
+
+        outgoing = graph.neighbors("ml")
+        incoming = graph.neighbors("ml", direction="in")
+
+        self.assertEqual([n["concept"] for n in outgoing], ["nlp"])
+        self.assertEqual(incoming[0]["concept"], "ai")
+        self.assertEqual(incoming[0]["strength"], 0.9)
+        self.assertEqual(len(graph.neighbors("ml", direction="both")), 2)
+        self.assertEqual(graph.neighbors("missing"), [])
+
+    def test_related_concepts_respects_depth(self):
+        """Test that traversal stops at max_depth and reports hop counts"""
+        graph = self._graph()
+
+        self.assertEqual(graph.related_concepts("ai", max_depth=2), {"ml": 1, "nlp": 2})
+        self.assertEqual(
+            graph.related_concepts("ai", max_depth=5, relationship="includes"),
+            {"ml": 1, "nlp": 2, "speech": 3}
+        )
+        self.assertEqual(graph.related_concepts("music", max_depth=1, direction="in"),
+                         {"speech": 1})
+
+    def test_duplicate_relationship_updates_edge(self):
+        """Test that re-adding an edge updates it instead of duplicating it"""
+        graph = self._graph()
+
+        graph.add_relationship("ai", "includes", "ml", strength=0.4)
+
+        self.assertEqual(graph.edge_count, 4)
+        self.assertEqual(graph.neighbors("ai")[0]["strength"], 0.4)
+
+    def test_save_appends_to_log(self):
+        """Test that saves append deltas and reload through the log"""
+        graph = self._graph()
+        graph.save()
+        graph.add_relationship("ai", "related_to", "music")
+        graph.save()
+
+        self.assertFalse(Path(self.graph_file).exists())
+        with open(graph.log_file) as f:
+            self.assertEqual(json.loads(f.readlines()[-1])["to"], "music")
+
+        reloaded = KnowledgeGraph()
+        self.assertEqual(reloaded.edge_count, 5)
+        self.assertEqual(reloaded.topic_concepts["tech"], set(graph.concepts))
+        self.assertEqual(len(reloaded.neighbors("ai")), 2)
+
+    def test_compaction_folds_log_into_snapshot(self):
+        """Test that an oversized log is replaced by a snapshot"""
+        graph = self._graph(compact_after=5)
+        graph.save()
+
+        self.assertEqual(len(self._read(self.graph_file)["relationships"]), 4)
+        self.assertEqual(Path(graph.log_file).stat().st_size, 0)
+        self.assertEqual(KnowledgeGraph().edge_count, 4)
+
+    def test_failed_compaction_keeps_changes(self):
+        """Test that changes survive a snapshot write that fails"""
+        graph = self._graph(compact_after=5)
+        with patch.object(knowledge_engine, "write_snapshot", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                graph.save()
+
+        graph.save()
+
+        self.assertEqual(len(self._read(self.graph_file)["relationships"]), 4)
+        self.assertEqual(KnowledgeGraph().edge_count, 4)
+
+    def test_torn_log_line_is_skipped(self):
+        """Test that a partially written last record does not break loading"""
+        graph = self._graph()
+        graph.save()
+        with open(graph.log_file, "a") as f:
+            f.write('{"op": "edge", "from": "ai"')
+
+        self.assertEqual(KnowledgeGraph().edge_count, 4)
+
+
+class TestFactManager(KnowledgeDirTestCase):
+    """Test suite for write-behind fact storage"""
+
+    def test_add_fact_does_not_write_immediately(self):
+        """Test that facts are buffered until a threshold is reached"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(manager.close)
+
+        index = manager.add_fact("Water boils at 100 degrees", "test", ["science"])
+
+        self.assertEqual(index, 0)
+        self.assertFalse(Path(self.facts_file).exists())
+
+    def test_flush_writes_atomically(self):
+        """Test that a flush replaces facts.json without leaving temp files"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(manager.close)
+        for i in range(3):
+            manager.add_fact(f"Fact number {i}", "test", ["science"])
+
+        manager.flush()
+
+        self.assertEqual(len(self._read(self.facts_file)), 3)
+        self.assertEqual(list(Path(self.test_dir).glob("*.tmp")), [])
+
+    def test_close_persists_pending_facts(self):
+        """Test that pending facts survive a close and reload"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        manager.add_fact("The sky is blue", "test", ["science"], confidence=0.9)
+        manager.close()
+
+        reloaded = FactManager()
+        self.addCleanup(reloaded.close)
+
+        self.assertEqual(reloaded.facts[0]["text"], "The sky is blue")
+        self.assertEqual(reloaded.facts[0]["confidence"], 0.9)
+
+
+    def test_idle_manager_does_not_overwrite_facts(self):
+        """Test that closing an unchanged manager keeps facts saved by another"""
+        stale = FactManager(flush_delay=60, flush_every=50)
+        writer = FactManager(flush_delay=60, flush_every=50)
+        writer.add_fact("Octopuses have three hearts", "test", ["biology"])
+        writer.close()
+
+        stale.close()
+
+        self.assertEqual(len(self._read(self.facts_file)), 1)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves numbered pages with an ETag and honours If-None-Match"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            etag = f'"{self.path}-v{server.version}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = (f"<p>Page {self.path} version {server.version} has enough words.</p>"
+                    "<p>short</p>").encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPoliteFetcher(KnowledgeDirTestCase):
+    """Test suite for concurrent fetching against a local stand-in server"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.delay = 0.05
+        self.server.version = 1
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        port = self.server.server_address[1]
+        self.hosts = [f"http://127.0.0.1:{port}", f"http://localhost:{port}"]
+
+    def _fetcher(self, **kwargs):
+        return PoliteFetcher(HTTPCache(f"{self.test_dir}/http_cache"), host_delay=0, **kwargs)
+
+    def test_crawl_parses_pages(self):
+        """Test that every page is fetched once and parsed into paragraphs"""
+        urls = [f"{self.hosts[0]}/page{i}" for i in range(4)]
+
+        results = list(self._fetcher().crawl(urls + urls[:2]))
+
+        self.assertEqual(sorted(r["url"] for r in results), sorted(urls))
+        self.assertEqual(len(self.server.requests), 4)
+        for result in results:
+            self.assertEqual(result["status"], 200)
+            self.assertEqual(len(result["paragraphs"]), 1)
+
+    def test_per_host_limit(self):
+        """Test that one host never sees more than per_host requests at once"""
+        urls = [f"{host}/page{i}" for host in self.hosts for i in range(4)]
+
+        list(self._fetcher(max_workers=8, per_host=1).crawl(urls[:4]))
+        self.assertEqual(self.server.max_active, 1)
+
+        self.server.max_active = 0
+        list(self._fetcher(max_workers=8, per_host=1).crawl(urls))
+        self.assertEqual(self.server.max_active, 2)
+
+    def test_host_delay_spaces_requests(self):
+        """Test that requests to one host start host_delay apart"""
+        self.server.delay = 0
+        fetcher = PoliteFetcher(host_delay=0.1, per_host=4)
+
+        started = time.monotonic()
+        list(fetcher.crawl([f"{self.hosts[0]}/page{i}" for i in range(3)]))
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+    def test_unchanged_pages_cost_a_304(self):
+        """Test that a cached page is revalidated instead of downloaded"""
+        url = f"{self.hosts[0]}/page1"
+        self._fetcher().fetch(url)
+
+        # A new fetcher reads the validators back from disk
+        fetcher = self._fetcher()
+        with patch.object(knowledge_engine, "extract_paragraphs") as parse:
+            result = fetcher.fetch(url)
+        parse.assert_not_called()
+        self.assertEqual(result["status"], 304)
+        self.assertTrue(result["not_modified"])
+        self.assertEqual(len(result["paragraphs"]), 1)
+        self.assertEqual(fetcher.stats["not_modified"], 1)
+
+        self.server.version = 2
+        result = fetcher.fetch(url)
+        self.assertEqual(result["status"], 200)
+        self.assertIn("version 2", result["paragraphs"][0])
+
+    def test_errors_are_reported(self):
+        """Test that an unreachable URL yields an error result"""
+        fetcher = PoliteFetcher(host_delay=0, timeout=1)
+
+        result = fetcher.fetch("http://127.0.0.1:9/missing")
+
+        self.assertIsNotNone(result["error"])
+        self.assertEqual(fetcher.stats["errors"], 1)
+
+    def test_frontier_round_robins_hosts(self):
+        """Test that the frontier alternates hosts and skips busy ones"""
+        frontier = CrawlFrontier()
+        for url in ("http://a/1", "http://a/2", "http://b/1", "http://a/1"):
+            frontier.add(url)
+
+        self.assertEqual(len(frontier), 3)
+        self.assertEqual(frontier.pop(lambda host: False), "http://a/1")
+        self.assertEqual(frontier.pop(lambda host: False), "http://b/1")
+        self.assertIsNone(frontier.pop(lambda host: host == "a"))
+        self.assertEqual(frontier.pop(lambda host: False), "http://a/2")
+
+
+class TestFactDeduplication(KnowledgeDirTestCase):
+    """Test suite for near-duplicate suppression in FactManager"""
+
+    def test_near_duplicate_is_merged(self):
+        """Test that a reworded copy is merged into the original fact"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(manager.close)
+        text = "The hippocampus plays a central role in forming new long term memories in humans"
+
+        first = manager.add_fact(text, "site-a", ["memory"], confidence=0.7)
+        second = manager.add_fact(text.replace("humans", "people"), "site-b", ["brain"],
+                                  confidence=0.9)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(manager.facts), 1)
+        self.assertEqual(manager.duplicates_suppressed, 1)
+        self.assertEqual(manager.facts[0]["topics"], ["memory", "brain"])
+        self.assertEqual(manager.facts[0]["confidence"], 0.9)
+        self.assertEqual(manager.facts[0]["metadata"]["also_seen_in"], ["site-b"])
+
+    def test_distinct_facts_are_kept(self):
+        """Test that short facts differing in a key word stay separate"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(manager.close)
+
+        manager.add_fact("Water boils at 100 degrees at sea level", "a", ["science"])
+        manager.add_fact("Water boils at 70 degrees on Everest", "a", ["science"])
+
+        self.assertEqual(len(manager.facts), 2)
+        self.assertEqual(manager.duplicates_suppressed, 0)
+
+    def test_loaded_facts_are_indexed(self):
+        """Test that facts already on disk catch duplicates after a reload"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        manager.add_fact("Sleep consolidates what the brain learned during the day", "a", ["sleep"])
+        manager.close()
+
+        reloaded = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(reloaded.close)
+        reloaded.add_fact("Sleep consolidates what the brain learned during the day.", "b", ["sleep"])
+
+        self.assertEqual(len(reloaded.facts), 1)
+        self.assertEqual(reloaded.duplicates_suppressed, 1)
+
+    def test_stored_signatures_skip_hashing(self):
+        """Test that a reload reuses signatures saved next to facts.json"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        manager.add_fact("Sleep consolidates what the brain learned during the day", "a", ["sleep"])
+        manager.add_fact("Octopuses have three hearts and blue blood", "a", ["biology"])
+        manager.close()
+
+        with patch("utils.dedup.minhash", side_effect=AssertionError("fact re-hashed")):
+            reloaded = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(reloaded.close)
+        reloaded.add_fact("Octopuses have three hearts and blue blood!", "b", ["biology"])
+
+        self.assertEqual(len(reloaded.facts), 2)
+        self.assertEqual(reloaded.duplicates_suppressed, 1)
+
+    def test_edited_fact_is_rehashed(self):
+        """Test that a signature whose fact text changed on disk is not trusted"""
+        manager = FactManager(flush_delay=60, flush_every=50)
+        manager.add_fact("Sleep consolidates what the brain learned during the day", "a", ["sleep"])
+        manager.close()
+        facts = self._read(self.facts_file)
+        facts[0]["text"] = "Honey never spoils when it is stored in a sealed jar"
+        with open(self.facts_file, "w") as f:
+            json.dump(facts, f)
+
+        reloaded = FactManager(flush_delay=60, flush_every=50)
+        self.addCleanup(reloaded.close)
+        reloaded.add_fact("Sleep consolidates what the brain learned during the day", "b", ["sleep"])
+        reloaded.add_fact("Honey never spoils when it is stored in a sealed jar.", "b", ["food"])
+
+        self.assertEqual(len(reloaded.facts), 2)
+        self.assertEqual(reloaded.duplicates_suppressed, 1)
+        self.assertEqual(reloaded.facts[0]["metadata"]["also_seen_in"], ["b"])
+
+
+class TestWebCrawler(KnowledgeDirTestCase):
+    """Test suite for crawler persistence"""
+
+    def _pages(self, same_text=False):
+        """Stand-in for requests.get returning five paragraphs per page"""
+        pages = {}
+
+        def get(url, **kwargs):
+            page = 0 if same_text else pages.setdefault(url, len(pages))
+            response = MagicMock(status_code=200, headers={})
+            response.text = "".join(
+                "<p>" + " ".join(f"word{page}_{i}_{j}" for j in range(8)) + "</p>"
+                for i in range(5)
+            )
+            return response
+        return get
+
+    def _crawl_once(self, crawler, get):
+        crawler.running = True
+
+        def stop_after_pass(_seconds):
+            crawler.running = False
+
+        with patch.object(knowledge_engine.requests, "get", side_effect=get), \
+                patch.object(knowledge_engine.time, "sleep", side_effect=stop_after_pass):
+            crawler._crawl_loop()
+
+    def test_crawl_batches_writes(self):
+        """Test that a crawl pass writes each file once instead of once per fact"""
+        crawler = WebCrawler(topics=["ai advancement"], flush_delay=60, flush_every=50,
+                             host_delay=0)
+        self.addCleanup(crawler.close)
+
+        written = []
+        real_write = knowledge_engine.write_snapshot
+        with patch.object(knowledge_engine, "write_snapshot",
+                          side_effect=lambda path, *a, **kw: (written.append(path),
+                                                              real_write(path, *a, **kw))):
+            self._crawl_once(crawler, self._pages())
+
+        sources = len(knowledge_engine.TOPIC_SOURCES["ai advancement"])
+        self.assertEqual(len(self._read(self.facts_file)), 5 * sources)
+        self.assertEqual(len(KnowledgeGraph().concepts), 5 * sources)
+        self.assertEqual(self._read(self.status_file)["facts_discovered"], 5 * sources)
+        self.assertEqual(written.count(self.facts_file), 1)
+        self.assertEqual(written.count(self.graph_file), 0)
+        self.assertLessEqual(written.count(self.status_file), 2)
+
+    def test_crawl_merges_duplicate_pages(self):
+        """Test that paragraphs repeated across sources are stored once"""
+        crawler = WebCrawler(topics=["ai advancement"], flush_delay=60, flush_every=50,
+                             host_delay=0)
+        self.addCleanup(crawler.close)
+
+        self._crawl_once(crawler, self._pages(same_text=True))
+
+        sources = knowledge_engine.TOPIC_SOURCES["ai advancement"]
+        facts = self._read(self.facts_file)
+        self.assertEqual(len(facts), 5)
+        self.assertEqual(crawler.status["duplicates_suppressed"], 5 * (len(sources) - 1))
+        self.assertEqual(crawler.status["facts_discovered"], 5)
+        self.assertEqual(len(facts[0]["metadata"]["also_seen_in"]), len(sources) - 1)
+
+    def test_duplicates_counted_despite_other_writers(self):
+        """Test that facts added by another writer do not hide merged duplicates"""
+        crawler = WebCrawler(topics=["ai advancement"], flush_delay=60, flush_every=50,
+                             host_delay=0)
+        self.addCleanup(crawler.close)
+        manager = crawler.fact_manager
+        add = manager.add_or_merge_fact
+        others = iter(range(1000))
+
+        def add_alongside_other_writer(*args, **kwargs):
+            result = add(*args, **kwargs)
+            n = next(others)
+            add(" ".join(f"other{n}_{j}" for j in range(8)), "other", ["misc"])
+            return result
+
+        with patch.object(manager, "add_or_merge_fact", side_effect=add_alongside_other_writer):
+            self._crawl_once(crawler, self._pages(same_text=True))
+
+        sources = knowledge_engine.TOPIC_SOURCES["ai advancement"]
+        self.assertEqual(crawler.status["duplicates_suppressed"], 5 * (len(sources) - 1))
+        self.assertEqual(crawler.status["facts_discovered"], 5)
+
+    def test_engine_shares_fact_manager_with_crawler(self):
+        """Test that closing the engine keeps facts learned by its crawler"""
+        engine = knowledge_engine.KnowledgeEngine()
+        engine.crawler.topics = ["ai advancement"]
+        engine.crawler.fetcher.host_delay = 0
+
+        self._crawl_once(engine.crawler, self._pages())
+        engine.close()
+
+        self.assertIs(engine.crawler.fact_manager, engine.fact_manager)
+        sources = len(knowledge_engine.TOPIC_SOURCES["ai advancement"])
+        self.assertEqual(len(self._read(self.facts_file)), 5 * sources)
+        self.assertEqual(engine.get_learning_metrics()["facts_learned"], 5 * sources)
+
+    def test_stop_writes_status(self):
+        """Test that stopping the crawler persists its status right away"""
+        crawler = WebCrawler(flush_delay=60, flush_every=50)
+        self.addCleanup(crawler.close)
+        crawler.running = True
+
+        crawler.stop()
+
+        self.assertFalse(self._read(self.status_file)["running"])
+
+
+if __name__ == '__main__':
+    unittest.main()
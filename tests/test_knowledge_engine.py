@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from derek_knowledge_engine import KnowledgeEngine, KnowledgeIndex
+
+
+class TestKnowledgeIndex(unittest.TestCase):
+    """Test suite for the resident knowledge index"""
+
+    def setUp(self):
+        """Create a knowledge directory with one domain"""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_knowledge_"))
+        (self.test_dir / "health").mkdir()
+
+    def tearDown(self):
+        """Clean up knowledge files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, topic, summary, domain="health"):
+        path = self.test_dir / domain / f"{name}.json"
+        path.parent.mkdir(exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({"topic": topic, "domain": domain, "summary": summary}, f)
+        # Make sure a rewrite within the same clock tick still looks changed
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+        return path
+
+    def test_search_ranks_relevant_files(self):
+        """Test that files sharing more question words rank first"""
+        self._write("autism", "Autism", "Autism affects development")
+        self._write("sleep", "Sleep", "Sleep helps memory and development")
+
+        results = KnowledgeIndex(self.test_dir).search("autism development")
+
+        self.assertEqual(results[0]["topic"], "Autism")
+        self.assertEqual(results[0]["domain"], "health")
+
+    def test_search_does_not_read_files(self):
+        """Test that queries are served from memory"""
+        self._write("autism", "Autism", "Autism is a developmental condition")
+        index = KnowledgeIndex(self.test_dir)
+
+        with patch("builtins.open", side_effect=AssertionError("disk access")):
+            results = index.search("autism")
+
+        self.assertEqual(len(results), 1)
+
+    def test_refresh_picks_up_changes(self):
+        """Test that added, modified and removed files are reindexed"""
+        path = self._write("autism", "Autism", "Autism is a developmental condition")
+        index = KnowledgeIndex(self.test_dir)
+
+        self._write("autism", "Autism", "Autism affects communication")
+        self._write("speech", "Speech", "Speech therapy")
+        self.assertEqual(index.refresh(), 2)
+        self.assertEqual(index.search("developmental"), [])
+        self.assertEqual(len(index.search("speech")), 1)
+
+        path.unlink()
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.search("autism"), [])
+        self.assertEqual(index.refresh(), 0)
+
+    def test_generated_code_and_bad_files_skipped(self):
+        """Test that generated code and unreadable files are not indexed"""
+        self._write("snippet", "Autism helper", "code", domain="generated_code")
+        with open(self.test_dir / "health" / "broken.json", 'w') as f:
+            f.write("{not json")
+
+        index = KnowledgeIndex(self.test_dir)
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.refresh(), 0)
+
+    def test_engine_uses_index(self):
+        """Test that KnowledgeEngine searches through its resident index"""
+        self._write("autism", "Autism", "Autism is a developmental condition")
+        with patch("derek_knowledge_engine.Derek"):
+            engine = KnowledgeEngine(knowledge_dir=str(self.test_dir), poll_interval=60)
+        self.addCleanup(engine.close)
+
+        result = engine._search_learned_knowledge("What is autism?")
+
+        self.assertEqual(result["items"][0]["topic"], "Autism")
+        self.assertGreater(result["confidence"], 0)
+        self.assertEqual(engine.get_statistics()["knowledge_files_indexed"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
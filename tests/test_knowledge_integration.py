@@ -0,0 +1,126 @@
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from knowledge_integration import FactIndex, KnowledgeIntegration
+
+
+def linear_search(facts, query, topic=None, max_results=5):
+    """The original full-scan query, kept as a reference"""
+    if topic:
+        facts = [f for f in facts if f.get("topic") == topic]
+    query_terms = query.lower().split()
+    results = []
+    for fact in facts:
+        text = fact.get("text", "").lower()
+        score = sum(1 for term in query_terms if term in text)
+        if score > 0:
+            results.append({
+                "text": fact.get("text"),
+                "topic": fact.get("topic"),
+                "source": fact.get("source"),
+                "relevance": score / len(query_terms),
+            })
+    results.sort(key=lambda x: x["relevance"], reverse=True)
+    return results[:max_results]
+
+
+class TestFactIndex(unittest.TestCase):
+    """Test suite for the topic-partitioned fact index"""
+
+    def setUp(self):
+        self.facts = [
+            {"text": "Autism is a developmental condition", "topic": "health", "source": "a"},
+            {"text": "Speech therapy supports communication", "topic": "health", "source": "b"},
+            {"text": "React renders components", "topic": "tech", "source": "c"},
+            {"text": "Learning shapes development", "topic": "education", "source": "d"},
+        ]
+
+    def test_search_scores_candidates(self):
+        """Test that relevance is the fraction of query terms found"""
+        results = FactIndex(self.facts).search("autism condition react")
+
+        self.assertEqual(results[0]["source"], "a")
+        self.assertAlmostEqual(results[0]["relevance"], 2 / 3)
+        self.assertEqual(results[1]["source"], "c")
+
+    def test_terms_match_inside_words(self):
+        """Test that a term still matches as a substring of a longer word"""
+        results = FactIndex(self.facts).search("develop")
+
+        self.assertEqual([r["source"] for r in results], ["a", "d"])
+
+    def test_topic_partition_filters_results(self):
+        """Test that a topic restricts results to that partition"""
+        index = FactIndex(self.facts)
+
+        self.assertEqual([r["source"] for r in index.search("develop", topic="education")], ["d"])
+        self.assertEqual(index.search("develop", topic="unknown"), [])
+
+    def test_add_updates_cached_expansions(self):
+        """Test that facts inserted after a query are found by the same term"""
+        index = FactIndex(self.facts)
+        index.search("develop")
+
+        index.add({"text": "Developers write tests", "topic": "tech", "source": "e"})
+
+        self.assertEqual(len(index.search("develop")), 3)
+        self.assertEqual(index.search("tests", topic="tech")[0]["source"], "e")
+
+    def test_matches_linear_scan(self):
+        """Test that indexed results equal the original full scan"""
+        rng = random.Random(7)
+        words = ["memory", "speech", "learn", "learning", "family", "react", "voice", "data"]
+        topics = ["health", "tech", None]
+        facts = [
+            {"text": " ".join(rng.choice(words) for _ in range(5)), "topic": rng.choice(topics),
+             "source": str(i)}
+            for i in range(300)
+        ]
+        index = FactIndex(list(facts))
+
+        for query in ("learn", "memory voice", "react data speech", "lea ory", "missing"):
+            for topic in (None, "health"):
+                self.assertEqual(index.search(query, topic, 10),
+                                 linear_search(facts, query, topic, 10))
+
+
+class TestKnowledgeIntegration(unittest.TestCase):
+    """Test suite for KnowledgeIntegration's local fallback"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="test_knowledge_integration_")
+        os.makedirs(os.path.join(self.test_dir, "attached_assets"))
+        with open(os.path.join(self.test_dir, "attached_assets", "facts.json"), "w") as f:
+            json.dump([{"text": "Derek speaks kindly", "topic": "voice", "source": "x"}], f)
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_query_uses_loaded_and_added_facts(self):
+        """Test that facts from disk and later inserts are both queryable"""
+        with patch.object(KnowledgeIntegration, "_initialize_components"):
+            integration = KnowledgeIntegration()
+        integration.add_fact({"text": "Derek learns daily", "topic": "voice", "source": "y"})
+
+        result = integration.query_knowledge_base("derek", topic="voice")
+
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(result["engine"], "basic")
+        self.assertEqual(len(integration.facts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from derek_local_reasoning import BM25Index, LocalReasoningEngine
+
+
+class TestBM25Index(unittest.TestCase):
+    """Test suite for the BM25 knowledge index"""
+
+    def setUp(self):
+        """Index a few small documents"""
+        self.index = BM25Index()
+        self.index.build([
+            ("health", {"topic": "Autism"}, "Autism autism spectrum communication"),
+            ("health", {"topic": "Sleep"}, "Sleep and memory"),
+            ("tech", {"topic": "Tablets"}, "Tablets for communication and autism support apps"),
+        ])
+
+    def test_rare_and_repeated_terms_rank_first(self):
+        """Test that term frequency and rarity drive the ranking"""
+        results = self.index.search("autism communication")
+
+        self.assertEqual([entry["topic"] for _, entry in results], ["Autism", "Tablets"])
+        self.assertGreater(results[0][0], results[1][0])
+
+    def test_limit_and_directory_filter(self):
+        """Test top-k selection and directory filtering"""
+        self.assertEqual(len(self.index.search("autism", limit=1)), 1)
+        results = self.index.search("autism", directory="tech")
+        self.assertEqual([entry["topic"] for _, entry in results], ["Tablets"])
+
+    def test_min_coverage(self):
+        """Test that documents matching too few query terms are dropped"""
+        results = self.index.search("sleep autism spectrum", min_coverage=0.5)
+
+        self.assertEqual([entry["topic"] for _, entry in results], ["Autism"])
+        self.assertEqual(self.index.search("?!"), [])
+
+
+class TestKnowledgeSearch(unittest.TestCase):
+    """Test suite for LocalReasoningEngine knowledge search"""
+
+    def setUp(self):
+        """Create a knowledge directory and an engine without Ollama"""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_local_reasoning_"))
+        for method in ("_check_ollama_availability", "_detect_installed_models"):
+            patcher = patch.object(LocalReasoningEngine, method)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.engine = LocalReasoningEngine(knowledge_dir=str(self.test_dir))
+
+    def tearDown(self):
+        """Clean up knowledge files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, domain, name, topic, summary):
+        path = self.test_dir / domain / f"{name}.json"
+        path.parent.mkdir(exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({"topic": topic, "summary": summary, "domain": domain}, f)
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+
+    def test_search_returns_ranked_entries(self):
+        """Test that punctuation no longer hides matches and results are ranked"""
+        self._write("health", "autism", "Autism", "Autism spectrum and communication")
+        self._write("health", "sleep", "Sleep", "Sleep hygiene")
+
+        results = self.engine._search_knowledge_base("What is autism?")
+
+        self.assertEqual([r["topic"] for r in results], ["Autism"])
+        self.assertGreater(results[0]["relevance"], 0)
+
+    def test_index_rebuilt_when_files_change(self):
+        """Test that new knowledge files are picked up"""
+        self._write("health", "autism", "Autism", "Autism spectrum")
+        self.assertEqual(self.engine._search_knowledge_base("speech therapy"), [])
+
+        self.engine.index_refresh_interval = 0
+        self._write("health", "speech", "Speech", "Speech therapy basics")
+
+        results = self.engine._search_knowledge_base("speech therapy")
+        self.assertEqual([r["topic"] for r in results], ["Speech"])
+
+    def test_index_reused_between_queries(self):
+        """Test that repeated queries do not re-read the knowledge files"""
+        self._write("health", "autism", "Autism", "Autism spectrum")
+        self.engine._search_knowledge_base("autism")
+
+        with patch("builtins.open", side_effect=AssertionError("disk access")):
+            results = self.engine._search_knowledge_base("autism spectrum", domain="health")
+
+        self.assertEqual(len(results), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
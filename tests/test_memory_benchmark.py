@@ -0,0 +1,43 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_benchmark import SYSTEMS, generate_history, run_benchmark, summarize
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+    """Smoke tests for the memory benchmark suite"""
+
+    def test_history_is_reproducible(self):
+        """Test that the same seed generates the same history"""
+        first = list(generate_history(20, seed=3))
+        second = list(generate_history(20, seed=3))
+
+        self.assertEqual([m["content"] for m in first], [m["content"] for m in second])
+        self.assertLess(first[0]["timestamp_epoch"], first[-1]["timestamp_epoch"])
+
+    def test_summarize(self):
+        """Test that latency samples are reported in milliseconds"""
+        stats = summarize([0.001, 0.002, 0.003, 0.004])
+
+        self.assertEqual(stats["count"], 4)
+        self.assertAlmostEqual(stats["mean_ms"], 2.5)
+        self.assertAlmostEqual(stats["max_ms"], 4.0)
+
+    def test_every_system_runs(self):
+        """Test that each system benchmark completes on a tiny history"""
+        for system in SYSTEMS:
+            with self.subTest(system=system):
+                result = run_benchmark(system, 50, ops=5, queries=3)
+
+                self.assertEqual(result["size"], 50)
+                self.assertIn("store", result["operations"])
+                self.assertIn("load", result["operations"])
+                self.assertEqual(result["operations"]["store"]["count"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
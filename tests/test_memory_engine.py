@@ -0,0 +1,151 @@
+import json
+import os
+import unittest
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_engine import MemoryEngine
+
+
+class TestMemoryEngine(unittest.TestCase):
+    """Test suite for MemoryEngine"""
+
+    def setUp(self):
+        """Create an engine in a temporary directory"""
+        self.test_dir = tempfile.mkdtemp(prefix="test_memory_engine_")
+        self.file_path = os.path.join(self.test_dir, "memory_store.json")
+        self.engine = MemoryEngine(file_path=self.file_path)
+
+    def tearDown(self):
+        """Close the log and clean up"""
+        self.engine.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_save_appends_to_log(self):
+        """Test that saving an entry appends a line instead of rewriting the snapshot"""
+        self.engine.save({"input": "hello", "output": "hi", "intent": "greeting"})
+        self.engine.save({"input": "bye", "output": "see you", "intent": "farewell"})
+
+        self.assertFalse(os.path.exists(self.file_path))
+        with open(self.engine.log_path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])["intent"], "farewell")
+
+    def test_reload_replays_log(self):
+        """Test that a new engine sees snapshot and log entries"""
+        self.engine.save({"input": "one", "output": "1", "intent": "count"})
+        self.engine.save_memory()
+        self.engine.save({"input": "two", "output": "2", "intent": "count"})
+        self.engine.close()
+
+        reloaded = MemoryEngine(file_path=self.file_path)
+
+        self.assertEqual([e["input"] for e in reloaded.get_recent_events()], ["two", "one"])
+        reloaded.close()
+
+    def test_crash_before_log_truncation_is_not_replayed(self):
+        """Test that log entries already in the snapshot are not loaded twice"""
+        self.engine.save({"input": "one", "output": "1", "intent": "count"})
+        self.engine.save({"input": "two", "output": "2", "intent": "count"})
+        self.engine.close()
+        # Compaction interrupted after replacing the snapshot, before emptying the log
+        with patch.object(MemoryEngine, "_truncate_log", side_effect=OSError("crash")):
+            self.engine.save_memory()
+        with open(self.engine.log_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        reloaded = MemoryEngine(file_path=self.file_path)
+        reloaded.save({"input": "three", "output": "3", "intent": "count"})
+        reloaded.close()
+        again = MemoryEngine(file_path=self.file_path)
+
+        self.assertEqual([e["input"] for e in again.get_recent_events()], ["three", "two", "one"])
+        self.assertEqual([e["seq"] for e in again.get_recent_events()], [3, 2, 1])
+        again.close()
+
+    def test_query_by_intent_uses_index(self):
+        """Test that intent queries return only that intent's latest entries"""
+        for i in range(8):
+            self.engine.save({"input": f"hi {i}", "output": "hello", "intent": "greeting"})
+            self.engine.save({"input": f"q {i}", "output": "answer", "intent": "question"})
+
+        context = self.engine.query("hello", intent="greeting")["context"]
+
+        self.assertEqual(context.splitlines(), [f"hi {i} → hello" for i in range(3, 8)])
+
+    def test_compact_on_start(self):
+        """Test that startup compaction folds the log into the snapshot"""
+        self.engine.save({"input": "keep me", "output": "ok", "intent": "general"})
+        self.engine.close()
+
+        compacted = MemoryEngine(file_path=self.file_path, compact_on_start=True)
+
+        self.assertEqual(os.path.getsize(compacted.log_path), 0)
+        with open(self.file_path) as f:
+            self.assertEqual(json.load(f)[0]["input"], "keep me")
+        compacted.close()
+
+    def test_torn_log_line_skipped(self):
+        """Test that a partial trailing line does not break loading"""
+        self.engine.save({"input": "intact", "output": "ok", "intent": "general"})
+        self.engine.close()
+        with open(self.engine.log_path, "a") as f:
+            f.write('{"input": "tor')
+
+        reloaded = MemoryEngine(file_path=self.file_path)
+
+        self.assertEqual(len(reloaded.get_recent_events()), 1)
+        reloaded.close()
+
+    def test_keyed_memory(self):
+        """Test that add_memory/get_memory return the latest value per key"""
+        self.engine.add_memory("favorite_color", "blue", "preferences")
+        self.engine.add_memory("favorite_color", "green", "preferences")
+
+        self.assertEqual(self.engine.get_memory("favorite_color"), "green")
+        self.assertIsNone(self.engine.get_memory("missing"))
+
+    def test_reload_if_changed(self):
+        """Test that the cache reloads only when another writer touched the files"""
+        self.assertFalse(self.engine.reload_if_changed())
+        self.engine.add_memory("own_write", 1)
+        self.assertFalse(self.engine.reload_if_changed())
+
+        other = MemoryEngine(file_path=self.file_path)
+        other.add_memory("other_write", 2)
+        other.close()
+
+        self.assertTrue(self.engine.reload_if_changed())
+        self.assertEqual(self.engine.get_memory("other_write"), 2)
+
+    def test_core_uses_shared_engine(self):
+        """Test that core.remember/recall go through one cached engine"""
+        import core
+
+        with patch.object(core, "_memory_engine", self.engine):
+            core.remember("project", "AlphaVox")
+
+            self.assertIs(core.get_memory_engine(), self.engine)
+            self.assertEqual(core.recall("project"), "AlphaVox")
+            self.assertEqual(core.recall("unknown", default="n/a"), "n/a")
+
+    def test_clear(self):
+        """Test that clearing empties memory on disk"""
+        self.engine.save({"input": "forget me", "output": "ok", "intent": "general"})
+        self.engine.clear()
+
+        reloaded = MemoryEngine(file_path=self.file_path)
+
+        self.assertEqual(reloaded.get_recent_events(), [])
+        reloaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
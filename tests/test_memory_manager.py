@@ -0,0 +1,199 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from memory_manager import MemoryManager, GitBackupWorker, LegacyMemoryFiles
+
+
+class TestGitBackupWorker(unittest.TestCase):
+    """Test suite for GitBackupWorker"""
+
+    def setUp(self):
+        """Create a throwaway git repository with a memory directory"""
+        self.repo_dir = Path(tempfile.mkdtemp(prefix="test_backup_"))
+        subprocess.run(['git', 'init', '-q'], cwd=self.repo_dir, check=True)
+        subprocess.run(['git', 'config', 'user.email', 'derek@example.com'], cwd=self.repo_dir, check=True)
+        subprocess.run(['git', 'config', 'user.name', 'Derek'], cwd=self.repo_dir, check=True)
+        (self.repo_dir / "memory").mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.repo_dir, ignore_errors=True)
+
+    def _commit_count(self):
+        result = subprocess.run(
+            ['git', 'rev-list', '--count', 'HEAD'],
+            cwd=self.repo_dir, capture_output=True, text=True
+        )
+        return int(result.stdout.strip() or 0) if result.returncode == 0 else 0
+
+    def test_burst_coalesced_into_one_commit(self):
+        """Test that a burst of requests produces a single commit"""
+        worker = GitBackupWorker(self.repo_dir, debounce_seconds=0.2)
+        for i in range(5):
+            (self.repo_dir / "memory" / f"note_{i}.json").write_text("{}")
+            worker.request_backup()
+
+        self.assertGreater(worker.queue_depth, 0)
+        worker.stop(flush=True)
+
+        self.assertEqual(self._commit_count(), 1)
+        self.assertEqual(worker.queue_depth, 0)
+        self.assertEqual(worker.backups_completed, 1)
+        self.assertIsNotNone(worker.last_backup_latency)
+
+    def test_request_does_not_block(self):
+        """Test that requesting a backup returns before git runs"""
+        worker = GitBackupWorker(self.repo_dir, debounce_seconds=1.0)
+        (self.repo_dir / "memory" / "note.json").write_text("{}")
+
+        started = time.monotonic()
+        worker.request_backup()
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self._commit_count(), 0)
+        worker.stop(flush=True)
+        self.assertEqual(self._commit_count(), 1)
+
+
+class TestMemoryManager(unittest.TestCase):
+    """Test suite for MemoryManager"""
+
+    def setUp(self):
+        """Create a manager in a temporary directory"""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_memory_manager_"))
+        self.manager = MemoryManager(memory_dir=str(self.test_dir / "memory"))
+
+    def tearDown(self):
+        self.manager.backup_worker.stop(flush=False)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_retrieve_relevant_ranks_by_matched_words(self):
+        """Test that entries matching more query words rank first"""
+        self.manager.store("project", "AlphaVox voice project")
+        self.manager.store("hobby", "Derek likes lighthouse stories")
+        self.manager.store("plan", "Build the AlphaVox lighthouse demo")
+
+        result = self.manager.retrieve_relevant("alphavox lighthouse")
+
+        self.assertEqual(result.split(" | ")[0], "Build the AlphaVox lighthouse demo")
+        self.assertIn("AlphaVox voice project", result)
+        self.assertEqual(self.manager.retrieve_relevant("unrelated"), "")
+
+    def test_retrieve_relevant_ignores_stopwords(self):
+        """Test that shared stopwords or a minority of query words do not match"""
+        self.manager.store("weather", "the weather in Paris")
+        self.manager.store("pet", "my dog is called Rex")
+        self.manager.store("meeting", "Meeting with Sam at noon")
+
+        self.assertEqual(self.manager.retrieve_relevant("what is the time"), "")
+        self.assertEqual(self.manager.retrieve_relevant("Paris rain forecast tomorrow"), "")
+        self.assertEqual(self.manager.retrieve_relevant("weather in Paris"), "the weather in Paris")
+
+    def test_retrieve_relevant_after_load(self):
+        """Test that loaded memories are indexed"""
+        self.manager.store("user_name", "Nathaniel")
+        self.manager.save()
+
+        reloaded = MemoryManager(memory_dir=str(self.test_dir / "memory"))
+        reloaded.load()
+
+        self.assertEqual(reloaded.retrieve_relevant("nathaniel"), "Nathaniel")
+        self.assertGreater(reloaded.long_term_memory["user_name"]["access_count"], 1)
+        reloaded.backup_worker.stop(flush=False)
+
+    def test_old_conversations_leave_index(self):
+        """Test that only the recent conversation window is searched"""
+        for i in range(30):
+            self.manager.conversation_memory.append({'key': 'k', 'value': f"chat {i} about kites"})
+            self.manager._index_conversation(len(self.manager.conversation_memory) - 1)
+
+        result = self.manager.retrieve_relevant("kites", limit=50)
+
+        self.assertEqual(len(result.split(" | ")), 20)
+        self.assertNotIn("chat 9 ", result)
+
+    def test_legacy_files_load_on_first_access(self):
+        """Test that load() only lists legacy files and parses them on demand"""
+        memory_dir = self.test_dir / "memory"
+        (memory_dir / "old_notes.json").write_text(json.dumps({"topic": "tidepools"}))
+        (memory_dir / "diary.json").write_text(json.dumps(["first entry"]))
+
+        self.manager.load()
+
+        self.assertEqual(len(self.manager.legacy_files), 2)
+        self.assertEqual(self.manager.legacy_files.loaded, [])
+        self.assertEqual(self.manager.legacy_files.manifest["diary"]["size"], len('["first entry"]'))
+        self.assertEqual(self.manager.get_legacy_memory("old_notes"), {"topic": "tidepools"})
+        self.assertEqual(self.manager.legacy_files.loaded, ["old_notes"])
+
+    def test_unloaded_legacy_files_are_searchable(self):
+        """Test that search finds legacy files that were never read and loads them"""
+        memory_dir = self.test_dir / "memory"
+        (memory_dir / "old_notes.json").write_text(json.dumps({"topic": "tidepools"}))
+        (memory_dir / "diary.json").write_text(json.dumps(["first entry"]))
+        self.manager.load()
+
+        self.assertIn("tidepools", self.manager.retrieve_relevant("tidepools"))
+        self.assertEqual(self.manager.legacy_files.loaded, ["old_notes"])
+
+    def test_legacy_terms_persist_until_file_changes(self):
+        """Test that recorded terms are reused and refreshed when a file changes"""
+        memory_dir = self.test_dir / "memory"
+        notes = memory_dir / "old_notes.json"
+        notes.write_text(json.dumps({"topic": "tidepools"}))
+        self.manager.load()
+        self.manager.retrieve_relevant("tidepools")
+        self.assertTrue((memory_dir / "legacy_terms.json").exists())
+
+        reloaded = MemoryManager(memory_dir=str(memory_dir))
+        reloaded.load()
+        self.assertEqual(len(reloaded.legacy_files), 1)
+        with patch.object(LegacyMemoryFiles, "_read", side_effect=AssertionError("file re-read")):
+            self.assertEqual(reloaded.legacy_files.terms(), {"old_notes": {"topic", "tidepools"}})
+
+        notes.write_text(json.dumps({"topic": "lighthouses"}))
+        os.utime(notes, ns=(0, 0))
+        reloaded.load()
+        self.assertIn("lighthouses", reloaded.retrieve_relevant("lighthouses"))
+        self.assertEqual(reloaded.retrieve_relevant("tidepools"), "")
+        reloaded.backup_worker.stop(flush=False)
+
+    def test_legacy_cache_respects_budget(self):
+        """Test that least recently used legacy files are evicted over budget"""
+        memory_dir = self.test_dir / "memory"
+        for name in ("a", "b", "c"):
+            (memory_dir / f"{name}.json").write_text(json.dumps({"pad": "x" * 100}))
+        manager = MemoryManager(memory_dir=str(memory_dir), legacy_budget_bytes=250)
+        manager.load()
+
+        manager.get_legacy_memory("a")
+        manager.get_legacy_memory("b")
+        manager.get_legacy_memory("c")
+
+        self.assertEqual(manager.legacy_files.loaded, ["b", "c"])
+        self.assertLessEqual(manager.legacy_files.cached_bytes, 250)
+        self.assertEqual(manager.get_legacy_memory("a"), {"pad": "x" * 100})
+
+    def test_tenth_save_queues_backup(self):
+        """Test that the periodic backup is handed to the worker"""
+        self.manager.backup_worker.debounce_seconds = 60
+        for _ in range(10):
+            self.manager.save()
+
+        stats = self.manager.get_memory_stats()
+        self.assertEqual(stats['backup_queue_depth'], 1)
+        self.assertIsNone(stats['last_backup_latency'])
+
+
+if __name__ == '__main__':
+    unittest.main()
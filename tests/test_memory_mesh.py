@@ -0,0 +1,470 @@
+import json
+import unittest
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.fernet import Fernet
+
+from memory_mesh import MemoryMesh, tokenize
+from utils.encryption import is_chunked_file
+
+
+class TestMemoryMesh(unittest.TestCase):
+    """Test suite for MemoryMesh"""
+
+    def setUp(self):
+        """Create a mesh in a temporary directory"""
+        self.test_dir = tempfile.mkdtemp(prefix="test_memory_mesh_")
+        self.key = Fernet.generate_key()
+        self.mesh = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+    def tearDown(self):
+        """Clean up memory files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_tokenize_drops_stopwords(self):
+        """Test that index terms are lowercase and skip stopwords"""
+        self.assertEqual(tokenize("The Creator of AlphaVox!"), {"creator", "alphavox"})
+
+    def test_retrieve_uses_index(self):
+        """Test that retrieval only returns memories sharing a query term"""
+        self.mesh.store("Everett created the Christman AI Project", category="relationships")
+        self.mesh.store("User prefers Python for backend work", category="preferences")
+
+        results = self.mesh.retrieve("Everett")
+
+        self.assertEqual(len(results), 1)
+        self.assertIn("Everett", results[0]["content"])
+        self.assertEqual(self.mesh.retrieve("nonexistent"), [])
+
+    def test_consolidated_memory_returned_once(self):
+        """Test that episodic and semantic copies are not returned twice"""
+        self.mesh.store("AlphaVox helps nonverbal people", category="learning")
+        self.mesh.consolidate_all(force=True)
+
+        results = self.mesh.retrieve("AlphaVox", limit=5)
+
+        self.assertEqual(len(results), 1)
+
+    def test_category_filter(self):
+        """Test that the category filter applies to long-term memories"""
+        self.mesh.store("Python is a language I know", category="learning")
+        self.mesh.store("I prefer Python over Java", category="preferences")
+        self.mesh.consolidate_all(force=True)
+
+        results = self.mesh.retrieve("python", category="preferences")
+
+        self.assertEqual([m["category"] for m in results], ["preferences"])
+
+    def test_index_survives_reload(self):
+        """Test that the persisted index serves a fresh instance"""
+        self.mesh.store("Derek remembers the lighthouse trip", category="events")
+        self.mesh.consolidate_all(force=True)
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertIn("lighthouse", reloaded.memory_index)
+        self.assertEqual(len(reloaded.retrieve("lighthouse")), 1)
+
+    def test_reload_uses_persisted_index(self):
+        """Test that a compacted index is loaded as is while working memory is full"""
+        for i in range(20):
+            self.mesh.store(f"Garden journal entry {i}", category="events")
+        self.mesh.save_memories()
+        self.mesh.compact()
+
+        with patch.object(MemoryMesh, "_rebuild_index") as rebuild:
+            reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        rebuild.assert_not_called()
+        self.assertEqual(len(reloaded.memory_index["garden"]), 13)
+        self.assertEqual(len(reloaded.retrieve("garden", limit=20)), 13)
+
+    def test_consolidated_memory_stored_once(self):
+        """Test that episodic and semantic views share one memory record"""
+        memory_id = self.mesh.store("Everett likes lighthouses", category="preferences")
+        self.mesh.consolidate_all(force=True)
+
+        episodic = self.mesh.episodic_memory[0]
+        semantic = self.mesh.semantic_memory["preferences"][0]
+
+        self.assertIs(episodic, semantic)
+        self.assertIs(episodic, self.mesh.memories[memory_id])
+        self.assertEqual(self.mesh.get_stats()["total_memories"], 1)
+
+    def test_legacy_semantic_file_migrates(self):
+        """Test that semantic files holding full memory copies still load"""
+        self.mesh.store("AlphaVox helps nonverbal people", category="learning")
+        self.mesh.consolidate_all(force=True)
+        self.mesh.compact()
+        memory = self.mesh.episodic_memory[0]
+        legacy = json.dumps({"learning": [memory]}).encode()
+        with open(Path(self.test_dir) / "semantic_memory.json", 'wb') as f:
+            f.write(Fernet(self.key).encrypt(legacy))
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertEqual(len(reloaded.memories), 1)
+        self.assertEqual(reloaded.get_by_category("learning")[0]["id"], memory["id"])
+
+    def test_save_appends_to_journal(self):
+        """Test that saves append journal records instead of rewriting snapshots"""
+        self.mesh.store("First note about the garden", category="events")
+        self.mesh.consolidate_all(force=True)
+        journal = Path(self.test_dir) / "memory_journal.log"
+        first_size = journal.stat().st_size
+
+        self.mesh.store("Second note about the garden", category="events")
+        self.mesh.consolidate_all(force=True)
+
+        self.assertGreater(journal.stat().st_size, first_size)
+        self.assertFalse((Path(self.test_dir) / "episodic_memory.json").exists())
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertEqual(len(reloaded.episodic_memory), 2)
+        self.assertEqual(len(reloaded.retrieve("garden")), 2)
+
+    def test_compact_folds_journal_into_snapshot(self):
+        """Test that compaction empties the journal without losing memories"""
+        self.mesh.store("Derek visited the aquarium", category="events")
+        self.mesh.consolidate_all(force=True)
+        self.mesh.retrieve("aquarium")
+        self.mesh.save_memories()
+
+        self.mesh.compact()
+
+        self.assertEqual(self.mesh.get_stats()["journal_records"], 0)
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        memory = reloaded.episodic_memory[0]
+        self.assertEqual(memory["content"], "Derek visited the aquarium")
+        self.assertEqual(reloaded.memory_access_count[memory["id"]], 1)
+
+    def test_partial_compaction_keeps_categories(self):
+        """Test that a crash between snapshot files leaves categories complete"""
+        self.mesh.store("I prefer tea in the morning", category="preferences")
+        self.mesh.consolidate_all(force=True)
+        self.mesh.compact()
+        later_id = self.mesh.store("I prefer walks after dinner", category="preferences")
+        self.mesh.consolidate_all(force=True)
+        write = self.mesh._write_snapshot_file
+
+        def crash_after_episodic(name, payload):
+            if name != "episodic_memory.json":
+                raise OSError("crash")
+            write(name, payload)
+
+        with patch.object(self.mesh, "_write_snapshot_file", side_effect=crash_after_episodic):
+            with self.assertRaises(OSError):
+                self.mesh.compact()
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertIn(later_id, [m["id"] for m in reloaded.get_by_category("preferences")])
+        self.assertEqual(len(reloaded.semantic_memory["preferences"]), 2)
+
+    def test_background_compaction_at_threshold(self):
+        """Test that a save past the threshold compacts in the background"""
+        self.mesh.journal_compact_threshold = 3
+        for i in range(4):
+            self.mesh.store(f"Reading log entry {i}", category="learning")
+        self.mesh.consolidate_all(force=True)
+
+        self.mesh._compaction_thread.join(timeout=5)
+
+        self.assertTrue((Path(self.test_dir) / "episodic_memory.json").exists())
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertEqual(len(reloaded.episodic_memory), 4)
+
+    def test_torn_journal_record_skipped(self):
+        """Test that a partial trailing journal write does not block loading"""
+        self.mesh.store("Survives a crash", category="events")
+        self.mesh.consolidate_all(force=True)
+        with open(Path(self.test_dir) / "memory_journal.log", 'ab') as f:
+            f.write(b"gAAAAAB-truncated")
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertEqual(len(reloaded.episodic_memory), 1)
+
+    def test_clear_all_persists(self):
+        """Test that a cleared mesh stays cleared after reload"""
+        self.mesh.store("Soon to be forgotten", category="events")
+        self.mesh.consolidate_all(force=True)
+        self.mesh.clear_all(confirm=True)
+        self.mesh.save_memories()
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertEqual(len(reloaded.memories), 0)
+
+    def test_recent_memories_use_cached_epoch(self):
+        """Test that recency queries use the cached epoch timestamp"""
+        old_id = self.mesh.store("An old story about the harbor", category="events")
+        new_id = self.mesh.store("A new story about the harbor", category="events")
+        self.mesh.memories[old_id]["timestamp_epoch"] -= 3 * 3600
+
+        recent = self.mesh.get_recent_memories(hours=2)
+
+        self.assertEqual([m["id"] for m in recent], [new_id])
+        self.assertEqual(len(self.mesh.get_recent_memories(hours=4)), 2)
+        self.assertEqual(self.mesh.get_recent_memories(hours=4)[0]["id"], new_id)
+
+    def test_snapshots_use_chunked_encryption(self):
+        """Test that compaction writes chunked snapshot files that reload"""
+        self.mesh.store("Derek visited the aquarium", category="events")
+        self.mesh.consolidate_all(force=True)
+
+        self.mesh.compact()
+
+        self.assertTrue(is_chunked_file(Path(self.test_dir) / "episodic_memory.json"))
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertEqual(reloaded.episodic_memory[0]["content"], "Derek visited the aquarium")
+
+    def test_binary_snapshots_reload(self):
+        """Test that compaction can switch snapshots to the binary format"""
+        self.mesh.store("Derek visited the aquarium", category="events")
+        self.mesh.consolidate_all(force=True)
+        self.mesh.compact()
+
+        self.mesh.snapshot_format = "binary"
+        self.mesh.compact()
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertEqual(reloaded.episodic_memory[0]["content"], "Derek visited the aquarium")
+        self.assertEqual(len(reloaded.retrieve("aquarium")), 1)
+
+    def test_epoch_filled_for_legacy_records(self):
+        """Test that records saved without an epoch get one on load"""
+        self.mesh.store("Recorded before epochs existed", category="events")
+        self.mesh.consolidate_all(force=True)
+        memory = dict(self.mesh.episodic_memory[0])
+        del memory["timestamp_epoch"]
+        self.mesh._write_snapshot_file("episodic_memory.json", [memory])
+        (Path(self.test_dir) / "memory_journal.log").unlink()
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        loaded = reloaded.episodic_memory[0]
+        self.assertEqual(
+            loaded["timestamp_epoch"],
+            datetime.fromisoformat(loaded["timestamp"]).timestamp()
+        )
+
+    def test_access_counts_applied_from_buffer(self):
+        """Test that buffered access bumps reach the counters"""
+        memory_id = self.mesh.store("AlphaVox gives a voice to the nonverbal", category="learning")
+        self.mesh.consolidate_all(force=True)
+
+        for _ in range(3):
+            self.mesh.retrieve("AlphaVox")
+
+        self.assertEqual(self.mesh.memory_access_count[memory_id], 3)
+        self.assertEqual(self.mesh.get_stats()["pending_access_updates"], 0)
+
+    def test_concurrent_retrieve_and_store(self):
+        """Test that concurrent readers and writers neither deadlock nor lose data"""
+        for i in range(20):
+            self.mesh.store(f"Seed memory {i} about tides", category="learning")
+        errors = []
+
+        def reader():
+            try:
+                for _ in range(50):
+                    self.mesh.retrieve("tides", limit=3)
+            except Exception as e:
+                errors.append(e)
+
+        def writer(n):
+            try:
+                for i in range(20):
+                    self.mesh.store(f"Writer {n} note {i} about tides", category="events")
+                self.mesh.consolidate_all(force=True)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        threads += [threading.Thread(target=writer, args=(n,)) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(errors, [])
+        self.assertEqual(self.mesh.get_stats()["total_memories"], 60)
+
+    def test_repeated_query_served_from_cache(self):
+        """Test that a repeated query skips scoring and still counts access"""
+        memory_id = self.mesh.store("Derek likes the lighthouse at dusk", category="preferences")
+        first = self.mesh.retrieve("Lighthouse  dusk")
+
+        with patch.object(self.mesh, "_calculate_relevance", side_effect=AssertionError):
+            second = self.mesh.retrieve("lighthouse dusk")
+
+        self.assertEqual([m["id"] for m in second], [m["id"] for m in first])
+        self.assertEqual(self.mesh.retrieval_cache.hits, 1)
+        self.assertEqual(self.mesh.memory_access_count[memory_id], 2)
+
+    def test_cache_keyed_by_category_and_limit(self):
+        """Test that different filters do not share cache entries"""
+        self.mesh.store("Python is a language I know", category="learning")
+        self.mesh.store("I prefer Python over Java", category="preferences")
+        self.mesh.consolidate_all(force=True)
+
+        self.assertEqual(len(self.mesh.retrieve("python")), 2)
+        self.assertEqual(len(self.mesh.retrieve("python", category="preferences")), 1)
+        self.assertEqual(len(self.mesh.retrieve("python", limit=1)), 1)
+        self.assertEqual(self.mesh.retrieval_cache.hits, 0)
+
+    def test_store_invalidates_cache(self):
+        """Test that storing or consolidating recomputes cached results"""
+        self.mesh.store("First walk on the beach", category="events")
+        self.assertEqual(len(self.mesh.retrieve("beach")), 1)
+
+        self.mesh.store("Second walk on the beach", category="events")
+        self.assertEqual(len(self.mesh.retrieve("beach")), 2)
+
+        self.mesh.consolidate_all(force=True)
+        self.assertEqual(len(self.mesh.retrieve("beach", category="events")), 2)
+        self.mesh.clear_all(confirm=True)
+        self.assertEqual(self.mesh.retrieve("beach"), [])
+        self.assertEqual(self.mesh.retrieval_cache.hits, 0)
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entries are evicted"""
+        self.mesh.retrieval_cache.max_entries = 2
+        self.mesh.store("Apples pears and plums", category="learning")
+
+        for query in ("apples", "pears", "apples", "plums"):
+            self.mesh.retrieve(query)
+
+        self.assertEqual(len(self.mesh.retrieval_cache), 2)
+        self.mesh.retrieve("apples")
+        self.assertEqual(self.mesh.retrieval_cache.hits, 2)
+
+    def _store_aged(self, content, importance=0.1, days=60):
+        """Store and consolidate a memory backdated by the given number of days"""
+        memory_id = self.mesh.store(content, category="events", importance=importance)
+        self.mesh.consolidate_all(force=True)
+        self.mesh.memories[memory_id]["timestamp_epoch"] -= days * 86400
+        return memory_id
+
+    def test_cold_memories_move_to_archive(self):
+        """Test that aged, unimportant memories leave the hot tier"""
+        cold_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self._store_aged("Everett founded the project by the harbor", importance=0.9)
+        self._store_aged("Yesterday at the harbor", days=1)
+
+        self.assertEqual(self.mesh.archive_cold_memories(), 1)
+
+        self.assertNotIn(cold_id, self.mesh.memories)
+        self.assertNotIn(cold_id, [m["id"] for m in self.mesh.episodic_memory])
+        self.assertNotIn(cold_id, self.mesh.memory_index.get("sandwich", set()))
+        self.assertEqual(self.mesh.get_stats()["archived_memories"], 1)
+        self.assertEqual(self.mesh.archive_cold_memories(), 0)
+
+    def test_background_compaction_archives_cold_memories(self):
+        """Test that the aging policy runs when saves trigger compaction"""
+        cold_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.journal_compact_threshold = 3
+        for i in range(3):
+            self.mesh.store(f"Reading log entry {i}", category="learning")
+        self.mesh.consolidate_all(force=True)
+
+        self.mesh._compaction_thread.join(timeout=5)
+
+        self.assertNotIn(cold_id, self.mesh.memories)
+        self.assertIn(cold_id, self.mesh.archive)
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertNotIn(cold_id, reloaded.memories)
+        self.assertEqual(len(reloaded.episodic_memory), 3)
+        reloaded.archive.close()
+
+    def test_archive_searched_when_hot_tier_short(self):
+        """Test that archived memories fill results the hot tier cannot"""
+        cold_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.archive_cold_memories()
+
+        results = self.mesh.retrieve("sandwich")
+
+        self.assertEqual([m["id"] for m in results], [cold_id])
+        self.assertEqual(results[0]["content"], "Lunch was a sandwich by the harbor")
+
+    def test_archive_decodes_only_best_candidates(self):
+        """Test that a common term does not decode every archived record"""
+        for i in range(30):
+            self._store_aged(f"Walked along the harbor on day {i}")
+        sandwich_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.archive_cold_memories()
+        read = self.mesh.archive.read
+
+        with patch.object(self.mesh.archive, "read", side_effect=read) as reads:
+            results = self.mesh.retrieve("harbor sandwich", limit=2)
+
+        self.assertEqual(results[0]["id"], sandwich_id)
+        self.assertEqual(reads.call_count, 2 + self.mesh.archive.search_margin)
+
+    def test_archive_skipped_when_hot_tier_full(self):
+        """Test that a full hot result set never reads the archive"""
+        self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.archive_cold_memories()
+        self.mesh.store("Dinner was a sandwich too", category="events")
+
+        with patch.object(self.mesh.archive, "read", side_effect=AssertionError):
+            results = self.mesh.retrieve("sandwich", limit=1)
+
+        self.assertEqual(len(results), 1)
+
+    def test_archive_survives_reload(self):
+        """Test that archived memories stay archived and searchable after reload"""
+        cold_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self._store_aged("Everett founded the project", importance=0.9)
+        self.mesh.archive_cold_memories()
+        self.mesh.compact()
+        self.mesh.archive.close()
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertEqual(len(reloaded.memories), 1)
+        self.assertEqual([m["id"] for m in reloaded.retrieve("sandwich")], [cold_id])
+        reloaded.archive.close()
+
+    def test_archive_move_finished_after_crash(self):
+        """Test that a memory written to a segment but not journaled is not duplicated"""
+        cold_id = self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.archive.append([self.mesh.memories[cold_id]])
+
+        reloaded = MemoryMesh(memory_dir=self.test_dir, encryption_key=self.key)
+
+        self.assertNotIn(cold_id, reloaded.memories)
+        self.assertEqual(len(reloaded.retrieve("sandwich")), 1)
+
+    def test_clear_all_removes_archive(self):
+        """Test that clearing memories also deletes archive segments"""
+        self._store_aged("Lunch was a sandwich by the harbor")
+        self.mesh.archive_cold_memories()
+
+        self.mesh.clear_all(confirm=True)
+
+        self.assertEqual(self.mesh.retrieve("sandwich"), [])
+        self.assertEqual(list((Path(self.test_dir) / "archive").glob("segment_*")), [])
+
+    def test_clear_all_clears_index(self):
+        """Test that clearing memories also clears the index"""
+        self.mesh.store("Temporary note about gardening")
+        self.mesh.clear_all(confirm=True)
+
+        self.assertEqual(self.mesh.retrieve("gardening"), [])
+        self.assertEqual(len(self.mesh.memory_index), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
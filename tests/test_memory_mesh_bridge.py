@@ -0,0 +1,125 @@
+import unittest
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cryptography.fernet import Fernet
+
+from memory_mesh_bridge import MemoryMeshBridge, WriteBehindPersister
+
+
+class TestWriteBehindPersister(unittest.TestCase):
+    """Test suite for WriteBehindPersister"""
+
+    def setUp(self):
+        self.flushes = 0
+        self.flushed = threading.Event()
+
+    def _flush(self):
+        self.flushes += 1
+        self.flushed.set()
+
+    def test_mark_dirty_does_not_flush_inline(self):
+        """Test that marking dirty returns before any save runs"""
+        persister = WriteBehindPersister(self._flush, max_delay=60, max_pending=10)
+
+        persister.mark_dirty()
+
+        self.assertEqual(self.flushes, 0)
+        self.assertEqual(persister.pending, 1)
+        persister.stop()
+        self.assertEqual(self.flushes, 1)
+
+    def test_flush_after_delay(self):
+        """Test that a pending change is saved once max_delay passes"""
+        persister = WriteBehindPersister(self._flush, max_delay=0.1, max_pending=10)
+
+        persister.mark_dirty()
+
+        self.assertTrue(self.flushed.wait(timeout=5))
+        self.assertEqual(persister.pending, 0)
+        persister.stop()
+
+    def test_flush_after_max_pending(self):
+        """Test that enough changes trigger a save without waiting for the timer"""
+        persister = WriteBehindPersister(self._flush, max_delay=60, max_pending=3)
+
+        for _ in range(3):
+            persister.mark_dirty()
+
+        self.assertTrue(self.flushed.wait(timeout=5))
+        persister.stop()
+
+    def test_failed_flush_is_retried(self):
+        """Test that changes stay pending when a save fails"""
+        calls = []
+
+        def failing_flush():
+            calls.append(1)
+            if len(calls) == 1:
+                raise IOError("disk full")
+
+        persister = WriteBehindPersister(failing_flush, max_delay=60, max_pending=10)
+        persister.mark_dirty()
+        persister.flush()
+
+        self.assertEqual(persister.pending, 1)
+        persister.flush()
+        self.assertEqual(persister.pending, 0)
+        self.assertEqual(len(calls), 2)
+        persister.stop()
+
+
+    def test_stop_without_changes_does_not_save(self):
+        """Test that stopping with nothing pending leaves storage alone"""
+        persister = WriteBehindPersister(self._flush, max_delay=60, max_pending=10)
+
+        persister.stop()
+        persister.flush()
+
+        self.assertEqual(self.flushes, 0)
+        persister.flush(force=True)
+        self.assertEqual(self.flushes, 1)
+
+    def test_mark_dirty_after_stop_saves_inline(self):
+        """Test that changes made after stop are still written"""
+        persister = WriteBehindPersister(self._flush, max_delay=60, max_pending=10)
+        persister.stop()
+
+        persister.mark_dirty()
+
+        self.assertEqual(self.flushes, 1)
+        self.assertEqual(persister.pending, 0)
+
+
+class TestMemoryMeshBridge(unittest.TestCase):
+    """Test suite for MemoryMeshBridge"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="test_memory_bridge_")
+        self.key = Fernet.generate_key()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_close_persists_marked_changes(self):
+        """Test that memories marked dirty survive a close and reload"""
+        bridge = MemoryMeshBridge(memory_dir=self.test_dir, encryption_key=self.key, flush_delay=60)
+        bridge.store("user_name", "Nathaniel")
+        bridge.mark_dirty()
+
+        self.assertEqual(len(bridge.mesh.episodic_memory), 0)
+        bridge.close()
+
+        reloaded = MemoryMeshBridge(memory_dir=self.test_dir, encryption_key=self.key)
+        self.assertIn("Nathaniel", reloaded.retrieve_relevant("nathaniel"))
+        reloaded.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
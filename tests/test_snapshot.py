@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import snapshot
+from utils.snapshot import (
+    SNAPSHOT_MAGIC, compare_formats, convert_snapshot, decode_snapshot,
+    encode_snapshot, read_snapshot, write_snapshot
+)
+
+
+class TestSnapshotCodec(unittest.TestCase):
+    """Test suite for the binary snapshot encoding"""
+
+    def setUp(self):
+        """Force the pure-Python codec and create a scratch directory"""
+        patcher = patch.object(snapshot, "MSGPACK_AVAILABLE", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.test_dir = tempfile.mkdtemp(prefix="test_snapshot_")
+
+    def tearDown(self):
+        """Clean up scratch files"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test that every JSON type survives the binary format"""
+        payload = {
+            "text": "Derek 🧠", "long": "x" * 70000, "empty": "",
+            "ints": [0, 127, 128, 255, 65536, 2 ** 40, -1, -32, -33, -200, -2 ** 40],
+            "float": 0.25, "flags": [True, False, None],
+            "nested": {"list": [[{}], []], "many": {str(i): i for i in range(20)}}
+        }
+
+        self.assertEqual(decode_snapshot(encode_snapshot(payload, "binary")), payload)
+
+    def test_msgpack_compatible_bytes(self):
+        """Test that the pure-Python codec emits standard msgpack"""
+        data = encode_snapshot({"a": [1, -1, None, True, 1.5, "hi"]}, "binary")
+
+        self.assertEqual(
+            data[len(SNAPSHOT_MAGIC):],
+            b"\x81\xa1a\x96\x01\xff\xc0\xc3\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00\xa2hi"
+        )
+
+    def test_binary_smaller_than_pretty_json(self):
+        """Test that binary snapshots are smaller than indented JSON"""
+        payload = [{"id": str(i), "content": "memory", "importance": 0.5} for i in range(100)]
+
+        results = compare_formats(payload, repeat=1)
+
+        self.assertLess(results["binary"]["bytes"], results["json"]["bytes"])
+        self.assertIn("load_seconds", results["json"])
+
+    def test_truncated_data_rejected(self):
+        """Test that a cut-off binary snapshot raises instead of loading partially"""
+        data = encode_snapshot({"content": "a sentence long enough"}, "binary")
+
+        with self.assertRaises(ValueError):
+            decode_snapshot(data[:-3])
+
+    def test_convert_json_file(self):
+        """Test converting an existing JSON file to binary and back"""
+        path = os.path.join(self.test_dir, "memory_store.json")
+        payload = [{"key": "user", "value": "Everett"}]
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+
+        before, after = convert_snapshot(path, "binary")
+
+        self.assertLess(after, before)
+        with open(path, "rb") as f:
+            self.assertTrue(f.read().startswith(SNAPSHOT_MAGIC))
+        self.assertEqual(read_snapshot(path), payload)
+        convert_snapshot(path, "json")
+        with open(path) as f:
+            self.assertEqual(json.load(f), payload)
+
+    def test_memory_engine_binary_snapshot(self):
+        """Test that MemoryEngine reloads binary snapshots"""
+        from memory_engine import MemoryEngine
+
+        path = os.path.join(self.test_dir, "memory_store.json")
+        engine = MemoryEngine(path, snapshot_format="binary")
+        engine.add_memory("user", "Everett")
+        engine.save_memory()
+        engine.close()
+
+        self.assertEqual(MemoryEngine(path).get_memory("user"), "Everett")
+
+    def test_write_snapshot_rejects_unknown_format(self):
+        """Test that an unknown format is an error, not a silent JSON write"""
+        with self.assertRaises(ValueError):
+            write_snapshot(os.path.join(self.test_dir, "x.json"), {}, "yaml")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import web_crawler
+from web_crawler import extract_from_urls, iter_extract_from_urls
+
+
+class FakeExtractor:
+    """Stands in for newspaper: each URL names its delay and its text"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    def __call__(self, url, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            delay, text = url.split("/")[-2:]
+            time.sleep(float(delay))
+            return {"title": url, "text": text, "authors": [], "publish_date": None}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestExtractFromUrls(unittest.TestCase):
+    """Test suite for concurrent article extraction"""
+
+    def setUp(self):
+        self.fake = FakeExtractor()
+        patcher = patch.object(web_crawler, "extract_article_text", self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_results_stream_as_completed(self):
+        """Test that a fast article is yielded before a slow one"""
+        urls = ["http://x/0.3/slow", "http://x/0.01/fast"]
+
+        order = [url for url, _ in iter_extract_from_urls(urls, max_workers=2)]
+
+        self.assertEqual(order, ["http://x/0.01/fast", "http://x/0.3/slow"])
+
+    def test_worker_pool_is_bounded(self):
+        """Test that no more than max_workers articles run at once"""
+        urls = [f"http://x/0.05/text{i}" for i in range(8)]
+
+        results = extract_from_urls(urls, max_workers=3)
+
+        self.assertEqual([r["text"] for r in results], [f"text{i}" for i in range(8)])
+        self.assertEqual(self.fake.max_active, 3)
+
+    def test_slow_articles_time_out(self):
+        """Test that an article past its timeout yields an error"""
+        urls = ["http://x/1.0/stuck", "http://x/0.01/quick"]
+
+        started = time.monotonic()
+        results = dict(iter_extract_from_urls(urls, max_workers=2, timeout=0.2))
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertIn("Timed out", results["http://x/1.0/stuck"]["error"])
+        self.assertEqual(results["http://x/0.01/quick"]["text"], "quick")
+
+    def test_duplicates_are_skipped(self):
+        """Test that repeated URLs and identical articles appear once"""
+        urls = ["http://a/0.01/same", "http://a/0.01/same", "http://b/0.05/same",
+                "http://c/0.01/other"]
+
+        results = extract_from_urls(urls)
+
+        self.assertEqual([r["title"] for r in results], ["http://a/0.01/same", "http://c/0.01/other"])
+        self.assertEqual(self.fake.calls.count("http://a/0.01/same"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
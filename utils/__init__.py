@@ -2,9 +2,11 @@
 Utilities for Derek's Learning Engine
 """
 from .logging import setup_logging, get_audit_logger, get_api_logger, get_learning_logger, log_user_action, sanitize_log_message, create_sanitized_logger
+from .write_behind import WriteBehindPersister
+from .dedup import NearDuplicateIndex, SignatureFile, minhash
 
 try:
-    from .encryption import Encryptor, get_encryptor, encrypt_file, decrypt_file
+    from .encryption import Encryptor, ChunkedCipher, get_encryptor, encrypt_file, decrypt_file, is_chunked_file
     ENCRYPTION_AVAILABLE = True
 except ImportError:
     ENCRYPTION_AVAILABLE = False
@@ -16,13 +18,19 @@ __all__ = [
     'get_learning_logger',
     'log_user_action',
     'sanitize_log_message',
-    'create_sanitized_logger'
+    'create_sanitized_logger',
+    'WriteBehindPersister',
+    'NearDuplicateIndex',
+    'SignatureFile',
+    'minhash'
 ]
 
 if ENCRYPTION_AVAILABLE:
     __all__.extend([
         'Encryptor',
+        'ChunkedCipher',
         'get_encryptor',
         'encrypt_file',
-        'decrypt_file'
+        'decrypt_file',
+        'is_chunked_file'
     ])
\ No newline at end of file
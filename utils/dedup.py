@@ -0,0 +1,237 @@
+"""
+Near-duplicate detection for learned facts
+
+Each text gets a MinHash signature over its word shingles: the fraction of
+positions two signatures share estimates the Jaccard similarity of their
+shingle sets. Signatures are split into bands and bucketed per band, so a
+lookup only compares against texts that agree on a whole band, which
+near-duplicates almost always do and unrelated texts almost never do.
+
+Signatures are the expensive part, so SignatureFile keeps them on disk
+between runs.
+"""
+import hashlib
+import os
+import re
+import struct
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+_WORD = re.compile(r"\w+")
+_ROW = struct.Struct(">16I")
+_MAGIC = b"MHSIG1"
+_FILE_HEADER = struct.Struct(">6sII")  # magic, num_perm, shingle
+_RECORD_HEADER = struct.Struct(">II")  # key, crc32 of the signed text
+
+
+def _shingles(text: str, shingle: int) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < shingle:
+        return set(words)
+    return {" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)}
+
+
+def minhash(text: str, num_perm: int = 64, shingle: int = 2) -> Tuple[int, ...]:
+    """
+    MinHash signature of the word shingles in text
+
+    Each blake2b digest, personalised per block, supplies 16 independent
+    32-bit hash values, so num_perm must be a multiple of 16.
+    Returns an empty tuple for text without words.
+    """
+    features = _shingles(text, shingle)
+    if not features:
+        return ()
+    signature = []
+    for block in range(num_perm // 16):
+        person = block.to_bytes(16, "big")
+        rows = [
+            _ROW.unpack(hashlib.blake2b(f.encode("utf-8"), digest_size=64, person=person).digest())
+            for f in features
+        ]
+        signature.extend(min(column) for column in zip(*rows))
+    return tuple(signature)
+
+
+class NearDuplicateIndex:
+    """
+    LSH table of MinHash signatures keyed by caller-chosen IDs
+
+    Args:
+        threshold: Estimated Jaccard similarity at or above which two texts
+            count as duplicates
+        num_perm: Signature length, a multiple of 16
+        bands: Number of LSH bands; must divide num_perm. More bands catch
+            less similar pairs at the cost of more candidates to verify
+        shingle: Words per shingle
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, shingle: int = 2):
+        if num_perm % 16 or num_perm % bands:
+            raise ValueError("num_perm must be a multiple of 16 and of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle = shingle
+        self.suppressed = 0
+        self._rows = num_perm // bands
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [defaultdict(set) for _ in range(bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: Tuple[int, ...]):
+        rows = self._rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def similarity(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def _find(self, signature: Tuple[int, ...], exclude: Hashable = None) -> Optional[Hashable]:
+        checked = set()
+        for band, value in self._bands(signature):
+            for key in self._buckets[band].get(value, ()):
+                if key == exclude or key in checked:
+                    continue
+                checked.add(key)
+                if self.similarity(self._signatures[key], signature) >= self.threshold:
+                    return key
+        return None
+
+    def _insert(self, key: Hashable, signature: Tuple[int, ...]):
+        self.remove(key)
+        self._signatures[key] = signature
+        for band, value in self._bands(signature):
+            self._buckets[band][value].add(key)
+
+    def _signature(self, text: str) -> Tuple[int, ...]:
+        return minhash(text, self.num_perm, self.shingle)
+
+    def find(self, text: str) -> Optional[Hashable]:
+        """Key of an indexed near-duplicate of text, or None"""
+        signature = self._signature(text)
+        return self._find(signature) if signature else None
+
+    def insert(self, key: Hashable, text: str, signature: Optional[Tuple[int, ...]] = None):
+        """Index text under key without checking for duplicates
+
+        A signature already computed for text may be passed to skip hashing.
+        """
+        if signature is None:
+            signature = self._signature(text)
+        if signature:
+            self._insert(key, signature)
+
+    def signature(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        """Signature indexed under key, or None"""
+        return self._signatures.get(key)
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """
+        Index text unless it near-duplicates text under another key
+
+        Returns:
+            The existing key if text was suppressed as a duplicate, else None.
+            Re-adding under the same key replaces that key's signature.
+        """
+        signature = self._signature(text)
+        if not signature:
+            return None
+        existing = self._find(signature, exclude=key)
+        if existing is not None:
+            self.suppressed += 1
+            return existing
+        self._insert(key, signature)
+        return None
+
+    def remove(self, key: Hashable):
+        """Forget the text indexed under key"""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, value in self._bands(signature):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def clear(self):
+        """Forget every indexed text; the suppressed count is kept"""
+        for buckets in self._buckets:
+            buckets.clear()
+        self._signatures.clear()
+
+
+class SignatureFile:
+    """
+    Append-only file of MinHash signatures for texts numbered 0..n-1
+
+    Each record carries its text's CRC32, so load() only trusts signatures
+    whose text is unchanged; anything else is simply hashed again. A file
+    written with different num_perm or shingle settings is ignored.
+    """
+
+    def __init__(self, path: str, num_perm: int = 64, shingle: int = 2):
+        self.path = path
+        self.num_perm = num_perm
+        self.shingle = shingle
+        self._signature = struct.Struct(f">{num_perm}I")
+
+    def load(self, texts: Sequence[str]) -> Tuple[Dict[int, Tuple[int, ...]], int]:
+        """
+        Read stored signatures that still match texts
+
+        Returns:
+            ({key: signature}, number of records that were stale or unknown)
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return {}, 0
+        if len(data) < _FILE_HEADER.size or _FILE_HEADER.unpack_from(data) != (
+                _MAGIC, self.num_perm, self.shingle):
+            return {}, 0
+        signatures = {}
+        stale = 0
+        record = _RECORD_HEADER.size + self._signature.size
+        # A torn final record from an interrupted append is dropped
+        end = len(data) - (len(data) - _FILE_HEADER.size) % record
+        for offset in range(_FILE_HEADER.size, end, record):
+            key, crc = _RECORD_HEADER.unpack_from(data, offset)
+            if key < len(texts) and zlib.crc32(texts[key].encode("utf-8")) == crc:
+                signatures[key] = self._signature.unpack_from(data, offset + _RECORD_HEADER.size)
+            else:
+                stale += 1
+        return signatures, stale
+
+    def _records(self, entries: Iterable[Tuple[int, str, Tuple[int, ...]]]) -> bytes:
+        return b"".join(
+            _RECORD_HEADER.pack(key, zlib.crc32(text.encode("utf-8"))) + self._signature.pack(*signature)
+            for key, text, signature in entries
+        )
+
+    def append(self, entries: Iterable[Tuple[int, str, Tuple[int, ...]]]):
+        """Add (key, text, signature) records; the file is created if missing"""
+        records = self._records(entries)
+        if not records:
+            return
+        if not os.path.exists(self.path):
+            self.rewrite(())
+        with open(self.path, "ab") as f:
+            f.write(records)
+
+    def rewrite(self, entries: Iterable[Tuple[int, str, Tuple[int, ...]]]):
+        """Atomically replace the file with just these records"""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_FILE_HEADER.pack(_MAGIC, self.num_perm, self.shingle))
+            f.write(self._records(entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
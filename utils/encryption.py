@@ -2,11 +2,252 @@
 Encryption utilities for HIPAA-compliant data storage
 """
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+import io
+import json
 import os
+import struct
 import logging
 
 logger = logging.getLogger(__name__)
 
+CHUNK_MAGIC = b"DKC1"
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class ChunkedCipher:
+    """
+    Streaming authenticated encryption in fixed-size chunks
+    
+    A file is a header (magic, chunk size, random salt) followed by AES-256-GCM
+    chunks under a key derived from the master key and the salt. A chunk's
+    nonce is its index, and the header and a final-chunk flag are
+    authenticated with it, so reordered, spliced or truncated files fail to
+    decrypt. Every chunk but the last holds exactly chunk_size bytes, so any
+    chunk can be located and decrypted on its own, and reading or writing
+    needs only one chunk in memory.
+    """
+    
+    HEADER = struct.Struct(">4sI16s")
+    TAG_SIZE = 16
+    
+    def __init__(self, key: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            key: Master key; a Fernet key from the environment works as-is
+            chunk_size: Plaintext bytes per chunk for new files
+        """
+        if isinstance(key, str):
+            key = key.encode()
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.key = key
+        self.chunk_size = chunk_size
+    
+    def _aead(self, salt: bytes) -> AESGCM:
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"derek chunked file v1")
+        return AESGCM(hkdf.derive(self.key))
+    
+    def open(self, path, mode: str = "rb"):
+        """
+        Open an encrypted file for streaming
+        
+        "wb" writes to a temporary file that replaces path once closed
+        cleanly; "rb" returns a reader that also supports read_chunk(index).
+        """
+        if mode == "wb":
+            return ChunkedWriter(self, path)
+        if mode == "rb":
+            return ChunkedReader(self, open(path, 'rb'))
+        raise ValueError(f"Unsupported mode {mode!r}")
+    
+    def encrypt_stream(self, src, dst):
+        """Encrypt binary stream src into binary stream dst chunk by chunk"""
+        writer = ChunkedWriter(self, fileobj=dst)
+        while True:
+            data = src.read(self.chunk_size)
+            if not data:
+                break
+            writer.write(data)
+        writer.close()
+    
+    def decrypt_stream(self, src, dst):
+        """Decrypt binary stream src into binary stream dst chunk by chunk"""
+        reader = ChunkedReader(self, src, close_file=False)
+        for chunk in reader.iter_chunks():
+            dst.write(chunk)
+    
+    def write_json(self, path, payload):
+        """Serialize payload straight into an encrypted file; path is untouched on error"""
+        with self.open(path, "wb") as raw:
+            f = io.TextIOWrapper(io.BufferedWriter(raw, self.chunk_size), encoding="utf-8")
+            json.dump(payload, f, separators=(",", ":"))
+            f.flush()
+            # Detach so closing the wrappers cannot commit raw; the with block
+            # decides between close() and abort()
+            f.detach().detach()
+    
+    def read_json(self, path):
+        """Load a JSON payload from an encrypted file"""
+        with self.open(path, "rb") as raw:
+            with io.TextIOWrapper(io.BufferedReader(raw, self.chunk_size), encoding="utf-8") as f:
+                return json.load(f)
+
+
+class ChunkedWriter(io.RawIOBase):
+    """Write side of the chunked format; see ChunkedCipher"""
+    
+    def __init__(self, cipher: ChunkedCipher, path=None, fileobj=None):
+        super().__init__()
+        self._cipher = cipher
+        self._path = path
+        if fileobj is None:
+            self._temp_path = f"{path}.tmp"
+            fileobj = open(self._temp_path, 'wb')
+        self._file = fileobj
+        salt = os.urandom(16)
+        self._header = cipher.HEADER.pack(CHUNK_MAGIC, cipher.chunk_size, salt)
+        self._aead = cipher._aead(salt)
+        self._buffer = bytearray()
+        self._index = 0
+        self._file.write(self._header)
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._buffer += data
+        chunk_size = self._cipher.chunk_size
+        # Hold back at least one byte so the final chunk is never emitted early
+        full_chunks = (len(self._buffer) - 1) // chunk_size
+        if full_chunks > 0:
+            with memoryview(self._buffer) as view:
+                for i in range(full_chunks):
+                    self._emit(bytes(view[i * chunk_size:(i + 1) * chunk_size]), final=False)
+            del self._buffer[:full_chunks * chunk_size]
+        return len(data)
+    
+    def _emit(self, chunk: bytes, final: bool):
+        nonce = self._index.to_bytes(12, "big")
+        aad = self._header + (b"\x01" if final else b"\x00")
+        self._file.write(self._aead.encrypt(nonce, chunk, aad))
+        self._index += 1
+    
+    def close(self):
+        if self.closed:
+            return
+        self._emit(bytes(self._buffer), final=True)
+        self._buffer = bytearray()
+        self._file.flush()
+        if self._path is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._temp_path, self._path)
+        super().close()
+    
+    def abort(self):
+        """Discard everything written; the destination file is left untouched"""
+        if self.closed:
+            return
+        if self._path is not None:
+            self._file.close()
+            os.remove(self._temp_path)
+        super().close()
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class ChunkedReader(io.RawIOBase):
+    """Read side of the chunked format; see ChunkedCipher"""
+    
+    def __init__(self, cipher: ChunkedCipher, fileobj, close_file: bool = True):
+        super().__init__()
+        self._file = fileobj
+        self._close_file = close_file
+        self._start = fileobj.tell()
+        self._header = fileobj.read(cipher.HEADER.size)
+        if len(self._header) < cipher.HEADER.size:
+            raise ValueError("Not a chunked encrypted file")
+        magic, self.chunk_size, salt = cipher.HEADER.unpack(self._header)
+        if magic != CHUNK_MAGIC:
+            raise ValueError("Not a chunked encrypted file")
+        self._aead = cipher._aead(salt)
+        self._stored_size = self.chunk_size + cipher.TAG_SIZE
+        self._chunks = None
+        self._pending = b""
+        self._chunk_count = None
+    
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks; needs a seekable file"""
+        if self._chunk_count is None:
+            position = self._file.tell()
+            end = self._file.seek(0, os.SEEK_END)
+            self._file.seek(position)
+            body = end - self._start - len(self._header)
+            self._chunk_count = max(1, -(-body // self._stored_size))
+        return self._chunk_count
+    
+    def read_chunk(self, index: int) -> bytes:
+        """Decrypt one chunk without touching the others"""
+        if not 0 <= index < self.chunk_count:
+            raise IndexError(f"Chunk {index} out of range")
+        self._file.seek(self._start + len(self._header) + index * self._stored_size)
+        data = self._file.read(self._stored_size)
+        return self._decrypt(index, data, final=index == self.chunk_count - 1)
+    
+    def _decrypt(self, index: int, data: bytes, final: bool) -> bytes:
+        aad = self._header + (b"\x01" if final else b"\x00")
+        return self._aead.decrypt(index.to_bytes(12, "big"), data, aad)
+    
+    def iter_chunks(self):
+        """Yield decrypted chunks in order, reading one ahead to spot the last"""
+        data = self._file.read(self._stored_size)
+        index = 0
+        while True:
+            following = self._file.read(self._stored_size)
+            yield self._decrypt(index, data, final=not following)
+            if not following:
+                return
+            data = following
+            index += 1
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            if self._chunks is None:
+                self._chunks = self.iter_chunks()
+            # Only the final chunk can be empty, so an empty result is EOF
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+    
+    def close(self):
+        if not self.closed and self._close_file:
+            self._file.close()
+        super().close()
+
+
+def is_chunked_file(file_path) -> bool:
+    """Whether a file starts with the chunked encryption header"""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(CHUNK_MAGIC)) == CHUNK_MAGIC
+    except OSError:
+        return False
+
 class Encryptor:
     """HIPAA-compliant encryption utility using Fernet symmetric encryption"""
     
@@ -27,6 +268,7 @@ class Encryptor:
         
         try:
             self.cipher = Fernet(key)
+            self.chunked = ChunkedCipher(key)
             logger.info("✅ Encryptor initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize encryptor: {e}")
@@ -91,6 +333,26 @@ class Encryptor:
         import json
         json_string = self.decrypt(data)
         return json.loads(json_string)
+    
+    def encrypt_stream(self, src, dst):
+        """
+        Encrypt a binary stream in the chunked format
+        
+        Args:
+            src: Readable binary file object
+            dst: Writable binary file object
+        """
+        self.chunked.encrypt_stream(src, dst)
+    
+    def decrypt_stream(self, src, dst):
+        """
+        Decrypt a chunked binary stream
+        
+        Args:
+            src: Readable binary file object in the chunked format
+            dst: Writable binary file object
+        """
+        self.chunked.decrypt_stream(src, dst)
 
 
 # Global encryptor instance (lazy initialization)
@@ -113,10 +375,9 @@ def encrypt_file(file_path: str, data: dict):
         data: Data to encrypt and save
     """
     encryptor = get_encryptor()
-    encrypted_data = encryptor.encrypt_json(data)
-    
-    with open(file_path, 'wb') as f:
-        f.write(encrypted_data)
+    # Streamed in chunks, so neither a base64 copy nor the whole ciphertext
+    # is held in memory; the file is replaced atomically once complete
+    encryptor.chunked.write_json(file_path, data)
     
     logger.info(f"💾 Encrypted data saved to {file_path}")
 
@@ -137,11 +398,13 @@ def decrypt_file(file_path: str) -> dict:
     
     encryptor = get_encryptor()
     
-    with open(file_path, 'rb') as f:
-        encrypted_data = f.read()
-    
     try:
-        decrypted_data = encryptor.decrypt_json(encrypted_data)
+        if is_chunked_file(file_path):
+            decrypted_data = encryptor.chunked.read_json(file_path)
+        else:
+            # Files written before the chunked format are a single Fernet token
+            with open(file_path, 'rb') as f:
+                decrypted_data = encryptor.decrypt_json(f.read())
         logger.info(f"🔓 Decrypted data loaded from {file_path}")
         return decrypted_data
     except Exception as e:
@@ -0,0 +1,322 @@
+"""
+Snapshot serialization for memory stores
+
+Snapshots are written either as JSON or as a compact binary form: a magic
+header followed by msgpack-encoded data, where every string, container and
+blob carries its length up front. The msgpack package is used when installed;
+otherwise a pure-Python codec produces the same bytes. Readers detect the
+format from the content, so files can be converted in place.
+
+Usage:
+    python -m utils.snapshot convert memory/persistent_memory.json
+    python -m utils.snapshot compare memory/persistent_memory.json
+"""
+import json
+import logging
+import os
+import struct
+import sys
+import time
+from typing import Any, Dict, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"DKS1"
+SNAPSHOT_FORMATS = ("json", "binary")
+
+_FLOAT = struct.Struct(">d")
+
+
+def _pack(obj: Any, out: list):
+    """Append the msgpack encoding of obj to out"""
+    kind = type(obj)
+    if kind is str:
+        data = obj.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            out.append(bytes((0xa0 | size,)))
+        elif size < 0x100:
+            out.append(bytes((0xd9, size)))
+        elif size < 0x10000:
+            out.append(b"\xda" + size.to_bytes(2, "big"))
+        else:
+            out.append(b"\xdb" + size.to_bytes(4, "big"))
+        out.append(data)
+    elif kind is dict:
+        size = len(obj)
+        if size < 16:
+            out.append(bytes((0x80 | size,)))
+        elif size < 0x10000:
+            out.append(b"\xde" + size.to_bytes(2, "big"))
+        else:
+            out.append(b"\xdf" + size.to_bytes(4, "big"))
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    elif kind is list or kind is tuple:
+        size = len(obj)
+        if size < 16:
+            out.append(bytes((0x90 | size,)))
+        elif size < 0x10000:
+            out.append(b"\xdc" + size.to_bytes(2, "big"))
+        else:
+            out.append(b"\xdd" + size.to_bytes(4, "big"))
+        for item in obj:
+            _pack(item, out)
+    elif obj is None:
+        out.append(b"\xc0")
+    elif obj is True:
+        out.append(b"\xc3")
+    elif obj is False:
+        out.append(b"\xc2")
+    elif kind is int:
+        if 0 <= obj < 0x80:
+            out.append(bytes((obj,)))
+        elif -32 <= obj < 0:
+            out.append(bytes((obj & 0xff,)))
+        elif obj >= 0:
+            for marker, width in ((0xcc, 1), (0xcd, 2), (0xce, 4), (0xcf, 8)):
+                if obj < 1 << (8 * width):
+                    out.append(bytes((marker,)) + obj.to_bytes(width, "big"))
+                    break
+            else:
+                raise OverflowError(f"Integer too large to pack: {obj}")
+        else:
+            for marker, width in ((0xd0, 1), (0xd1, 2), (0xd2, 4), (0xd3, 8)):
+                if obj >= -(1 << (8 * width - 1)):
+                    out.append(bytes((marker,)) + obj.to_bytes(width, "big", signed=True))
+                    break
+            else:
+                raise OverflowError(f"Integer too small to pack: {obj}")
+    elif kind is float:
+        out.append(b"\xcb" + _FLOAT.pack(obj))
+    elif kind is bytes or kind is bytearray:
+        size = len(obj)
+        if size < 0x100:
+            out.append(bytes((0xc4, size)))
+        elif size < 0x10000:
+            out.append(b"\xc5" + size.to_bytes(2, "big"))
+        else:
+            out.append(b"\xc6" + size.to_bytes(4, "big"))
+        out.append(bytes(obj))
+    # Subclasses (defaultdict, OrderedDict, IntEnum, ...) take the slower path
+    elif isinstance(obj, bool):
+        _pack(bool(obj), out)
+    elif isinstance(obj, str):
+        _pack(str(obj), out)
+    elif isinstance(obj, dict):
+        _pack(dict(obj), out)
+    elif isinstance(obj, (list, tuple)):
+        _pack(list(obj), out)
+    elif isinstance(obj, int):
+        _pack(int(obj), out)
+    elif isinstance(obj, float):
+        _pack(float(obj), out)
+    else:
+        raise TypeError(f"Object of type {kind.__name__} is not serializable")
+
+
+class _Unpacker:
+    """Decoder for the msgpack subset written by _pack"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def _take(self, size: int) -> bytes:
+        start = self.pos
+        end = start + size
+        if end > len(self.data):
+            raise ValueError("Truncated snapshot data")
+        self.pos = end
+        return self.data[start:end]
+
+    def _uint(self, size: int) -> int:
+        return int.from_bytes(self._take(size), "big")
+
+    def unpack(self) -> Any:
+        if self.pos >= len(self.data):
+            raise ValueError("Truncated snapshot data")
+        marker = self.data[self.pos]
+        self.pos += 1
+        # Short strings and small maps dominate memory records; keep them first
+        if 0xa0 <= marker <= 0xbf:
+            start = self.pos
+            end = start + (marker & 0x1f)
+            if end > len(self.data):
+                raise ValueError("Truncated snapshot data")
+            self.pos = end
+            return self.data[start:end].decode("utf-8")
+        if 0x80 <= marker <= 0x8f:
+            return self._map(marker & 0x0f)
+        if marker < 0x80:
+            return marker
+        if marker >= 0xe0:
+            return marker - 0x100
+        if 0x90 <= marker <= 0x9f:
+            return [self.unpack() for _ in range(marker & 0x0f)]
+        if marker == 0xc0:
+            return None
+        if marker == 0xc2:
+            return False
+        if marker == 0xc3:
+            return True
+        if marker in (0xd9, 0xda, 0xdb):
+            return self._take(self._uint(1 << (marker - 0xd9))).decode("utf-8")
+        if marker in (0xdc, 0xdd):
+            return [self.unpack() for _ in range(self._uint(2 if marker == 0xdc else 4))]
+        if marker in (0xde, 0xdf):
+            return self._map(self._uint(2 if marker == 0xde else 4))
+        if 0xcc <= marker <= 0xcf:
+            return self._uint(1 << (marker - 0xcc))
+        if 0xd0 <= marker <= 0xd3:
+            return int.from_bytes(self._take(1 << (marker - 0xd0)), "big", signed=True)
+        if marker == 0xcb:
+            return _FLOAT.unpack(self._take(8))[0]
+        if marker == 0xca:
+            return struct.unpack(">f", self._take(4))[0]
+        if marker in (0xc4, 0xc5, 0xc6):
+            return self._take(self._uint(1 << (marker - 0xc4)))
+        raise ValueError(f"Unsupported snapshot type byte 0x{marker:02x}")
+
+    def _map(self, size: int) -> Dict:
+        unpack = self.unpack
+        return {unpack(): unpack() for _ in range(size)}
+
+
+def packb(obj: Any) -> bytes:
+    """Encode obj as msgpack"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(obj, use_bin_type=True)
+    out = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+def unpackb(data: bytes) -> Any:
+    """Decode a single msgpack value"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    unpacker = _Unpacker(bytes(data))
+    obj = unpacker.unpack()
+    if unpacker.pos != len(unpacker.data):
+        raise ValueError("Trailing bytes after snapshot data")
+    return obj
+
+
+def encode_snapshot(payload: Any, fmt: str = "json", indent: int = None) -> bytes:
+    """
+    Serialize a snapshot payload
+
+    Args:
+        payload: JSON-compatible data
+        fmt: "json" or "binary"
+        indent: JSON indentation; ignored for binary
+
+    Returns:
+        Encoded bytes
+    """
+    if fmt == "binary":
+        return SNAPSHOT_MAGIC + packb(payload)
+    if fmt == "json":
+        return json.dumps(payload, indent=indent).encode("utf-8")
+    raise ValueError(f"Unknown snapshot format {fmt!r}; expected one of {SNAPSHOT_FORMATS}")
+
+
+def decode_snapshot(data: bytes) -> Any:
+    """Parse snapshot bytes in either format"""
+    if data[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC:
+        return unpackb(memoryview(data)[len(SNAPSHOT_MAGIC):])
+    return json.loads(data)
+
+
+def snapshot_format_of(data: bytes) -> str:
+    """Name the format of snapshot bytes"""
+    return "binary" if data[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC else "json"
+
+
+def read_snapshot(path) -> Any:
+    """Load an unencrypted snapshot file in either format"""
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
+
+
+def write_snapshot(path, payload: Any, fmt: str = "json", indent: int = None):
+    """Atomically replace an unencrypted snapshot file"""
+    data = encode_snapshot(payload, fmt, indent)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def convert_snapshot(path, fmt: str = "binary", indent: int = None) -> Tuple[int, int]:
+    """
+    Rewrite an unencrypted snapshot file in another format
+
+    Returns:
+        (size before, size after) in bytes
+    """
+    before = os.path.getsize(path)
+    write_snapshot(path, read_snapshot(path), fmt, indent)
+    after = os.path.getsize(path)
+    logger.info(f"Converted {path} to {fmt}: {before} -> {after} bytes")
+    return before, after
+
+
+def compare_formats(payload: Any, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Time encoding and decoding of payload in each format
+
+    Returns:
+        {format: {"bytes", "save_seconds", "load_seconds"}}, best of repeat runs
+    """
+    results = {}
+    for fmt, indent in (("json", 2), ("binary", None)):
+        save_times = []
+        load_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = encode_snapshot(payload, fmt, indent)
+            save_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            decode_snapshot(data)
+            load_times.append(time.perf_counter() - start)
+        results[fmt] = {
+            "bytes": len(data),
+            "save_seconds": min(save_times),
+            "load_seconds": min(load_times)
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("convert", "compare"):
+        print(__doc__.strip().split("Usage:")[1])
+        return 2
+    command, paths = argv[0], argv[1:]
+    for path in paths:
+        if command == "convert":
+            before, after = convert_snapshot(path)
+            print(f"{path}: {before} -> {after} bytes")
+        else:
+            results = compare_formats(read_snapshot(path))
+            print(path)
+            for fmt, stats in results.items():
+                print(f"  {fmt:<6} {stats['bytes']:>10} bytes  "
+                      f"save {stats['save_seconds'] * 1000:8.2f} ms  "
+                      f"load {stats['load_seconds'] * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
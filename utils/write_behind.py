@@ -0,0 +1,101 @@
+"""
+Write-behind persistence
+
+Lets hot paths record that state changed without paying for the save, which
+is batched onto a background thread by size and time thresholds.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindPersister:
+    """
+    Runs a save callable on a background thread instead of the caller's
+    
+    Callers mark state dirty; the worker flushes once max_delay seconds have
+    passed since the first unsaved change or once max_pending changes have
+    accumulated, whichever comes first. If flushes fall behind and
+    2 * max_pending changes pile up, mark_dirty flushes synchronously, so at
+    most that many changes (or max_delay seconds of them) can be lost.
+    """
+    
+    def __init__(self, flush: Callable[[], None], max_delay: float = 5.0, max_pending: int = 10,
+                 name: str = "write-behind"):
+        self._flush = flush
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.pending = 0
+        self.flush_count = 0
+        self.last_flush_duration: Optional[float] = None
+        self._first_dirty: Optional[float] = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+        self._thread.start()
+    
+    def mark_dirty(self):
+        """Record an unsaved change; returns without touching disk in the common case"""
+        with self._cond:
+            self.pending += 1
+            if self._first_dirty is None:
+                self._first_dirty = time.monotonic()
+            self._cond.notify()
+            # Once stopped there is no worker, so save on the caller's thread
+            overflow = self._stopped or self.pending >= 2 * self.max_pending
+        if overflow:
+            self.flush()
+    
+    def flush(self, force: bool = False):
+        """Save now on the calling thread if anything is pending, or always with force"""
+        with self._flush_lock:
+            with self._cond:
+                pending = self.pending
+                self.pending = 0
+                self._first_dirty = None
+            if not pending and not force:
+                return
+            started = time.monotonic()
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+                with self._cond:
+                    # Keep the changes counted so the next flush retries them
+                    self.pending += pending
+                    if self._first_dirty is None:
+                        self._first_dirty = time.monotonic()
+                return
+            self.last_flush_duration = time.monotonic() - started
+            self.flush_count += 1
+    
+    def stop(self):
+        """Flush anything pending and stop the worker"""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=30)
+        self.flush()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self.pending >= self.max_pending:
+                        break
+                    if self._first_dirty is not None:
+                        remaining = self._first_dirty + self.max_delay - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+            self.flush()